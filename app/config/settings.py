@@ -16,6 +16,7 @@ from typing import Annotated, Callable
 import sys
 
 from app.config.validators import parse_comma_separated_list
+from app.config.viewports import VIEWPORT_PRESETS
 
 
 class Settings(BaseSettings):
@@ -31,23 +32,99 @@ class Settings(BaseSettings):
     # Mobil mod bekleme süresi (saniye)
     mobile_wait_time: int = Field(default=2, alias="MOBILE_WAIT_TIME")
     
+    # Mobil scroll dansı toplam süre sınırı (ms, tüm adımlar) - lazy içerik yüklenince daha erken biter
+    mobile_scroll_max_ms: int = Field(default=2000, alias="MOBILE_SCROLL_MAX_MS")
+    
     # Arama motoru bekleme süresi (saniye)
     search_engine_wait_time: int = Field(default=3, alias="SEARCH_ENGINE_WAIT_TIME")
     
-    # Frame switch bekleme süresi (saniye)
+    # Frame switch maksimum bekleme süresi (saniye) - frame içeriği oluşunca beklenmez
     frame_switch_wait_time: int = Field(default=1, alias="FRAME_SWITCH_WAIT_TIME")
     
-    # Consent tıklama bekleme süresi (saniye)
+    # Consent tıklama maksimum bekleme süresi (saniye) - widget kaybolunca beklenmez
     consent_click_wait_time: int = Field(default=3, alias="CONSENT_CLICK_WAIT_TIME")
 
+    # HTML alma yöntemi: 'cdp' (Runtime.evaluate, tek çağrı) veya 'page_source'
+    html_capture_method: str = Field(default="cdp", alias="HTML_CAPTURE_METHOD")
+
+    # ==================== CDP / NETWORK ====================
+    # Chrome remote debugging portu (kalıcı CDP olay akışı bu porttan bağlanır)
+    remote_debugging_port: int = Field(default=9222, alias="REMOTE_DEBUGGING_PORT")
+    # CDP Network olay ring buffer'ı boyutu (hedef başına olay sayısı)
+    network_event_buffer_size: int = Field(default=20000, alias="NETWORK_EVENT_BUFFER_SIZE")
+    # Sayfa beklemeleri sırasında tek drain'de okunacak maksimum CDP mesaj byte'ı
+    cdp_drain_max_bytes: int = Field(default=4194304, alias="CDP_DRAIN_MAX_BYTES")  # 4MB
+    # HAR çıktısında tutulacak maksimum entry sayısı
+    har_max_entries: int = Field(default=5000, alias="HAR_MAX_ENTRIES")
+    # network_logs sınırları - yanıt boyutu ve worker belleği öngörülebilir kalsın
+    network_log_max_entries: int = Field(default=1000, alias="NETWORK_LOG_MAX_ENTRIES")
+    network_log_max_header_bytes: int = Field(default=2048, alias="NETWORK_LOG_MAX_HEADER_BYTES")  # Kayıt başına
+    network_log_max_total_bytes: int = Field(default=2097152, alias="NETWORK_LOG_MAX_TOTAL_BYTES")  # 2MB
+    network_log_header_allowlist: Annotated[
+        list[str],
+        BeforeValidator(parse_comma_separated_list)
+    ] = Field(
+        default=[
+            "content-type", "content-length", "content-encoding", "cache-control",
+            "server", "location", "access-control-allow-origin", "age", "etag", "x-cache"
+        ],
+        alias="NETWORK_LOG_HEADER_ALLOWLIST"
+    )
+    # capture_api_bodies: 'api' yanıt gövdeleri (MIME allow-list, gövde ve istek başına byte sınırı)
+    api_body_mime_types: Annotated[
+        list[str],
+        BeforeValidator(parse_comma_separated_list)
+    ] = Field(
+        default=[
+            "application/json", "application/ld+json", "application/graphql-response+json",
+            "application/x-ndjson", "application/xml", "text/xml", "text/plain"
+        ],
+        alias="API_BODY_MIME_TYPES"
+    )
+    api_body_max_bytes: int = Field(default=262144, alias="API_BODY_MAX_BYTES")  # 256KB
+    api_body_max_total_bytes: int = Field(default=5242880, alias="API_BODY_MAX_TOTAL_BYTES")  # 5MB
+    # JS Performance API fallback'inin (ve doküman başı resource collector'ın) tuttuğu maksimum kayıt
+    js_resource_buffer_size: int = Field(default=2000, alias="JS_RESOURCE_BUFFER_SIZE")
+    
+    # ==================== ARTEFAKT DEPOSU ====================
+    # HAR gibi büyük çıktıların yazılacağı dizin
+    artifact_dir: str = Field(default="artifacts", alias="ARTIFACT_DIR")
+
+    # ==================== VIEWPORT PRESET'LERİ ====================
+    # Boş bırakılırsa masaüstü adımlarında tarayıcının kendi pencere boyutu kullanılır
+    default_desktop_viewport: str = Field(default="", alias="DEFAULT_DESKTOP_VIEWPORT")
+    default_mobile_viewport: str = Field(default="phone@3x", alias="DEFAULT_MOBILE_VIEWPORT")
+
+    # ==================== TÜRETİLMİŞ GÖRÜNTÜLER ====================
+    # Thumbnail genişliği (piksel) ve WebP kalitesi
+    screenshot_thumbnail_width: int = Field(default=320, alias="SCREENSHOT_THUMBNAIL_WIDTH")
+    screenshot_thumbnail_quality: int = Field(default=60, alias="SCREENSHOT_THUMBNAIL_QUALITY")
+
+    # İstek başına türetilmiş görüntülere ayrılan toplam süre (saniye)
+    # Her çekim kalan süreyle sınırlanır; aşılırsa thumbnail null döner
+    image_derive_timeout: int = Field(default=5, alias="IMAGE_DERIVE_TIMEOUT")
+
     # API Ayarları
     host: str = Field(default="0.0.0.0", alias="HOST")
     port: int = Field(default=8000, alias="PORT")
 
+    # Yanıt Sıkıştırma Ayarları
+    response_compression_enabled: bool = Field(default=True, alias="RESPONSE_COMPRESSION_ENABLED")
+    response_compression_min_size: int = Field(default=1024, alias="RESPONSE_COMPRESSION_MIN_SIZE")  # 1KB
+    # Gzip ~10MB base64 yanıtta ~377ms CPU harcar (hızlı serileştirme ~58ms kazandırır) - opt-in
+    response_gzip_enabled: bool = Field(default=False, alias="RESPONSE_GZIP_ENABLED")
+    response_gzip_level: int = Field(default=1, alias="RESPONSE_GZIP_LEVEL")
+    response_brotli_quality: int = Field(default=1, alias="RESPONSE_BROTLI_QUALITY")
+
     # Loglama Ayarları
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
     console_logging_enabled: bool = Field(default=True, alias="CONSOLE_LOGGING_ENABLED")
     postgres_logging_enabled: bool = Field(default=True, alias="POSTGRES_LOGGING_ENABLED")
+    # Yakalanan network isteklerini network_requests tablosuna yaz (opt-in)
+    network_log_db_enabled: bool = Field(default=False, alias="NETWORK_LOG_DB_ENABLED")
+    # Consent/captcha olaylarını domain bazında challenge_stats tablosunda topla
+    challenge_stats_enabled: bool = Field(default=True, alias="CHALLENGE_STATS_ENABLED")
+    challenge_stats_flush_interval: int = Field(default=60, alias="CHALLENGE_STATS_FLUSH_INTERVAL")  # saniye, 0: her istekte
     structured_logging_enabled: bool = Field(default=False, alias="STRUCTURED_LOGGING_ENABLED")
     gunicorn_logging_enabled: bool = Field(default=True, alias="GUNICORN_LOGGING_ENABLED")
     log_format: str = Field(
@@ -62,6 +139,19 @@ class Settings(BaseSettings):
     # Black-List Ayarları
     blacklist_file: str = Field(default="black-list.lst", alias="BLACKLIST_FILE")
 
+    # Tracker / Reklam Listesi Ayarları (network kayıtlarındaki category alanı, boş: devre dışı)
+    tracker_list_file: str = Field(default="tracker-list.lst", alias="TRACKER_LIST_FILE")
+    ad_list_file: str = Field(default="ad-list.lst", alias="AD_LIST_FILE")
+
+    # Challenge Cache Ayarları (domain bazında başarılı consent/captcha seçicisi)
+    challenge_cache_file: str = Field(default="cache/challenge-cache.json", alias="CHALLENGE_CACHE_FILE")
+    challenge_cache_ttl: int = Field(default=604800, alias="CHALLENGE_CACHE_TTL")  # 7 gün, 0: kapalı
+    challenge_cache_save_interval: int = Field(default=60, alias="CHALLENGE_CACHE_SAVE_INTERVAL")  # saniye, 0: her değişiklikte
+
+    # Consent Cookie Ayarları (arama motoru consent çerezleri sürücü başında yüklenir)
+    consent_cookie_seeding: bool = Field(default=True, alias="CONSENT_COOKIE_SEEDING")
+    consent_cookie_file: str = Field(default="cache/consent-cookies.json", alias="CONSENT_COOKIE_FILE")
+
     # PostgreSQL Ayarları
     postgres_host: str = Field(default="pgbouncer", alias="POSTGRES_HOST")
     # Default port PgBouncer portu ile tutarlı (6432)
@@ -116,6 +206,150 @@ class Settings(BaseSettings):
             raise ValueError(f'Geçersiz platform: {v}')
         return v.lower()
 
+    @field_validator('html_capture_method')
+    @classmethod
+    def validate_html_capture_method(cls, v):
+        valid_methods = ['cdp', 'page_source']
+        if v.lower() not in valid_methods:
+            raise ValueError(f'Geçersiz HTML alma yöntemi: {v}')
+        return v.lower()
+
+    @field_validator('remote_debugging_port')
+    @classmethod
+    def validate_remote_debugging_port(cls, v):
+        if v < 1024 or v > 65535:
+            raise ValueError(f'Geçersiz remote debugging portu: {v}. Değer 1024-65535 arasında olmalı.')
+        return v
+
+    @field_validator('cdp_drain_max_bytes')
+    @classmethod
+    def validate_cdp_drain_max_bytes(cls, v):
+        if v < 65536 or v > 268435456:
+            raise ValueError(f'Geçersiz CDP drain byte sınırı: {v}. Değer 65536-268435456 (256MB) arasında olmalı.')
+        return v
+
+    @field_validator('network_event_buffer_size')
+    @classmethod
+    def validate_network_event_buffer_size(cls, v):
+        if v < 100 or v > 200000:
+            raise ValueError(f'Geçersiz network olay buffer boyutu: {v}. Değer 100-200000 arasında olmalı.')
+        return v
+
+    @field_validator('challenge_stats_flush_interval')
+    @classmethod
+    def validate_challenge_stats_flush_interval(cls, v):
+        if v < 0 or v > 3600:
+            raise ValueError(f'Geçersiz challenge stats flush aralığı: {v}. Değer 0-3600 arasında olmalı.')
+        return v
+
+    @field_validator('challenge_cache_ttl')
+    @classmethod
+    def validate_challenge_cache_ttl(cls, v):
+        if v < 0 or v > 7776000:
+            raise ValueError(f'Geçersiz challenge cache TTL: {v}. Değer 0-7776000 (90 gün) arasında olmalı.')
+        return v
+
+    @field_validator('challenge_cache_save_interval')
+    @classmethod
+    def validate_challenge_cache_save_interval(cls, v):
+        if v < 0 or v > 3600:
+            raise ValueError(f'Geçersiz challenge cache kayıt aralığı: {v}. Değer 0-3600 arasında olmalı.')
+        return v
+
+    @field_validator('har_max_entries')
+    @classmethod
+    def validate_har_max_entries(cls, v):
+        if v < 10 or v > 100000:
+            raise ValueError(f'Geçersiz HAR entry sınırı: {v}. Değer 10-100000 arasında olmalı.')
+        return v
+
+    @field_validator('network_log_max_entries')
+    @classmethod
+    def validate_network_log_max_entries(cls, v):
+        if v < 10 or v > 100000:
+            raise ValueError(f'Geçersiz network log entry sınırı: {v}. Değer 10-100000 arasında olmalı.')
+        return v
+
+    @field_validator('network_log_max_header_bytes')
+    @classmethod
+    def validate_network_log_max_header_bytes(cls, v):
+        if v < 0 or v > 65536:
+            raise ValueError(f'Geçersiz header byte sınırı: {v}. Değer 0-65536 arasında olmalı.')
+        return v
+
+    @field_validator('network_log_max_total_bytes')
+    @classmethod
+    def validate_network_log_max_total_bytes(cls, v):
+        if v < 10240 or v > 104857600:
+            raise ValueError(f'Geçersiz network log toplam byte sınırı: {v}. Değer 10KB-100MB arasında olmalı.')
+        return v
+
+    @field_validator('network_log_header_allowlist')
+    @classmethod
+    def validate_network_log_header_allowlist(cls, v):
+        return [header.strip().lower() for header in v if header.strip()]
+
+    @field_validator('api_body_mime_types')
+    @classmethod
+    def validate_api_body_mime_types(cls, v):
+        return [mime.strip().lower() for mime in v if mime.strip()]
+
+    @field_validator('api_body_max_bytes')
+    @classmethod
+    def validate_api_body_max_bytes(cls, v):
+        if v < 1024 or v > 10485760:
+            raise ValueError(f'Geçersiz API gövde byte sınırı: {v}. Değer 1KB-10MB arasında olmalı.')
+        return v
+
+    @field_validator('api_body_max_total_bytes')
+    @classmethod
+    def validate_api_body_max_total_bytes(cls, v):
+        if v < 10240 or v > 104857600:
+            raise ValueError(f'Geçersiz API gövde toplam byte sınırı: {v}. Değer 10KB-100MB arasında olmalı.')
+        return v
+
+    @field_validator('js_resource_buffer_size')
+    @classmethod
+    def validate_js_resource_buffer_size(cls, v):
+        if v < 150 or v > 100000:
+            raise ValueError(f'Geçersiz JS resource buffer boyutu: {v}. Değer 150-100000 arasında olmalı.')
+        return v
+
+    @field_validator('default_desktop_viewport')
+    @classmethod
+    def validate_default_desktop_viewport(cls, v):
+        if v and v not in VIEWPORT_PRESETS:
+            raise ValueError(f'Geçersiz viewport preset: {v}. Geçerli değerler: {", ".join(VIEWPORT_PRESETS)}')
+        return v
+
+    @field_validator('default_mobile_viewport')
+    @classmethod
+    def validate_default_mobile_viewport(cls, v):
+        if v not in VIEWPORT_PRESETS:
+            raise ValueError(f'Geçersiz viewport preset: {v}. Geçerli değerler: {", ".join(VIEWPORT_PRESETS)}')
+        return v
+
+    @field_validator('screenshot_thumbnail_width')
+    @classmethod
+    def validate_screenshot_thumbnail_width(cls, v):
+        if v < 64 or v > 1920:
+            raise ValueError(f'Geçersiz thumbnail genişliği: {v}. Değer 64-1920 piksel arasında olmalı.')
+        return v
+
+    @field_validator('screenshot_thumbnail_quality')
+    @classmethod
+    def validate_screenshot_thumbnail_quality(cls, v):
+        if v < 1 or v > 100:
+            raise ValueError(f'Geçersiz thumbnail kalitesi: {v}. Değer 1-100 arasında olmalı.')
+        return v
+
+    @field_validator('image_derive_timeout')
+    @classmethod
+    def validate_image_derive_timeout(cls, v):
+        if v < 1 or v > 60:
+            raise ValueError(f'Geçersiz görüntü türetme zaman aşımı: {v}. Değer 1-60 saniye arasında olmalı.')
+        return v
+
     @field_validator('wait_time')
     @classmethod
     def validate_wait_time(cls, v):
@@ -151,6 +385,13 @@ class Settings(BaseSettings):
             raise ValueError(f'Geçersiz mobil bekleme süresi: {v}. Değer 1-10 saniye arasında olmalı.')
         return v
     
+    @field_validator('mobile_scroll_max_ms')
+    @classmethod
+    def validate_mobile_scroll_max_ms(cls, v):
+        if v < 100 or v > 10000:
+            raise ValueError(f'Geçersiz mobil scroll süre sınırı: {v}. Değer 100-10000 ms arasında olmalı.')
+        return v
+    
     @field_validator('search_engine_wait_time')
     @classmethod
     def validate_search_engine_wait_time(cls, v):
@@ -179,6 +420,20 @@ class Settings(BaseSettings):
             raise ValueError(f'Geçersiz port numarası: {v}. Değer 1024-65535 arasında olmalı.')
         return v
 
+    @field_validator('response_gzip_level')
+    @classmethod
+    def validate_response_gzip_level(cls, v):
+        if v < 1 or v > 9:
+            raise ValueError(f'Geçersiz gzip seviyesi: {v}. Değer 1-9 arasında olmalı.')
+        return v
+
+    @field_validator('response_brotli_quality')
+    @classmethod
+    def validate_response_brotli_quality(cls, v):
+        if v < 0 or v > 11:
+            raise ValueError(f'Geçersiz brotli kalitesi: {v}. Değer 0-11 arasında olmalı.')
+        return v
+
     @field_validator('noise_min_value', 'noise_max_value')
     @classmethod
     def validate_noise_values(cls, v):
@@ -0,0 +1,38 @@
+"""
+Viewport Preset Tanımları
+Ekran görüntüsü boyutlarını öngörülebilir kılan isimli cihaz profilleri
+"""
+from typing import Literal, Optional, Dict, Any
+
+ViewportPreset = Literal["desktop-1080", "laptop", "tablet", "phone@1x", "phone@2x", "phone@3x"]
+
+# CDP Emulation.setDeviceMetricsOverride parametreleri
+# Görüntü boyutu = width x height x deviceScaleFactor
+VIEWPORT_PRESETS: Dict[str, Dict[str, Any]] = {
+    "desktop-1080": {"width": 1920, "height": 1080, "deviceScaleFactor": 1, "mobile": False},
+    "laptop": {"width": 1366, "height": 768, "deviceScaleFactor": 1, "mobile": False},
+    "tablet": {"width": 768, "height": 1024, "deviceScaleFactor": 2, "mobile": True},
+    "phone@1x": {"width": 375, "height": 812, "deviceScaleFactor": 1, "mobile": True},
+    "phone@2x": {"width": 375, "height": 812, "deviceScaleFactor": 2, "mobile": True},
+    "phone@3x": {"width": 375, "height": 812, "deviceScaleFactor": 3, "mobile": True},
+}
+
+
+def get_device_metrics(preset: str, device_scale_factor: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Preset için Emulation.setDeviceMetricsOverride parametrelerini döndürür
+
+    Args:
+        preset: Preset adı (örn. 'phone@3x')
+        device_scale_factor: Verilirse preset'in DPR değerini ezer
+
+    Returns:
+        CDP parametre sözlüğü
+
+    Raises:
+        KeyError: Bilinmeyen preset
+    """
+    metrics = dict(VIEWPORT_PRESETS[preset])
+    if device_scale_factor is not None:
+        metrics["deviceScaleFactor"] = device_scale_factor
+    return metrics
@@ -0,0 +1,95 @@
+"""
+Artefakt Deposu
+Büyük çıktıları (HAR, yanıt gövdeleri vb.) yanıta gömmek yerine diske yazar
+"""
+import os
+import uuid
+from datetime import datetime
+from typing import Iterable
+
+from app.config import settings
+
+
+class ArtifactStore:
+    """
+    Yerel dizin tabanlı artefakt deposu
+    Dosyalar <base_dir>/<tür>/<YYYYMMDD>/<uuid><uzantı> altında tutulur
+    """
+
+    def __init__(self, base_dir: str) -> None:
+        """
+        Artefakt deposunu başlat
+
+        Args:
+            base_dir: Artefaktların yazılacağı kök dizin
+        """
+        self.base_dir = base_dir
+
+    def _new_key(self, kind: str, suffix: str) -> str:
+        """
+        Yeni artefakt anahtarı (kök dizine göreli yol) üretir
+
+        Args:
+            kind: Artefakt türü (örn. 'har')
+            suffix: Dosya uzantısı (örn. '.har')
+
+        Returns:
+            Göreli yol
+        """
+        return os.path.join(kind, datetime.now().strftime("%Y%m%d"), f"{uuid.uuid4().hex}{suffix}")
+
+    def write_chunks(self, kind: str, suffix: str, chunks: Iterable[bytes]) -> str:
+        """
+        Parçaları sırayla dosyaya yazar (içerik bellekte birleştirilmez)
+
+        Yazma önce geçici dosyaya yapılır, tamamlanınca yerine taşınır;
+        yarım kalan artefakt görünmez.
+
+        Args:
+            kind: Artefakt türü
+            suffix: Dosya uzantısı
+            chunks: Yazılacak byte parçaları
+
+        Returns:
+            Artefakt anahtarı (kök dizine göreli yol)
+
+        Raises:
+            OSError: Dizin oluşturma veya yazma hatası
+        """
+        key = self._new_key(kind, suffix)
+        path = os.path.join(self.base_dir, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return key
+
+    def write_bytes(self, kind: str, suffix: str, data: bytes) -> str:
+        """
+        Tek parça içeriği dosyaya yazar
+
+        Args:
+            kind: Artefakt türü
+            suffix: Dosya uzantısı
+            data: İçerik
+
+        Returns:
+            Artefakt anahtarı (kök dizine göreli yol)
+
+        Raises:
+            OSError: Dizin oluşturma veya yazma hatası
+        """
+        return self.write_chunks(kind, suffix, (data,))
+
+
+# Global artifact store instance (singleton)
+artifact_store = ArtifactStore(settings.artifact_dir)
@@ -1,10 +1,19 @@
 """
 Black-List Yönetimi
 Domain'leri filtrelemek için kullanılır
+
+Dosya değişiklikleri POST /blacklist/reload ile yüklenir: mtime/boyut
+değiştiyse yeni indeks senkron kurulur ve tek atamayla eskisinin yerine
+geçer (worker/tarayıcı restart gerekmez). /scrape isteklerinde yeniden
+yükleme yapılmaz; büyük listelerde kurulum CPU yoğundur (10M satır ~40s).
 """
+import os
+import time
 from urllib.parse import urlparse
-from typing import Set
+from typing import Optional, Tuple
 from app.config import settings
+from app.core.domain_index import ReversedDomainSet, parse_host_line
+from app.core.logger import loguru_logger as logger
 
 
 class BlacklistManager:
@@ -19,13 +28,32 @@ class BlacklistManager:
         Args:
             file_path: Black-list dosya yolu
         """
-        self.blacklist: Set[str] = set()
+        self.file_path = file_path
+        self.index = ReversedDomainSet()
+        # Yüklenen dosyanın (mtime_ns, boyut) imzası
+        self._signature: Optional[Tuple[int, int]] = None
+        self.load_seconds = 0.0
+        # Kurulum sürerken True - ikinci bir yükleme başlatılmaz
+        self.reloading = False
         self._load_blacklist(file_path)
 
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        """Dosyanın (mtime_ns, boyut) imzası, okunamıyorsa None"""
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
     def _load_blacklist(self, file_path: str) -> None:
         """
         Dosyadan black-list domainlerini yükler
 
+        Satırlar tracker/reklam listeleriyle aynı biçimleri kabul eder
+        (domain, hosts dosyası, ||domain^). Üst domain'i listede olan
+        alt domain'ler indekse alınmaz. Yeni indeks tamamen kurulduktan
+        sonra tek atamayla self.index'e yazılır; hata olursa eskisi kalır.
+
         Args:
             file_path: Black-list dosya yolu
 
@@ -33,17 +61,55 @@ class BlacklistManager:
             FileNotFoundError: Dosya bulunamazsa
             IOError: Dosya okunamazsa
         """
+        start = time.time()
+        # İmza okumadan önce alınır: okuma sırasında yapılan değişiklik sonraki kontrolde yakalanır
+        signature = self._file_signature()
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    # Boş satırları ve whitespace'i temizle
-                    domain = line.strip()
-                    if domain and not domain.startswith('#'):
-                        self.blacklist.add(domain.lower())
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                # Boş/yorum satırları parse_host_line'da None döner
+                index = ReversedDomainSet.from_domains(filter(None, map(parse_host_line, f)))
         except FileNotFoundError:
             raise FileNotFoundError(f"Black-list dosyası bulunamadı: {file_path}")
         except IOError as e:
             raise IOError(f"Black-list dosyası okunamadı: {e}")
+        self.index = index
+        self._signature = signature
+        self.load_seconds = time.time() - start
+
+    def needs_reload(self) -> bool:
+        """
+        Dosya son yüklemeden sonra değişti mi
+
+        Returns:
+            Yeniden yükleme gerekiyorsa True (dosya yoksa False - eski liste korunur)
+        """
+        signature = self._file_signature()
+        return signature is not None and signature != self._signature
+
+    def reload(self) -> str:
+        """
+        Dosya değiştiyse indeksi senkron olarak yeniden kurar ve değiştirir
+
+        Kurulum sürerken istekler eski indeksi kullanır. Başka bir kurulum
+        sürüyorsa hemen döner. Hata olursa eski indeks korunur.
+
+        Returns:
+            'reloaded', 'unchanged', 'busy' veya 'error'
+        """
+        if self.reloading:
+            return "busy"
+        if not self.needs_reload():
+            return "unchanged"
+        self.reloading = True
+        try:
+            self._load_blacklist(self.file_path)
+        except (FileNotFoundError, IOError) as e:
+            logger.warning(f"⚠️ Black-list yeniden yüklenemedi, eski liste kullanılıyor: {e}")
+            return "error"
+        finally:
+            self.reloading = False
+        logger.info(f"🔄 Black-list yeniden yüklendi - {len(self.index)} domain ({self.load_seconds:.2f}s)")
+        return "reloaded"
 
     def _extract_domain(self, url_or_domain: str) -> str:
         """
@@ -72,7 +138,8 @@ class BlacklistManager:
     def is_blacklisted(self, url_or_domain: str) -> bool:
         """
         Domain'in black-list'te olup olmadığını kontrol eder
-        Subdomain kontrolü de yapar (Hata #3 düzeltmesi)
+        Subdomain kontrolü de yapar (Hata #3 düzeltmesi) - tam ve üst
+        domain eşleşmesi tek ikili aramayla bulunur
 
         Args:
             url_or_domain: Kontrol edilecek URL veya domain
@@ -80,31 +147,16 @@ class BlacklistManager:
         Returns:
             True if blacklisted, False otherwise
         """
-        domain = self._extract_domain(url_or_domain)
-        
-        # Tam eşleşme kontrolü
-        if domain in self.blacklist:
-            return True
-        
-        # Subdomain kontrolü - parent domain'leri kontrol et
-        # En az 2 parça olmalı (örn. example.com)
-        parts = domain.split('.')
-        if len(parts) >= 2:
-            for i in range(1, len(parts)):  # İlk parçadan başla (subdomain'i atla)
-                parent_domain = '.'.join(parts[i:])
-                if parent_domain in self.blacklist:
-                    return True
-        
-        return False
+        return self._extract_domain(url_or_domain) in self.index
 
     def get_blacklist_count(self) -> int:
         """
         Black-list'teki domain sayısını döndürür
 
         Returns:
-            Domain sayısı
+            İndeksteki domain sayısı (üst domain'i listede olanlar hariç)
         """
-        return len(self.blacklist)
+        return len(self.index)
 
 
 # Global blacklist manager instance (singleton)
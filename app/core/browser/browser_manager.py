@@ -46,10 +46,10 @@ class BrowserManager:
         self.driver = self.driver_manager.driver
         
         # Helper sınıflarını başlat
-        self.memory_cleaner = MemoryCleaner(self.driver)
-        self.screenshot_helper = ScreenshotHelper(self.driver)
-        self.popup_handler = PopupHandler(self.driver)
-        self.network_logger = NetworkLogger(self.driver)
+        self.memory_cleaner = MemoryCleaner(self.driver, self.driver_manager.event_stream)
+        self.screenshot_helper = ScreenshotHelper(self.driver, self.driver_manager.event_stream)
+        self.popup_handler = PopupHandler(self.driver, self.driver_manager.event_stream)
+        self.network_logger = NetworkLogger(self.driver, self.driver_manager.event_stream)
         # AntiDetection sınıfı artık driver_manager içinde kullanılıyor
         # self.anti_detection = AntiDetection(self.driver)
         self.captcha_solver = CaptchaSolver(self.popup_handler)
@@ -59,7 +59,8 @@ class BrowserManager:
             self.driver,
             self.popup_handler,
             self.screenshot_helper,
-            self.network_logger
+            self.network_logger,
+            self.driver_manager.consent_cookies
         )
         
         # Son olarak initialized bayrağını ayarla
@@ -71,10 +72,10 @@ class BrowserManager:
         self.driver = self.driver_manager.driver
         
         # Helper sınıflarını güncelle
-        self.memory_cleaner = MemoryCleaner(self.driver)
-        self.screenshot_helper = ScreenshotHelper(self.driver)
-        self.popup_handler = PopupHandler(self.driver)
-        self.network_logger = NetworkLogger(self.driver)
+        self.memory_cleaner = MemoryCleaner(self.driver, self.driver_manager.event_stream)
+        self.screenshot_helper = ScreenshotHelper(self.driver, self.driver_manager.event_stream)
+        self.popup_handler = PopupHandler(self.driver, self.driver_manager.event_stream)
+        self.network_logger = NetworkLogger(self.driver, self.driver_manager.event_stream)
         # AntiDetection artık driver_manager içinde kullanılıyor
         # self.anti_detection = AntiDetection(self.driver)
         self.captcha_solver = CaptchaSolver(self.popup_handler)
@@ -84,7 +85,8 @@ class BrowserManager:
             self.driver,
             self.popup_handler,
             self.screenshot_helper,
-            self.network_logger
+            self.network_logger,
+            self.driver_manager.consent_cookies
         )
     
     def restart(self) -> None:
@@ -93,10 +95,10 @@ class BrowserManager:
         self.driver = self.driver_manager.driver
         
         # Helper sınıflarını güncelle
-        self.memory_cleaner = MemoryCleaner(self.driver)
-        self.screenshot_helper = ScreenshotHelper(self.driver)
-        self.popup_handler = PopupHandler(self.driver)
-        self.network_logger = NetworkLogger(self.driver)
+        self.memory_cleaner = MemoryCleaner(self.driver, self.driver_manager.event_stream)
+        self.screenshot_helper = ScreenshotHelper(self.driver, self.driver_manager.event_stream)
+        self.popup_handler = PopupHandler(self.driver, self.driver_manager.event_stream)
+        self.network_logger = NetworkLogger(self.driver, self.driver_manager.event_stream)
         # AntiDetection artık driver_manager içinde kullanılıyor
         # self.anti_detection = AntiDetection(self.driver)
         self.captcha_solver = CaptchaSolver(self.popup_handler)
@@ -106,7 +108,8 @@ class BrowserManager:
             self.driver,
             self.popup_handler,
             self.screenshot_helper,
-            self.network_logger
+            self.network_logger,
+            self.driver_manager.consent_cookies
         )
     
     def cleanup_temp_files(self) -> None:
@@ -145,6 +148,8 @@ class BrowserManager:
         except Exception as e:
             # Hata durumunda zombi process'leri temizle ve tarayıcıyı restart et
             logger.error(f"Scrape hatası, tarayıcı restart ediliyor: {str(e)}")
+            # Restart popup handler'ı yeniden oluşturur; olaylar önce alınır
+            challenge_events = list(self.popup_handler.outcomes)
             
             # Zombi process temizleme
             try:
@@ -160,7 +165,8 @@ class BrowserManager:
             return ScrapeResponse(
                 status="error",
                 logs=[f"❌ HATA: {str(e)}"],
-                duration=0
+                duration=0,
+                challenge_events=challenge_events
             )
     
     def quit(self) -> None:
@@ -2,7 +2,7 @@
 Captcha Solver Sınıfı
 Captcha çözme işlemleri
 """
-from typing import Any, List
+from typing import Any, List, Optional
 
 
 class CaptchaSolver:
@@ -20,7 +20,8 @@ class CaptchaSolver:
         """
         self.popup_handler = popup_handler
     
-    def solve_captcha_and_consent(self, logs: list[str], is_google: bool = False) -> None:
+    def solve_captcha_and_consent(self, logs: list[str], is_google: bool = False,
+                                  domain: Optional[str] = None, step: Optional[str] = None) -> None:
         """
         Captcha ve consent formlarını otomatik çözer.
         
@@ -34,9 +35,11 @@ class CaptchaSolver:
         Args:
             logs: Log listesi
             is_google: Google sayfası mı
+            domain: Sayfanın host'u (challenge cache anahtarı için)
+            step: Scrape adımı (challenge olayları için)
         
         Raises:
             Exception: Captcha çözme hatası
         """
         # Popup handler'dan solve_captcha_and_consent metodunu çağır
-        self.popup_handler.solve_captcha_and_consent(logs, is_google)
+        self.popup_handler.solve_captcha_and_consent(logs, is_google, domain, step)
@@ -0,0 +1,262 @@
+"""
+CDP Event Stream Sınıfı
+Remote debugging endpoint'i üzerinden kalıcı CDP bağlantısı
+
+Chrome 144+ sürümlerinde driver.get_log("performance") çalışmadığı için
+Network.* olayları ayrı bir WebSocket oturumundan dinlenir. Thread
+kullanılmaz: olaylar Chrome/soket tarafında birikir, drain() çağrıldığında
+bloklamadan okunup hedef (target) başına sınırlı bir ring buffer'a yazılır.
+Sayfa beklemeleri sırasında (PopupHandler bekleme noktaları) byte sınırlı
+drain yapılır; Chrome'un gönderim kuyruğu adım sonuna kadar şişmez.
+"""
+import json
+import select
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+
+import requests
+import websocket  # websocket-client
+
+from app.core.logger import loguru_logger as logger
+
+
+# Tamponlanacak olaylar - diğerleri (örn. çok sık gelen Network.dataReceived)
+# JSON parse edilmeden atlanır
+NETWORK_EVENTS = frozenset({
+    "Network.requestWillBeSent",
+    "Network.responseReceived",
+    "Network.loadingFinished",
+    "Network.loadingFailed",
+})
+
+# Chrome olay mesajlarını {"method":"...","params":{...}} sırasıyla serileştirir
+_METHOD_PREFIX = '{"method"'
+
+
+class CDPEventStream:
+    """
+    Senkron CDP olay akışı
+    Network olaylarını hedef başına sınırlı ring buffer'da toplar
+    """
+
+    def __init__(self, port: int, buffer_size: int):
+        """
+        CDP event stream başlat
+
+        Args:
+            port: Chrome remote debugging portu
+            buffer_size: Hedef başına tutulacak maksimum olay sayısı
+        """
+        self.port = port
+        self.buffer_size = buffer_size
+        self.target_id: Optional[str] = None
+        self._ws = None
+        self._next_id = 0
+        self._buffers: Dict[str, Deque[dict]] = {}
+        # Ring buffer dolduğu için üzerine yazılan olay sayısı
+        self.dropped = 0
+        # Her olayı (ring buffer'dan bağımsız) artımlı tüketen dinleyiciler
+        self._listeners: List[Callable[[dict], None]] = []
+
+    @property
+    def connected(self) -> bool:
+        """Bağlantı açık mı"""
+        return self._ws is not None and self._ws.connected
+
+    def connect(self, target_id: Optional[str] = None, timeout: float = 5.0) -> None:
+        """
+        Sayfa hedefine bağlanır ve Network domain'ini etkinleştirir
+
+        Args:
+            target_id: Bağlanılacak hedef (chromedriver window handle'ı = target id).
+                       None ise ilk sayfa hedefi kullanılır.
+            timeout: HTTP/WebSocket zaman aşımı (saniye)
+
+        Raises:
+            RuntimeError: Uygun sayfa hedefi bulunamazsa
+            Exception: Bağlantı hatası
+        """
+        self.close()
+
+        targets = requests.get(f"http://127.0.0.1:{self.port}/json/list", timeout=timeout).json()
+        pages = [t for t in targets if t.get("type") == "page" and t.get("webSocketDebuggerUrl")]
+        page = next((t for t in pages if target_id and t.get("id") == target_id), None)
+        if page is None and pages:
+            page = pages[0]
+        if page is None:
+            raise RuntimeError("CDP sayfa hedefi bulunamadı")
+
+        # Origin başlığı gönderilmezse --remote-allow-origins gerekmez
+        self._ws = websocket.create_connection(
+            page["webSocketDebuggerUrl"],
+            timeout=timeout,
+            suppress_origin=True
+        )
+        self.target_id = page["id"]
+        # Önceki oturumun (restart öncesi) hedefleri artık geçersiz
+        self._buffers = {self.target_id: deque(maxlen=self.buffer_size)}
+        self.dropped = 0
+        self.send("Network.enable", {})
+
+    def send(self, method: str, params: Optional[Dict[str, Any]] = None) -> int:
+        """
+        CDP komutu gönderir (yanıt beklenmez)
+
+        Args:
+            method: CDP metodu
+            params: Parametreler
+
+        Returns:
+            Komut id'si
+
+        Raises:
+            Exception: Gönderim hatası
+        """
+        self._next_id += 1
+        self._ws.send(json.dumps({"id": self._next_id, "method": method, "params": params or {}}))
+        return self._next_id
+
+    def call(self, method: str, params: Optional[Dict[str, Any]] = None, timeout: float = 5.0) -> Dict[str, Any]:
+        """
+        CDP komutu gönderir ve yanıtını bekler
+
+        Beklerken gelen olaylar normal şekilde tampona yazılır.
+
+        Args:
+            method: CDP metodu
+            params: Parametreler
+            timeout: Maksimum bekleme süresi (saniye)
+
+        Returns:
+            Komutun result alanı
+
+        Raises:
+            TimeoutError: Süre içinde yanıt gelmezse
+            RuntimeError: CDP hata döndürürse
+            Exception: Bağlantı hatası
+        """
+        command_id = self.send(method, params)
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0 or not select.select([self._ws.sock], [], [], remaining)[0]:
+                raise TimeoutError(f"CDP yanıtı zaman aşımı: {method}")
+            raw = self._ws.recv()
+            if raw.startswith(_METHOD_PREFIX):
+                self._handle_message(raw)
+                continue
+            message = json.loads(raw)
+            if message.get("id") != command_id:
+                continue  # Yanıtı beklenmeyen eski komut (örn. Network.enable)
+            if "error" in message:
+                raise RuntimeError(f"CDP hatası ({method}): {message['error'].get('message', '')}")
+            return message.get("result", {})
+
+    def _handle_message(self, raw: str) -> None:
+        """
+        Ham mesajı işler - sadece ilgili olaylar parse edilip tampona yazılır
+
+        Args:
+            raw: WebSocket mesajı
+        """
+        if not raw.startswith(_METHOD_PREFIX):
+            return  # Komut yanıtı
+        start = raw.find('"', len(_METHOD_PREFIX)) + 1
+        end = raw.find('"', start)
+        if raw[start:end] not in NETWORK_EVENTS:
+            return
+
+        event = json.loads(raw)
+        buffer = self._buffers[self.target_id]
+        if len(buffer) == buffer.maxlen:
+            self.dropped += 1
+        buffer.append(event)
+        for listener in self._listeners:
+            listener(event)
+
+    def add_listener(self, listener: Callable[[dict], None]) -> None:
+        """
+        Olay dinleyicisi ekler - drain() sırasında her olay için çağrılır
+
+        Args:
+            listener: Olay sözlüğünü alan fonksiyon
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[dict], None]) -> None:
+        """
+        Olay dinleyicisini kaldırır
+
+        Args:
+            listener: Daha önce eklenen fonksiyon
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def drain(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Soketteki bekleyen mesajları bloklamadan okur
+
+        Args:
+            max_bytes: Bu çağrıda okunacak yaklaşık üst sınır (None: hepsi).
+                       Bekleme noktalarında çağrı süresini sınırlar; adım
+                       sınırlarında hepsi okunur.
+
+        Returns:
+            Okunan mesaj sayısı
+        """
+        if not self.connected:
+            return 0
+
+        count = 0
+        read = 0
+        try:
+            # websocket-client çerçeve için gerekenden fazla okumaz,
+            # bu yüzden ham soketin okunabilir olması yeterli bir kontrol
+            while select.select([self._ws.sock], [], [], 0)[0]:
+                raw = self._ws.recv()
+                if not raw:
+                    break
+                self._handle_message(raw)
+                count += 1
+                read += len(raw)
+                if max_bytes is not None and read >= max_bytes:
+                    break
+        except Exception as e:
+            logger.warning(f"⚠️ CDP event stream okuma hatası: {e}")
+            self.close()
+        return count
+
+    def events(self, methods: Optional[Iterable[str]] = None) -> List[dict]:
+        """
+        Bekleyen mesajları okuyup tampondaki olayları döndürür
+
+        Args:
+            methods: Sadece bu metotlara ait olaylar (None ise hepsi)
+
+        Returns:
+            {"method": ..., "params": ...} sözlükleri listesi
+        """
+        self.drain()
+        buffer = self._buffers.get(self.target_id, ())
+        if methods is None:
+            return list(buffer)
+        wanted = set(methods)
+        return [event for event in buffer if event["method"] in wanted]
+
+    def clear(self) -> None:
+        """Soketi boşaltır ve tüm tamponları temizler"""
+        self.drain()
+        for buffer in self._buffers.values():
+            buffer.clear()
+        self.dropped = 0
+
+    def close(self) -> None:
+        """Bağlantıyı kapatır"""
+        if self._ws is not None:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+        self._ws = None
@@ -0,0 +1,182 @@
+"""
+Challenge Cache
+Domain bazında hangi consent/captcha widget'ının ve seçicinin işe yaradığını hatırlar
+
+Kayıtlar kayıt edilebilir domain (örn. shop.example.co.uk -> example.co.uk)
+anahtarıyla JSON dosyasında tutulur ve CHALLENGE_CACHE_TTL sonunda geçersiz
+olur. Değişiklikler bellekte tutulur; dosya en fazla
+CHALLENGE_CACHE_SAVE_INTERVAL'da bir (ve kapanışta) geçici dosyaya yazılıp
+yerine taşınır.
+"""
+import json
+import os
+import time
+from typing import Dict, Optional
+
+from app.config import settings
+
+
+# Kayıt edilebilir domain'i üç etiketten oluşan yaygın çok parçalı son ekler
+# (tam Public Suffix List yerine; eşleşmeyenlerde son iki etiket kullanılır)
+MULTI_PART_SUFFIXES = frozenset({
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "me.uk", "net.uk",
+    "com.tr", "net.tr", "org.tr", "gov.tr", "edu.tr", "gen.tr", "web.tr", "bel.tr", "k12.tr",
+    "com.au", "net.au", "org.au", "co.nz", "co.jp", "ne.jp", "or.jp", "co.kr",
+    "com.br", "com.cn", "com.mx", "com.ar", "com.sg", "com.hk", "com.tw", "co.in", "co.za",
+})
+
+
+def registrable_domain(host: str) -> str:
+    """
+    Host'un kayıt edilebilir domain'ini döndürür
+
+    Args:
+        host: Host adı (port içerebilir)
+
+    Returns:
+        Küçük harfli kayıt edilebilir domain (IP adresleri olduğu gibi döner)
+    """
+    host = host.lower().split(':', 1)[0].strip('.')
+    labels = host.split('.')
+    if len(labels) <= 2 or labels[-1].isdigit():
+        return host
+    if '.'.join(labels[-2:]) in MULTI_PART_SUFFIXES:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+class ChallengeCache:
+    """
+    Domain -> {"widget", "selector", "updated_at"} önbelleği
+    widget None ise domain'de widget bulunmadığı kaydedilmiştir
+    """
+
+    def __init__(self, file_path: str, ttl: int, save_interval: int = 0) -> None:
+        """
+        Önbelleği dosyadan yükler
+
+        Dosya yoksa veya bozuksa boş başlanır (hata load_error'a yazılır,
+        import sırasında loglama yapılmaz).
+
+        Args:
+            file_path: JSON dosya yolu
+            ttl: Kayıt geçerlilik süresi (saniye, 0: önbellek kapalı)
+            save_interval: Dosyaya yazma aralığı (saniye, 0: her değişiklikte)
+        """
+        self.file_path = file_path
+        self.ttl = ttl
+        self.save_interval = save_interval
+        self.load_error: Optional[str] = None
+        self._entries: Dict[str, dict] = {}
+        # Yazılmamış değişiklik var mı, son yazma zamanı
+        self._dirty = False
+        self._saved_at = time.time()
+        if self.enabled:
+            self._load()
+
+    @property
+    def enabled(self) -> bool:
+        """Önbellek açık mı"""
+        return self.ttl > 0 and bool(self.file_path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        """JSON dosyasını okur, süresi dolmuş kayıtları atar"""
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (IOError, ValueError) as e:
+            self.load_error = f"Challenge cache okunamadı ({self.file_path}): {e}"
+            return
+        now = time.time()
+        self._entries = {
+            domain: entry for domain, entry in data.items()
+            if isinstance(entry, dict) and now - entry.get("updated_at", 0) < self.ttl
+        }
+
+    def _save(self) -> None:
+        """
+        Kayıtları dosyaya yazar (geçici dosya + os.replace)
+
+        Raises:
+            OSError: Yazma hatası
+        """
+        directory = os.path.dirname(self.file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.file_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.file_path)
+
+    def get(self, domain: str) -> Optional[dict]:
+        """
+        Domain'in geçerli kaydını döndürür
+
+        Args:
+            domain: Kayıt edilebilir domain
+
+        Returns:
+            {"widget", "selector", "updated_at"} veya kayıt yok/süresi dolmuşsa None
+        """
+        entry = self._entries.get(domain)
+        if entry is None:
+            return None
+        if time.time() - entry.get("updated_at", 0) >= self.ttl:
+            del self._entries[domain]
+            return None
+        return entry
+
+    def record(self, domain: str, widget: Optional[str], selector: Optional[str]) -> None:
+        """
+        Domain için sonucu kaydeder
+
+        Kayıt bellekte güncellenir; dosya save_interval dolduysa yazılır.
+        Aynı sonuç TTL'in yarısından yeniyse kayıt değiştirilmez.
+
+        Args:
+            domain: Kayıt edilebilir domain
+            widget: Başarılı widget ('google_consent', 'cloudflare', ...) veya None (widget yok)
+            selector: Başarılı seçici veya None
+
+        Raises:
+            OSError: Dosya yazma hatası
+        """
+        if not self.enabled:
+            return
+        now = time.time()
+        entry = self._entries.get(domain)
+        if (entry is not None and entry.get("widget") == widget and entry.get("selector") == selector
+                and now - entry.get("updated_at", 0) < self.ttl / 2):
+            return
+        self._entries[domain] = {"widget": widget, "selector": selector, "updated_at": now}
+        self._dirty = True
+        if now - self._saved_at >= self.save_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Yazılmamış değişiklikleri dosyaya yazar (yoksa hiçbir şey yapmaz)
+
+        Raises:
+            OSError: Dosya yazma hatası (değişiklikler sonraki flush'ta tekrar denenir)
+        """
+        if not self._dirty or not self.enabled:
+            return
+        now = time.time()
+        self._saved_at = now
+        # Dosya büyümesin: yazarken süresi dolmuş kayıtlar atılır
+        for domain in [d for d, e in self._entries.items() if now - e.get("updated_at", 0) >= self.ttl]:
+            del self._entries[domain]
+        self._save()
+        self._dirty = False
+
+
+# Global challenge cache instance (singleton) - başlangıçta bir kez yüklenir
+challenge_cache = ChallengeCache(
+    settings.challenge_cache_file, settings.challenge_cache_ttl, settings.challenge_cache_save_interval
+)
@@ -0,0 +1,232 @@
+"""
+Consent Cookies
+Arama motorları için consent/ayar çerezlerini sürücü başlarken önceden yükler
+
+Driver incognito çalıştığı için her restart'ta çerezler kaybolur ve Google
+consent ekranı yeniden çıkar. Bilinen çerezler Network.setCookies ile
+başlangıçta yüklenir; başarılı arama adımlarından sonra tarayıcıdaki güncel
+değerler okunup dosyaya yazılır ve sonraki sürücülerde bunlar kullanılır.
+"""
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from app.config import settings
+from app.core.logger import loguru_logger as logger
+from app.payloads.challenge_probe_js import GOOGLE_CONSENT_PAGE_JS
+
+
+# Çerez ömrü (Google SOCS ~13 ay)
+COOKIE_LIFETIME = 390 * 24 * 3600
+
+# Motor -> (çerezlerin okunacağı URL, varsayılan çerezler)
+# Google: SOCS ("Tümünü kabul et" sonrası), CONSENT (eski biçim)
+# DuckDuckGo: consent ekranı yok; bölge ayarı (l=wt-wt) sabitlenir
+DEFAULT_COOKIES: Dict[str, dict] = {
+    "google": {
+        "url": "https://www.google.com/",
+        "cookies": [
+            {"name": "SOCS", "value": "CAESHAgBEhJnd3NfMjAyMzA4MTAtMF9SQzIaAmVuIAEaBgiAo_CmBg",
+             "domain": ".google.com", "path": "/", "secure": True, "sameSite": "Lax"},
+            {"name": "CONSENT", "value": "YES+cb",
+             "domain": ".google.com", "path": "/", "secure": True, "sameSite": "None"},
+        ],
+    },
+    "duckduckgo": {
+        "url": "https://duckduckgo.com/",
+        "cookies": [
+            {"name": "l", "value": "wt-wt",
+             "domain": "duckduckgo.com", "path": "/", "secure": True, "sameSite": "Lax"},
+        ],
+    },
+}
+
+# Motor -> consent ekranını tespit eden script (listede olmayanlarda consent ekranı yok)
+CONSENT_PAGE_JS: Dict[str, str] = {
+    "google": GOOGLE_CONSENT_PAGE_JS,
+}
+
+# CDP Network.Cookie alanlarından saklananlar
+_STORED_FIELDS = ("name", "value", "domain", "path", "secure", "sameSite")
+
+
+class ConsentCookieStore:
+    """
+    Motor bazında son bilinen çerez değerleri
+    Dosyada olmayan motorlar için DEFAULT_COOKIES kullanılır
+    """
+
+    def __init__(self, file_path: str) -> None:
+        """
+        Kayıtlı çerezleri dosyadan yükler (yoksa veya bozuksa varsayılanlar)
+
+        Args:
+            file_path: JSON dosya yolu (boş: sadece bellek)
+        """
+        self.file_path = file_path
+        self.load_error: Optional[str] = None
+        self._cookies: Dict[str, List[dict]] = {
+            engine: [dict(c) for c in spec["cookies"]] for engine, spec in DEFAULT_COOKIES.items()
+        }
+        if file_path:
+            self._load()
+
+    def _load(self) -> None:
+        """JSON dosyasındaki motor çerezlerini varsayılanların üzerine yazar"""
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (IOError, ValueError) as e:
+            self.load_error = f"Consent çerez dosyası okunamadı ({self.file_path}): {e}"
+            return
+        for engine, cookies in data.items():
+            if engine in DEFAULT_COOKIES and isinstance(cookies, list) and cookies:
+                self._cookies[engine] = cookies
+
+    def _save(self) -> None:
+        """
+        Çerezleri dosyaya yazar (geçici dosya + os.replace)
+
+        Raises:
+            OSError: Yazma hatası
+        """
+        directory = os.path.dirname(self.file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.file_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._cookies, f, ensure_ascii=False)
+        os.replace(tmp_path, self.file_path)
+
+    def cookies(self, engine: str) -> List[dict]:
+        """
+        Motorun Network.setCookies için hazır çerezleri
+
+        Args:
+            engine: 'google' veya 'duckduckgo'
+
+        Returns:
+            Çerez listesi (expires alanı şimdi + COOKIE_LIFETIME)
+        """
+        expires = int(time.time()) + COOKIE_LIFETIME
+        return [dict(cookie, expires=expires) for cookie in self._cookies.get(engine, [])]
+
+    def update(self, engine: str, browser_cookies: List[dict]) -> bool:
+        """
+        Tarayıcıdan okunan çerezlerle kayıtları günceller
+
+        Sadece motorun takip edilen çerez isimleri alınır; değer
+        değişmediyse dosya yazılmaz.
+
+        Args:
+            engine: Motor adı
+            browser_cookies: Network.getCookies sonucu
+
+        Returns:
+            Değişiklik olduysa True
+
+        Raises:
+            OSError: Dosya yazma hatası
+        """
+        tracked = {cookie["name"] for cookie in DEFAULT_COOKIES[engine]["cookies"]}
+        fresh = {}
+        for cookie in browser_cookies:
+            if cookie.get("name") in tracked and cookie.get("value"):
+                fresh[cookie["name"]] = {field: cookie[field] for field in _STORED_FIELDS if field in cookie}
+        if not fresh:
+            return False
+        current = {cookie["name"]: cookie for cookie in self._cookies[engine]}
+        if all(current.get(name, {}).get("value") == cookie["value"] for name, cookie in fresh.items()):
+            return False
+        current.update(fresh)
+        self._cookies[engine] = list(current.values())
+        if self.file_path:
+            self._save()
+        return True
+
+
+class ConsentCookies:
+    """
+    Sürücü başına consent çerezi yükleme/yenileme
+    """
+
+    def __init__(self, driver: Any, store: Optional[ConsentCookieStore] = None):
+        """
+        Consent cookie yöneticisi başlat
+
+        Args:
+            driver: SeleniumBase driver instance
+            store: Çerez deposu (varsayılan: global consent_cookie_store)
+        """
+        self.driver = driver
+        self.store = store or consent_cookie_store
+        self.seeded: Set[str] = set()
+
+    def seed(self) -> Set[str]:
+        """
+        Tüm motorların çerezlerini Network.setCookies ile yükler
+
+        Returns:
+            Çerezleri yüklenen motorlar
+        """
+        self.seeded = set()
+        if not settings.consent_cookie_seeding:
+            return self.seeded
+        for engine in DEFAULT_COOKIES:
+            try:
+                self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": self.store.cookies(engine)})
+                self.seeded.add(engine)
+            except Exception as e:
+                logger.warning(f"⚠️ {engine} consent çerezleri yüklenemedi: {e}")
+        return self.seeded
+
+    def is_seeded(self, engine: str) -> bool:
+        """Motorun çerezleri bu sürücüde yüklendi mi"""
+        return engine in self.seeded
+
+    def on_consent_page(self, engine: str) -> bool:
+        """
+        Mevcut sayfa motorun consent ekranı mı
+
+        Çerezler yüklenmiş olsa da motor onları reddedebilir veya consent
+        sayfasına yönlendirebilir; bu durumda consent butonları aranmalıdır.
+
+        Args:
+            engine: Motor adı
+
+        Returns:
+            Consent ekranıysa True (kontrol edilemezse False)
+        """
+        script = CONSENT_PAGE_JS.get(engine)
+        if script is None:
+            return False
+        try:
+            return bool(self.driver.execute_script(script))
+        except Exception:
+            return False
+
+    def refresh(self, engine: str) -> None:
+        """
+        Başarılı arama adımından sonra tarayıcıdaki güncel çerezleri saklar
+
+        Sadece consent ekranında olmadığı doğrulanmış sayfalardan sonra
+        çağrılmalıdır (reddedilen çerezler kaydedilmez).
+
+        Args:
+            engine: Motor adı
+        """
+        if engine not in self.seeded:
+            return
+        try:
+            result = self.driver.execute_cdp_cmd("Network.getCookies", {"urls": [DEFAULT_COOKIES[engine]["url"]]})
+            if self.store.update(engine, result.get("cookies", [])):
+                logger.info(f"🍪 {engine} consent çerezleri güncellendi")
+        except Exception as e:
+            logger.debug(f"{engine} consent çerezleri okunamadı: {e}")
+
+
+# Global consent cookie deposu (singleton) - başlangıçta bir kez yüklenir
+consent_cookie_store = ConsentCookieStore(settings.consent_cookie_file)
@@ -13,6 +13,10 @@ from app.config import settings
 from app.core.logger import logger
 from app.utils.user_agents import get_random_user_agent
 from app.payloads.noise_js import get_consistent_noise_js
+from app.payloads.resource_collector_js import get_resource_collector_js
+from app.payloads.sentinel_js import JS_SENTINEL_DOCUMENT_START
+from app.core.browser.cdp_event_stream import CDPEventStream
+from app.core.browser.consent_cookies import ConsentCookies
 
 
 class DriverManager:
@@ -24,6 +28,10 @@ class DriverManager:
     def __init__(self):
         """Driver manager başlat"""
         self.driver = None
+        # Network olayları için kalıcı CDP bağlantısı (start_driver'da kurulur)
+        self.event_stream = None
+        # Arama motoru consent çerezleri (start_driver'da yüklenir)
+        self.consent_cookies = None
         self.user_agent = get_random_user_agent(platform=settings.user_agent_platform)
         self.noise_r = random.randint(settings.noise_min_value, settings.noise_max_value)
         self.noise_g = random.randint(settings.noise_min_value, settings.noise_max_value)
@@ -55,6 +63,10 @@ class DriverManager:
         Raises:
             Exception: Tarayıcı başlatma hatası
         """
+        if self.event_stream:
+            self.event_stream.close()
+            self.event_stream = None
+        
         if self.driver:
             try:
                 self.driver.quit()
@@ -85,7 +97,7 @@ class DriverManager:
             "--disable-popup-blocking",  # Popup blocking'i devre dışı bırak
             "--disable-blink-features=AutomationControlled",  # Automation detection'i devre dışı bırak
             "--disable-features=IsolateOrigins,site-per-process",  # Site isolation'ı devre dışı bırak (memory)
-            "--remote-debugging-port=9222",  # Remote debugging portu
+            f"--remote-debugging-port={settings.remote_debugging_port}",  # Remote debugging portu (CDP event stream)
             "--disable-background-timer-throttling",  # Background timer throttling'i devre dışı bırak
             "--disable-backgrounding-occluded-windows",  # Backgrounding occluded windows'ı devre dışı bırak
             "--disable-renderer-backgrounding",  # Renderer backgrounding'i devre dışı bırak
@@ -110,20 +122,46 @@ class DriverManager:
         except Exception as e:
             logger.warning(f"⚠️ CDP log etkinleştirme uyarısı: {str(e)}")
 
-        # JS Buffer'ını Genişlet (Plan B için - KRİTİK ADIM)
+        # Kalıcı CDP olay akışı (performance logları Chrome 144+'da çalışmıyor)
+        # Network.* olayları sayfa yüklenirken Chrome tarafında birikir, okuma anında tamponlanır
+        try:
+            self.event_stream = CDPEventStream(
+                settings.remote_debugging_port,
+                settings.network_event_buffer_size
+            )
+            self.event_stream.connect(target_id=self.driver.current_window_handle)
+            logger.info(f"✅ CDP event stream bağlandı (target: {self.event_stream.target_id})")
+        except Exception as e:
+            logger.warning(f"⚠️ CDP event stream bağlanamadı, JS fallback kullanılacak: {str(e)}")
+            self.event_stream = None
+
+        # JS Buffer'ını Genişlet + Resource Collector (Plan B için - KRİTİK ADIM)
         # Normalde tarayıcı sadece 150-250 istek tutar, bunu artırıyoruz.
+        # Collector kayıtları PerformanceObserver ile doküman başından itibaren
+        # toplar; buffer dolsa da (veya temizlense de) kayıt kaybolmaz.
         try:
             self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-                "source": "performance.setResourceTimingBufferSize(10000);"
+                "source": f"performance.setResourceTimingBufferSize({settings.js_resource_buffer_size});"
+                          + get_resource_collector_js(settings.js_resource_buffer_size)
             })
-            logger.info("✅ JS Performance buffer genişletildi (10000)")
+            logger.info(f"✅ JS Performance buffer genişletildi, resource collector kuruldu ({settings.js_resource_buffer_size})")
         except Exception as e:
             logger.warning(f"⚠️ JS buffer genişletme uyarısı: {str(e)}")
         
+        # Popup sentinel'i doküman başına kur (sürücü başına bir kez)
+        # Popup temizliği smart wait beklemesinden sonra değil ilk boyamadan itibaren başlar
+        try:
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+                "source": JS_SENTINEL_DOCUMENT_START
+            })
+            logger.info("✅ Popup sentinel doküman başına kuruldu")
+        except Exception as e:
+            logger.warning(f"⚠️ Sentinel kurulum uyarısı, execute_script fallback kullanılacak: {str(e)}")
+        
         # Tarayıcı başlangıcında da buffer genişlet (Hata #5 düzeltmesi)
         try:
-            self.driver.execute_script("performance.setResourceTimingBufferSize(10000);")
-            logger.info("✅ JS Performance buffer başlangıçta genişletildi (10000)")
+            self.driver.execute_script(f"performance.setResourceTimingBufferSize({settings.js_resource_buffer_size});")
+            logger.info(f"✅ JS Performance buffer başlangıçta genişletildi ({settings.js_resource_buffer_size})")
         except Exception as e:
             logger.warning(f"⚠️ JS buffer başlangıç genişletme uyarısı: {str(e)}")
         
@@ -140,6 +178,12 @@ class DriverManager:
             noise_g=self.noise_g,
             noise_b=self.noise_b
         )
+        
+        # Arama motoru consent çerezlerini yükle (Google consent ekranı çıkmaz)
+        self.consent_cookies = ConsentCookies(self.driver)
+        seeded = self.consent_cookies.seed()
+        if seeded:
+            logger.info(f"🍪 Consent çerezleri yüklendi: {', '.join(sorted(seeded))}")
     
     def restart(self) -> None:
         """
@@ -164,6 +208,9 @@ class DriverManager:
         """
         Driver'ı güvenli şekilde kapatır
         """
+        if self.event_stream:
+            self.event_stream.close()
+            self.event_stream = None
         if self.driver:
             try:
                 self.driver.quit()
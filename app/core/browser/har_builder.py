@@ -0,0 +1,249 @@
+"""
+HAR Builder Sınıfı
+CDP Network olaylarından HAR 1.2 çıktısı üretir
+
+Olaylar geldikçe RequestCorrelator ile eşleştirilir; tamamlanan istek
+hemen HAR entry'sine çevrilir, ham olaylar saklanmaz. Entry sayısı
+sınırlıdır, sınır aşılırsa yeni istekler sayılıp atlanır.
+"""
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from app.core.browser.request_correlator import RequestCorrelator
+
+
+HAR_VERSION = "1.2"
+CREATOR = {"name": "sb-scrapper", "version": "3.0.0"}
+PAGE_ID = "page_1"
+
+
+def _iso_time(wall_time: Optional[float]) -> str:
+    """Epoch saniyesini HAR'ın beklediği ISO 8601 formatına çevirir"""
+    if not wall_time:
+        return datetime.now(timezone.utc).isoformat()
+    return datetime.fromtimestamp(wall_time, timezone.utc).isoformat()
+
+
+def _har_headers(headers: Optional[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """
+    CDP header sözlüğünü HAR name/value listesine çevirir
+    Chrome aynı isimli başlıkları '\\n' ile birleştirir, bunlar ayrılır.
+    """
+    result = []
+    for name, value in (headers or {}).items():
+        for part in str(value).split('\n'):
+            result.append({"name": name, "value": part})
+    return result
+
+
+def _duration(start: float, end: float) -> float:
+    """İki ResourceTiming noktası arasındaki süre (ms), bilinmiyorsa -1"""
+    if start < 0 or end < 0:
+        return -1
+    return round(end - start, 3)
+
+
+class HarBuilder:
+    """
+    HAR 1.2 builder
+    Network.* olaylarını tek tek tüketir, sınırlı sayıda entry tutar
+    """
+
+    def __init__(self, max_entries: int, page_url: str = ""):
+        """
+        HAR builder başlat
+
+        Args:
+            max_entries: Tutulacak maksimum entry (ve bekleyen istek) sayısı
+            page_url: Sayfa başlığı olarak kullanılacak URL
+        """
+        self.max_entries = max_entries
+        self.page_url = page_url
+        self.started_at: Optional[float] = None
+        self._entries: List[dict] = []
+        self._skipped = 0
+        self._correlator = RequestCorrelator(self._on_complete, max_entries)
+
+    @property
+    def dropped(self) -> int:
+        """Sınır nedeniyle atlanan istek sayısı"""
+        return self._skipped + self._correlator.dropped
+
+    def add_event(self, event: dict) -> None:
+        """
+        Tek bir CDP olayını işler
+
+        Args:
+            event: {"method": ..., "params": ...} sözlüğü
+        """
+        self._correlator.add_event(event)
+
+    def feed(self, events: Iterable[dict]) -> None:
+        """
+        Olay listesini sırayla işler
+
+        Args:
+            events: CDP olayları
+        """
+        self._correlator.feed(events)
+
+    def _on_complete(self, record: dict) -> None:
+        """Tamamlanan istek kaydını HAR entry'sine çevirir"""
+        if len(self._entries) >= self.max_entries:
+            self._skipped += 1
+            return
+        if self.started_at is None or (record["wall_time"] and record["wall_time"] < self.started_at):
+            self.started_at = record["wall_time"]
+        self._entries.append(self._build_entry(record))
+
+    def _build_timings(self, record: dict) -> Dict[str, float]:
+        """
+        HAR timings alanını hesaplar
+
+        response.timing (ResourceTiming) varsa fazlar ondan, yoksa olay
+        zaman damgalarından (wait/receive) türetilir.
+        """
+        response = record["response"] or {}
+        timing = response.get("timing")
+        start = record["start"]
+        end = record["end"]
+
+        if timing:
+            request_time = timing.get("requestTime", start or 0)
+            first_start = next(
+                (timing[key] for key in ("dnsStart", "connectStart", "sendStart") if timing.get(key, -1) >= 0),
+                -1
+            )
+            send_end = timing.get("sendEnd", -1)
+            headers_end = timing.get("receiveHeadersEnd", -1)
+            receive = -1
+            if end is not None and headers_end >= 0:
+                receive = max(0.0, round((end - request_time) * 1000 - headers_end, 3))
+            return {
+                "blocked": round(first_start, 3) if first_start >= 0 else -1,
+                "dns": _duration(timing.get("dnsStart", -1), timing.get("dnsEnd", -1)),
+                "connect": _duration(timing.get("connectStart", -1), timing.get("connectEnd", -1)),
+                "ssl": _duration(timing.get("sslStart", -1), timing.get("sslEnd", -1)),
+                "send": max(0, _duration(timing.get("sendStart", -1), send_end)),
+                "wait": max(0, _duration(send_end, headers_end)),
+                "receive": max(0, receive),
+            }
+
+        response_time = record["response_time"]
+        wait = receive = 0
+        if start is not None and response_time is not None:
+            wait = round((response_time - start) * 1000, 3)
+            if end is not None:
+                receive = round((end - response_time) * 1000, 3)
+        elif start is not None and end is not None:
+            wait = round((end - start) * 1000, 3)
+        return {"blocked": -1, "dns": -1, "connect": -1, "ssl": -1,
+                "send": 0, "wait": max(0, wait), "receive": max(0, receive)}
+
+    def _build_entry(self, record: dict) -> dict:
+        """İstek kaydından HAR entry'si üretir"""
+        request = record["request"]
+        response = record["response"] or {}
+        url = request.get("url", "")
+        post_data = request.get("postData")
+        timings = self._build_timings(record)
+        # ssl süresi connect'in içinde sayılır
+        total = sum(v for k, v in timings.items() if k != "ssl" and v > 0)
+        protocol = response.get("protocol", "")
+
+        entry = {
+            "pageref": PAGE_ID,
+            "startedDateTime": _iso_time(record["wall_time"]),
+            "time": round(total, 3),
+            "request": {
+                "method": request.get("method", "GET"),
+                "url": url,
+                "httpVersion": protocol,
+                "cookies": [],
+                "headers": _har_headers(request.get("headers")),
+                "queryString": [
+                    {"name": k, "value": v} for k, v in parse_qsl(urlsplit(url).query, keep_blank_values=True)
+                ],
+                "headersSize": -1,
+                "bodySize": len(post_data) if post_data else 0,
+            },
+            "response": {
+                "status": response.get("status", 0),
+                "statusText": response.get("statusText", ""),
+                "httpVersion": protocol,
+                "cookies": [],
+                "headers": _har_headers(response.get("headers")),
+                "content": {"size": 0, "mimeType": response.get("mimeType", "")},
+                "redirectURL": (response.get("headers") or {}).get("location", "")
+                               or (response.get("headers") or {}).get("Location", ""),
+                "headersSize": -1,
+                "bodySize": -1,
+                "_transferSize": record["transfer_size"] if record["transfer_size"] is not None
+                                 else response.get("encodedDataLength", 0),
+            },
+            "cache": {},
+            "timings": timings,
+            "_resourceType": record["type"],
+        }
+        if post_data:
+            entry["request"]["postData"] = {
+                "mimeType": (request.get("headers") or {}).get("Content-Type", ""),
+                "text": post_data
+            }
+        if record["error"]:
+            entry["response"]["_error"] = record["error"]
+        return entry
+
+    def entries(self) -> List[dict]:
+        """
+        Tamamlanan entry'leri döndürür, yanıtı bekleyen istekler de kapatılır
+
+        Returns:
+            HAR entry listesi
+        """
+        self._correlator.flush()
+        return self._entries
+
+    def _log_header(self) -> dict:
+        """Entry'ler hariç HAR log nesnesi"""
+        return {
+            "version": HAR_VERSION,
+            "creator": CREATOR,
+            "pages": [{
+                "startedDateTime": _iso_time(self.started_at),
+                "id": PAGE_ID,
+                "title": self.page_url,
+                "pageTimings": {},
+            }],
+            "comment": f"{self.dropped} istek entry sınırı nedeniyle atlandı" if self.dropped else "",
+        }
+
+    def build(self) -> dict:
+        """
+        HAR belgesini sözlük olarak döndürür
+
+        Returns:
+            {"log": {...}} HAR 1.2 nesnesi
+        """
+        log = self._log_header()
+        log["entries"] = self.entries()
+        return {"log": log}
+
+    def iter_json(self) -> Iterator[bytes]:
+        """
+        HAR belgesini parça parça JSON byte'ı olarak üretir
+
+        Dosyaya yazarken tüm belge tek bir string'de birleştirilmez.
+
+        Yields:
+            UTF-8 JSON parçaları
+        """
+        header = json.dumps(self._log_header(), ensure_ascii=False)
+        # Kapanış süslü parantezini çıkarıp entries dizisini araya ekle
+        yield ('{"log":' + header[:-1] + ',"entries":[').encode('utf-8')
+        for index, entry in enumerate(self.entries()):
+            prefix = "," if index else ""
+            yield (prefix + json.dumps(entry, ensure_ascii=False)).encode('utf-8')
+        yield b']}}'
@@ -5,7 +5,7 @@ Driver loglarını ve geçici dosyaları temizler
 import glob
 import platform
 import shutil
-from typing import Any
+from typing import Any, Optional
 
 from app.config import settings
 from app.core.logger import loguru_logger as logger
@@ -17,14 +17,16 @@ class MemoryCleaner:
     Driver loglarını ve geçici dosyaları temizler
     """
     
-    def __init__(self, driver: Any):
+    def __init__(self, driver: Any, event_stream: Optional[Any] = None):
         """
         Memory cleaner başlat
         
         Args:
             driver: SeleniumBase driver instance
+            event_stream: CDPEventStream instance (opsiyonel)
         """
         self.driver = driver
+        self.event_stream = event_stream
     
     def _clear_driver_logs(self) -> None:
         """
@@ -63,6 +65,14 @@ class MemoryCleaner:
             # Bu durumda JS Performance API kullanılıyor
             pass  # JS fallback kullanılıyor, log gereksiz
 
+        # --- YÖNTEM 1b: CDP Event Stream Ring Buffer'ını Temizle ---
+        if self.event_stream is not None:
+            try:
+                self.event_stream.clear()
+                logger.debug("CDP event stream buffer temizlendi")
+            except Exception as e:
+                logger.debug(f"CDP event stream temizleme hatası: {e}")
+
         # --- YÖNTEM 2: JS Performance Buffer'ı Temizle ---
         try:
             # Resource timing buffer'ı temizle
@@ -2,10 +2,30 @@
 Network Logger Sınıfı
 Network log yakalama işlemleri
 """
+import base64
 import json
-from typing import Any, List
+from typing import Any, Iterable, List, Optional
 
+from app.config import settings
+from app.core.artifact_store import artifact_store
 from app.core.logger import loguru_logger as logger
+from app.core.domain_index import traffic_domain_index
+from app.core.browser.cdp_event_stream import NETWORK_EVENTS
+from app.core.browser.har_builder import HarBuilder
+from app.core.browser.request_correlator import RequestCorrelator
+from app.core.browser.traffic_classifier import classify_traffic
+from app.payloads.resource_collector_js import RESOURCE_DRAIN_JS
+
+
+# CDP kaynak tipleri -> _analyze_traffic_type initiator değerleri
+CDP_INITIATOR_TYPES = {
+    "XHR": "xmlhttprequest",
+    "Fetch": "fetch",
+    "Script": "script",
+}
+
+# Network.getResponseBody yanıt bekleme süresi (saniye)
+BODY_FETCH_TIMEOUT = 5.0
 
 
 class NetworkLogger:
@@ -14,14 +34,28 @@ class NetworkLogger:
     Network log yakalama işlemlerini yönetir
     """
     
-    def __init__(self, driver: Any):
+    def __init__(self, driver: Any, event_stream: Optional[Any] = None):
         """
         Network logger başlat
         
         Args:
             driver: SeleniumBase driver instance
+            event_stream: CDPEventStream instance (opsiyonel, yoksa performance logları denenir)
         """
         self.driver = driver
+        self.event_stream = event_stream
+        # Canlı olarak stream'e bağlı HAR builder (varsa)
+        self._har_builder: Optional[HarBuilder] = None
+        # Adım bazlı yakalama: açık pencerenin adı (None: kaydedilmiyor)
+        self._current_step: Optional[str] = None
+        self._step_logs: List[dict] = []
+        self._segmented = False
+        # Kayıt/byte sınırları (NETWORK_LOG_* ayarları)
+        self._header_allowlist = frozenset(settings.network_log_header_allowlist)
+        self._reset_limits()
+        # API yanıt gövdesi yakalama (istek bazında açılır)
+        self._capture_bodies = False
+        self._body_mime_types = frozenset(settings.api_body_mime_types)
     
     def _is_relevant_url(self, url: str, mime_type: str) -> bool:
         """
@@ -42,6 +76,8 @@ class NetworkLogger:
         """
         URL ve Çağıran (Initiator) bilgisine bakarak trafiğin amacını belirler.
         
+        Kurallar traffic_classifier modülünde önceden derlenmiştir.
+        
         Args:
             url: URL string
             initiator: Çağıran (initiator type)
@@ -49,44 +85,117 @@ class NetworkLogger:
         Returns:
             'api', 'tracker', 'script' veya 'ignore'
         """
-        u = url.lower()
-        
-        # 1. KESİN REDDEDİLECEKLER (Gürültü)
-        # Görsel, Stil, Font, Medya dosyaları
-        extensions_to_ignore = [
-            '.css', '.woff', '.woff2', '.ttf', '.eot', '.svg', '.png', '.jpg',
-            '.jpeg', '.gif', '.ico', '.webp', '.mp4', '.mp3', '.m3u8', '.ts',
-            '.pdf', '.zip'
-        ]
-        if any(u.endswith(ext) or f"{ext}?" in u for ext in extensions_to_ignore):
-            return "ignore"
-
-        # 2. API / VERİ TRAFİĞİ (XHR ve Fetch)
-        # Genellikle JSON veya XML dönerler
-        is_api_keyword = "api" in u or "json" in u or "ajax" in u or "graphql" in u or "v1/" in u
-        if initiator in ['xmlhttprequest', 'fetch'] or is_api_keyword:
-            return "api"
-
-        # 3. TRACKER / ANALYTICS (Genellikle Script veya Pixel)
-        trackers = ['google-analytics', 'facebook', 'pixel', 'gtm', 'stats', 'metrics', 'telemetry']
-        if any(t in u for t in trackers):
-            return "tracker"
-
-        # 4. HARİCİ SCRIPTLER (CDN'den gelen JS kütüphaneleri veya reklamlar)
-        if u.endswith('.js') or '.js?' in u or initiator == 'script':
-            return "script"
-
-        # Geri kalanlar (Navigasyon vb.) önemsiz sayılabilir ama
-        # API kaçırmamak için şüpheli olarak işaretleyebiliriz.
-        return "ignore"
+        return classify_traffic(url, initiator)
+
+    def _domain_category(self, domain: str) -> Optional[str]:
+        """
+        Domain'in tracker/reklam listelerindeki kategorisini döndürür
+
+        Args:
+            domain: URL'in host kısmı (port ve kullanıcı bilgisi içerebilir)
+
+        Returns:
+            'tracker', 'ad' veya listede yoksa None
+        """
+        host = domain.rpartition('@')[2]
+        if not host.startswith('['):  # IPv6 adreslerinde ':' port ayırıcı değil
+            host = host.split(':', 1)[0]
+        return traffic_domain_index.lookup(host)
+
+    def _get_cdp_messages(self, methods: Iterable[str]) -> list[dict]:
+        """
+        İstenen Network.* olaylarını döndürür
+
+        Öncelik kalıcı CDP event stream'dedir (bellek içi okuma, WebDriver
+        round-trip'i yok). Stream yoksa driver.get_log("performance") denenir.
+
+        Args:
+            methods: Döndürülecek CDP olay metotları
+
+        Returns:
+            {"method": ..., "params": ...} sözlükleri listesi
+
+        Raises:
+            Exception: Performance log alma hatası
+        """
+        if self.event_stream is not None and self.event_stream.connected:
+            messages = self.event_stream.events(methods)
+            if self.event_stream.dropped:
+                logger.warning(f"⚠️ CDP ring buffer doldu, {self.event_stream.dropped} olay düşürüldü")
+            return messages
+
+        wanted = set(methods)
+        messages = []
+        for entry in self.driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])["message"]
+                if message["method"] in wanted:
+                    messages.append(message)
+            except Exception:
+                continue
+        return messages
+
+    def _build_cdp_record(self, record: dict) -> Optional[dict]:
+        """
+        Eşleştirilmiş istek kaydını network log formatına çevirir
+
+        Args:
+            record: RequestCorrelator kaydı
+
+        Returns:
+            Network log sözlüğü veya önemsiz trafik için None
+        """
+        request = record["request"]
+        resp = record["response"] or {}
+        url = resp.get("url") or request.get("url", "")
+        
+        domain = url.split('/')[2] if '//' in url else url
+        category = self._domain_category(domain)
+        
+        # Traffic type analizi (CDP kaynak tipi initiator olarak kullanılır)
+        # Listedeki tracker/reklam domain'leri görsel/pixel olsa bile tutulur
+        traffic_type = self._analyze_traffic_type(url, CDP_INITIATOR_TYPES.get(record["type"], ""))
+        if traffic_type == "ignore" and category is None:
+            return None
+        
+        duration_ms = None
+        if record["chain_start"] is not None and record["end"] is not None:
+            duration_ms = round((record["end"] - record["chain_start"]) * 1000, 3)
+        
+        return {
+            "source": "cdp",
+            "request_id": record["request_id"],
+            "type": traffic_type,
+            "category": category,
+            "domain": domain,
+            "url": url,
+            "method": request.get("method", "GET"),
+            "resource_type": record["type"],
+            "status": resp.get("status", 0),
+            "status_text": resp.get("statusText", ""),
+            "mime_type": resp.get("mimeType", ""),
+            "headers": resp.get("headers", {}),
+            # loadingFinished'daki toplam aktarılan byte; yoksa header anındaki değer
+            "size": record["transfer_size"] if record["transfer_size"] is not None
+                    else resp.get("encodedDataLength", 0),
+            "duration_ms": duration_ms,
+            "redirect_chain": record["redirect_chain"],
+            "error": record["error"],
+            "timing": resp.get("timing", {})
+        }
 
     def _get_network_logs_from_cdp(self) -> list[dict]:
         """
         CDP (Chrome DevTools Protocol) ile network loglarını yakalar.
-        Status code, headers, timing gibi detaylı bilgileri içerir.
+        
+        requestWillBeSent, responseReceived, loadingFinished ve loadingFailed
+        olayları requestId ile birleştirilir; her istek için tek kayıt üretilir
+        (son aktarılan byte, toplam süre, yönlendirme zinciri, hata nedeni).
+        Başarısız veya engellenen istekler de error alanıyla döner.
         
         Not: Chrome 144+ sürümleri "performance" log tipini desteklemiyor.
-        Bu durumda JS Performance API fallback kullanılır.
+        Bu yüzden olaylar kalıcı CDP event stream'den okunur; o da yoksa
+        JS Performance API fallback kullanılır.
         
         Returns:
             Network logları listesi
@@ -95,38 +204,23 @@ class NetworkLogger:
             Exception: CDP log alma hatası
         """
         try:
-            # CDP ile network loglarını al
-            logs = self.driver.get_log("performance")
+            messages = self._get_cdp_messages(NETWORK_EVENTS)
             relevant_logs = []
             
-            for entry in logs:
+            def on_complete(record: dict) -> None:
+                # Yönlendirme halkaları son isteğin redirect_chain alanında yer alır
+                if record["redirect_hop"]:
+                    return
                 try:
-                    log_json = json.loads(entry["message"])
-                    message = log_json["message"]
-                    
-                    if message["method"] == "Network.responseReceived":
-                        params = message["params"]
-                        resp = params.get("response", {})
-                        url = resp.get("url", "")
-                        
-                        # Traffic type analizi
-                        traffic_type = self._analyze_traffic_type(url, "")
-                        
-                        if traffic_type != "ignore":
-                            relevant_logs.append({
-                                "source": "cdp",
-                                "type": traffic_type,
-                                "domain": url.split('/')[2] if '//' in url else url,
-                                "url": url,
-                                "status": resp.get("status", 0),
-                                "status_text": resp.get("statusText", ""),
-                                "mime_type": resp.get("mimeType", ""),
-                                "headers": resp.get("headers", {}),
-                                "size": resp.get("encodedDataLength", 0),
-                                "timing": params.get("timing", {})
-                            })
+                    entry = self._build_cdp_record(record)
                 except Exception:
-                    continue
+                    return
+                if entry is not None:
+                    relevant_logs.append(entry)
+            
+            correlator = RequestCorrelator(on_complete, settings.network_event_buffer_size)
+            correlator.feed(messages)
+            correlator.flush()
             
             return relevant_logs
         except Exception:
@@ -135,7 +229,280 @@ class NetworkLogger:
             pass  # JS fallback kullanılıyor, log gereksiz
             return []
 
+    def start_har(self, max_entries: int, page_url: str = "") -> HarBuilder:
+        """
+        HAR kaydını başlatır
+
+        Event stream bağlıysa builder dinleyici olarak eklenir ve olayları
+        okundukça tüketir (ring buffer taşsa bile entry kaybolmaz).
+
+        Args:
+            max_entries: Maksimum HAR entry sayısı
+            page_url: Sayfa URL'i
+
+        Returns:
+            HarBuilder instance
+        """
+        builder = HarBuilder(max_entries, page_url)
+        if self.event_stream is not None and self.event_stream.connected:
+            self.event_stream.add_listener(builder.add_event)
+            self._har_builder = builder
+        return builder
+
+    def finish_har(self, builder: HarBuilder) -> HarBuilder:
+        """
+        HAR kaydını bitirir - bekleyen olaylar builder'a aktarılır
+
+        Stream yoksa olaylar performance loglarından tek seferde beslenir.
+
+        Args:
+            builder: start_har ile alınan builder
+
+        Returns:
+            Aynı builder (entry'leri hazır)
+        """
+        if builder is self._har_builder:
+            self.event_stream.drain()
+            self.event_stream.remove_listener(builder.add_event)
+            self._har_builder = None
+        else:
+            try:
+                builder.feed(self._get_cdp_messages(NETWORK_EVENTS))
+            except Exception as e:
+                logger.warning(f"⚠️ HAR için network olayları alınamadı: {e}")
+        if builder.dropped:
+            logger.warning(f"⚠️ HAR entry sınırı aşıldı, {builder.dropped} istek atlandı")
+        return builder
+
+    def cancel_har(self) -> None:
+        """Yarım kalan HAR kaydının dinleyicisini stream'den ayırır"""
+        if self._har_builder is not None:
+            if self.event_stream is not None:
+                self.event_stream.remove_listener(self._har_builder.add_event)
+            self._har_builder = None
+
+    def _reset_limits(self) -> None:
+        """Sınır sayaçlarını sıfırlar"""
+        self._total_bytes = 0
+        self._dropped_entries = 0
+        self._trimmed_headers = 0
+        self._body_bytes = 0
+        self._skipped_bodies = 0
+
+    def _limit_headers(self, headers: dict) -> dict:
+        """
+        Header'ları allow-list'e göre süzer ve kayıt başına byte sınırını uygular
+
+        Args:
+            headers: Yanıt header'ları
+
+        Returns:
+            Süzülmüş header sözlüğü
+        """
+        allowlist = self._header_allowlist
+        max_bytes = settings.network_log_max_header_bytes
+        kept = {}
+        used = 0
+        for name, value in headers.items():
+            if allowlist and name.lower() not in allowlist:
+                continue
+            size = len(name) + len(str(value))
+            if used + size > max_bytes:
+                self._trimmed_headers += 1
+                continue
+            kept[name] = value
+            used += size
+        return kept
+
+    def _admit(self, entry: dict, collected: List[dict]) -> None:
+        """
+        Kaydı sınırlar dahilindeyse listeye ekler, değilse sayıp atlar
+
+        Args:
+            entry: Network log kaydı
+            collected: Eklenecek liste
+        """
+        if len(collected) >= settings.network_log_max_entries:
+            self._dropped_entries += 1
+            return
+        if entry.get("headers"):
+            entry["headers"] = self._limit_headers(entry["headers"])
+        size = len(json.dumps(entry, default=str))
+        if self._total_bytes + size > settings.network_log_max_total_bytes:
+            self._dropped_entries += 1
+            return
+        self._total_bytes += size
+        collected.append(entry)
+
+    def truncation(self) -> Optional[dict]:
+        """
+        Son yakalamada sınırlar nedeniyle kırpılan veri özeti
+
+        Returns:
+            {"dropped_entries", "trimmed_headers", "bytes"} (atlanan yanıt
+            gövdesi varsa ayrıca "skipped_bodies") veya kırpma yoksa None
+        """
+        if not (self._dropped_entries or self._trimmed_headers or self._skipped_bodies):
+            return None
+        summary = {
+            "dropped_entries": self._dropped_entries,
+            "trimmed_headers": self._trimmed_headers,
+            "bytes": self._total_bytes
+        }
+        if self._skipped_bodies:
+            summary["skipped_bodies"] = self._skipped_bodies
+        return summary
+
+    def _body_allowed(self, entry: dict) -> bool:
+        """
+        Kaydın yanıt gövdesinin yakalanıp yakalanmayacağına karar verir
+
+        Sadece CDP kaynaklı, başarılı 'api' isteklerinin izin verilen
+        MIME tiplerindeki gövdeleri alınır.
+        """
+        if entry.get("type") != "api" or not entry.get("request_id") or entry.get("error"):
+            return False
+        status = entry.get("status") or 0
+        if status < 200 or status >= 300 or status == 204:
+            return False
+        mime_type = (entry.get("mime_type") or "").split(';', 1)[0].strip().lower()
+        return mime_type in self._body_mime_types
+
+    def _fetch_response_body(self, request_id: str) -> bytes:
+        """
+        Network.getResponseBody ile yanıt gövdesini alır
+
+        Args:
+            request_id: CDP requestId
+
+        Returns:
+            Gövde byte'ları
+
+        Raises:
+            Exception: Gövde alınamazsa (kaynak tarayıcıdan atılmış, zaman aşımı vb.)
+        """
+        params = {"requestId": request_id}
+        if self.event_stream is not None and self.event_stream.connected:
+            result = self.event_stream.call("Network.getResponseBody", params, BODY_FETCH_TIMEOUT)
+        else:
+            result = self.driver.execute_cdp_cmd("Network.getResponseBody", params)
+        body = result.get("body", "")
+        if result.get("base64Encoded"):
+            return base64.b64decode(body)
+        return body.encode('utf-8')
+
+    def _capture_response_bodies(self, entries: List[dict]) -> None:
+        """
+        API yanıt gövdelerini artefakt olarak yazar ve kayda referans ekler
+
+        Gövdeler navigasyondan sonra tarayıcıdan atılabildiği için pencere
+        kapanırken (bir sonraki navigasyondan önce) alınır. Gövde başına
+        API_BODY_MAX_BYTES, istek başına API_BODY_MAX_TOTAL_BYTES uygulanır;
+        büyük gövdelerin başı yazılır ve body_truncated işaretlenir.
+
+        Args:
+            entries: Bu pencerede kabul edilen network log kayıtları
+        """
+        for entry in entries:
+            if not self._body_allowed(entry):
+                continue
+            remaining = settings.api_body_max_total_bytes - self._body_bytes
+            if remaining <= 0:
+                self._skipped_bodies += 1
+                continue
+            try:
+                body = self._fetch_response_body(entry["request_id"])
+            except Exception as e:
+                self._skipped_bodies += 1
+                logger.debug(f"Yanıt gövdesi alınamadı ({entry.get('url', '')[:100]}): {e}")
+                continue
+            limit = min(settings.api_body_max_bytes, remaining)
+            entry["body_size"] = len(body)
+            entry["body_truncated"] = len(body) > limit
+            body = body[:limit]
+            suffix = ".json" if "json" in entry["mime_type"] else ".txt"
+            try:
+                entry["body_artifact"] = artifact_store.write_bytes("api-bodies", suffix, body)
+            except OSError as e:
+                self._skipped_bodies += 1
+                logger.warning(f"⚠️ Yanıt gövdesi yazılamadı: {e}")
+                continue
+            self._body_bytes += len(body)
+
+    def start_capture(self, capture_bodies: bool = False) -> None:
+        """
+        Yeni istek için adım bazlı yakalamayı sıfırlar
+
+        Önceki istekten kalan pencere ve olaylar atılır.
+
+        Args:
+            capture_bodies: True ise 'api' isteklerinin yanıt gövdeleri de
+                            artefakt olarak yakalanır
+        """
+        self._current_step = None
+        self._step_logs = []
+        self._segmented = True
+        self._capture_bodies = capture_bodies
+        self._reset_limits()
+        self._discard_pending()
+
+    def _discard_pending(self) -> None:
+        """Henüz okunmamış CDP olaylarını atar"""
+        if self.event_stream is not None and self.event_stream.connected:
+            self.event_stream.clear()
+
+    def begin_step(self, step: Optional[str]) -> None:
+        """
+        Yeni yakalama penceresi açar, açık pencereyi kapatır
+
+        Pencere kapanırken o adımın trafiği yakalanır ve step alanıyla
+        etiketlenir. step=None ile açılan pencerenin (örn. arama motorları)
+        trafiği hiç kaydedilmez. JS Performance buffer'ı navigasyonda
+        sıfırlandığı için fallback da her adımın sonunda okunur.
+
+        Args:
+            step: Adım adı ('raw', 'mobile', 'main') veya None
+        """
+        self._close_step()
+        self._current_step = step
+
+    def _close_step(self) -> None:
+        """Açık pencerenin trafiğini yakalar ve sonraki pencere için temizler"""
+        if self._current_step is not None:
+            step_logs = self._capture_window()
+            admitted_from = len(self._step_logs)
+            for entry in step_logs:
+                entry["step"] = self._current_step
+                self._admit(entry, self._step_logs)
+            if self._capture_bodies:
+                self._capture_response_bodies(self._step_logs[admitted_from:])
+            logger.info(f"📡 {self._current_step} adımı: {len(step_logs)} network logu")
+        self._discard_pending()
+        self._current_step = None
+
     def capture_network_logs(self) -> list[dict]:
+        """
+        Açık pencereyi kapatır ve tüm adımların network loglarını döndürür
+
+        start_capture/begin_step hiç çağrılmadıysa mevcut trafik tek
+        seferde yakalanır (step alanı olmadan). Kayıt sayısı, header ve
+        toplam byte sınırları uygulanır; kırpma özeti truncation() ile alınır.
+
+        Returns:
+            Network logları listesi (her kayıtta step alanı)
+        """
+        if not self._segmented:
+            self._reset_limits()
+            collected = []
+            for entry in self._capture_window():
+                self._admit(entry, collected)
+            return collected
+        self._close_step()
+        step_logs, self._step_logs = self._step_logs, []
+        self._segmented = False
+        return step_logs
+
+    def _capture_window(self) -> list[dict]:
         """
         Sitenin dış dünya ile iletişimini (API, XHR, Tracker) analiz eder.
         Görsel, CSS ve Medya dosyalarını filtreler.
@@ -167,41 +534,36 @@ class NetworkLogger:
         # CDP başarısız olursa veya ek loglar için
         if not relevant_logs:
             try:
-                js_script = """
-                return performance.getEntriesByType("resource").map(r => ({
-                    url: r.name,
-                    initiatorType: r.initiatorType,
-                    size: r.transferSize || 0,
-                    time: r.startTime,
-                    duration: r.duration,
-                    nextHopProtocol: r.nextHopProtocol
-                }));
-                """
-                js_logs = self.driver.execute_script(js_script)
+                # Doküman başında kurulan collector'ın sütun dizileri tek çağrıda okunur
+                # (collector yoksa performance buffer aynı biçimde döner)
+                columns = self.driver.execute_script(RESOURCE_DRAIN_JS) or {}
+                if columns.get("dropped"):
+                    self._dropped_entries += columns["dropped"]
                 
-                for log in js_logs:
-                    url = log.get("url", "")
-                    initiator = log.get("initiatorType", "").lower()
-                    
-                    traffic_type = self._analyze_traffic_type(url, initiator)
+                for url, initiator, size, start_time, duration, protocol in zip(
+                    columns.get("n", []), columns.get("i", []), columns.get("s", []),
+                    columns.get("t", []), columns.get("d", []), columns.get("p", [])
+                ):
+                    traffic_type = self._analyze_traffic_type(url, (initiator or "").lower())
+                    domain = url.split('/')[2] if '//' in url else url
+                    category = self._domain_category(domain)
                     
-                    if traffic_type != "ignore":
-                        domain = url.split('/')[2] if '//' in url else url
-                        
+                    if traffic_type != "ignore" or category is not None:
                         relevant_logs.append({
                             "source": "js_fallback",
                             "type": traffic_type,
+                            "category": category,
                             "domain": domain,
                             "url": url,
                             "status": None,  # JS API status code vermez
                             "status_text": "N/A",
                             "mime_type": None,
                             "headers": {},
-                            "size": log.get("size", 0),
+                            "size": size or 0,
                             "timing": {
-                                "start_time": log.get("time", 0),
-                                "duration": log.get("duration", 0),
-                                "protocol": log.get("nextHopProtocol", "unknown")
+                                "start_time": start_time or 0,
+                                "duration": duration or 0,
+                                "protocol": protocol or "unknown"
                             }
                         })
                 
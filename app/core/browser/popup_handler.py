@@ -4,13 +4,56 @@ Smart wait ve popup temizleme işlemleri
 """
 import time
 import random
-from typing import Any, List
+from typing import Any, Callable, List, Optional, Tuple
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 
 from app.config import settings
 from app.core.logger import loguru_logger as logger
-from app.payloads.sentinel_js import JS_SENTINEL
+from app.core.browser.challenge_cache import challenge_cache, registrable_domain
+from app.payloads.challenge_probe_js import (
+    CHALLENGE_FRAMES, CHALLENGE_PROBE_JS, CHALLENGE_RESPONSE_FIELDS, ELEMENT_VISIBLE_JS,
+    GOOGLE_CONSENT_XPATHS, SELECTOR_PRESENT_JS, WIDGET_SOLVED_JS
+)
+from app.payloads.scroll_js import MOBILE_SCROLL_JS, MOBILE_SCROLL_STOPS
+from app.payloads.sentinel_js import JS_SENTINEL, JS_SENTINEL_STATUS
+
+
+# Challenge iframe'i içinde denenecek seçiciler (öncelik sırasıyla)
+FRAME_CLICK_SELECTORS = {
+    "cloudflare": ["input[type='checkbox']", "body"],
+    "recaptcha": [".recaptcha-checkbox-border"],
+    "turnstile": [
+        "input[type='checkbox']",
+        ".cb-i",
+        "[aria-label='Verify you are human']",
+        "div[class*='checkbox']"
+    ],
+    "hcaptcha": [
+        ".h-captcha-checkbox",
+        ".hcaptcha-checkbox",
+        "input[type='checkbox']",
+        "[aria-label='hCaptcha']"
+    ],
+}
+
+FRAME_CLICK_LOGS = {
+    "cloudflare": "✅ Cloudflare Tıklandı",
+    "recaptcha": "✅ ReCaptcha Tıklandı",
+    "turnstile": "✅ Turnstile Checkbox Tıklandı",
+    "hcaptcha": "✅ HCaptcha Checkbox Tıklandı",
+}
+
+# Challenge bekleme aralıkları (saniye): ilk kontrol, her adımda 2 katı, üst sınır
+POLL_INITIAL_DELAY = 0.1
+POLL_MAX_DELAY = 1.0
+
+# Beklemeler bu aralıklarla bölünür, aralarda CDP olayları okunur (saniye)
+DRAIN_INTERVAL = 0.5
+
+# "Widget yok" kaydı olan domain'lerde probe yerine tek querySelector ile
+# iframe varlığı yeniden kontrol edilir
+ANY_CHALLENGE_FRAME = ", ".join(CHALLENGE_FRAMES.values())
 
 
 class PopupHandler:
@@ -19,14 +62,100 @@ class PopupHandler:
     Smart wait ve popup temizleme işlemlerini yönetir
     """
     
-    def __init__(self, driver: Any):
+    def __init__(self, driver: Any, event_stream: Optional[Any] = None):
         """
         Popup handler başlat
         
         Args:
             driver: SeleniumBase driver instance
+            event_stream: Kalıcı CDP bağlantısı (beklemelerde drain edilir, yoksa None)
         """
         self.driver = driver
+        self.event_stream = event_stream
+        # Bu istekteki challenge olayları: {"type", "domain", "step", "elapsed_ms", "outcome"}
+        # outcome: resolved | timeout | failed | not_present (type None)
+        self.outcomes: List[dict] = []
+        # solve_captcha_and_consent çağrısının (domain, step) bağlamı
+        self._context: Tuple[Optional[str], Optional[str]] = (None, None)
+    
+    def reset_outcomes(self) -> None:
+        """Yeni istek için challenge sonuçlarını sıfırlar"""
+        self.outcomes = []
+    
+    def wait(self, seconds: float) -> None:
+        """
+        Bekler; bu sırada CDP olaylarını DRAIN_INTERVAL aralıklarla okur
+
+        Sayfa yüklenirken gelen Network olayları Chrome'un gönderim
+        kuyruğunda birikmez, drain başına CDP_DRAIN_MAX_BYTES ile sınırlıdır.
+
+        Args:
+            seconds: Bekleme süresi (saniye)
+        """
+        deadline = time.time() + seconds
+        while True:
+            if self.event_stream is not None:
+                self.event_stream.drain(settings.cdp_drain_max_bytes)
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return
+            time.sleep(min(DRAIN_INTERVAL, remaining))
+    
+    def _poll(self, condition: Callable[[], bool], max_wait: float) -> bool:
+        """
+        Koşul sağlanana kadar üstel artan aralıklarla bekler
+        
+        Args:
+            condition: Kontrol fonksiyonu
+            max_wait: Maksimum bekleme (saniye)
+        
+        Returns:
+            Süre içinde sağlandıysa True
+        """
+        deadline = time.time() + max_wait
+        delay = POLL_INITIAL_DELAY
+        while not condition():
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            self.wait(min(delay, remaining))
+            delay = min(delay * 2, POLL_MAX_DELAY)
+        return True
+    
+    def _is_gone(self, element: Any) -> bool:
+        """Element DOM'dan çıktı veya gizlendi mi (stale element de gitmiş sayılır)"""
+        try:
+            return not self.driver.execute_script(ELEMENT_VISIBLE_JS, element)
+        except Exception:
+            return True
+    
+    def _is_solved(self, widget: str, frame: Any) -> bool:
+        """
+        Challenge çözüldü mü: token alanı doldu veya iframe kayboldu
+        (gömülü reCAPTCHA/Turnstile/hCaptcha iframe'i çözümden sonra da görünür kalır)
+        """
+        try:
+            return bool(self.driver.execute_script(WIDGET_SOLVED_JS, frame, CHALLENGE_RESPONSE_FIELDS.get(widget)))
+        except Exception:
+            return True
+    
+    def _frame_ready(self, selectors: list[str]) -> bool:
+        """Mevcut frame'de seçicilerden biri oluştu mu"""
+        try:
+            return bool(self.driver.execute_script(SELECTOR_PRESENT_JS, ", ".join(selectors)))
+        except Exception:
+            return False
+    
+    def _record_outcome(self, widget: Optional[str], outcome: str, started: float, logs: list[str]) -> None:
+        """Challenge olayını kaydeder ve loglar"""
+        elapsed_ms = int((time.time() - started) * 1000)
+        domain, step = self._context
+        self.outcomes.append({
+            "type": widget, "domain": domain, "step": step,
+            "elapsed_ms": elapsed_ms, "outcome": outcome
+        })
+        if widget is not None:
+            logs.append(f"⏱️ {widget}: {outcome} ({elapsed_ms} ms)")
     
     def human_click(self, element: Any) -> None:
         """
@@ -46,47 +175,110 @@ class PopupHandler:
         except Exception:
             self.driver.execute_script("arguments[0].click();", element)
     
-    def _switch_and_click_in_frame(self, frame_selector: str, selectors: list[str], logs: list[str], log_msg: str) -> bool:
+    def _switch_and_click_in_frame(self, frame: Any, selectors: list[str], logs: list[str], log_msg: str) -> Optional[str]:
         """
         Helper fonksiyon: iframe'e geç ve seçicileri dene
         
         Args:
-            frame_selector: iframe CSS seçicisi
+            frame: Probe ile bulunan iframe elementi
             selectors: Denenecek CSS seçicileri listesi
             logs: Log listesi
             log_msg: Başarılı olduğunda eklenecek mesaj
             
         Returns:
-            Başarılı ise True, değilse False
-        
-        Raises:
-            Exception: Frame işlemi hatası
+            Tıklanan seçici, başarısızsa None
         """
         try:
-            frames = self.driver.find_elements(By.CSS_SELECTOR, frame_selector)
-            if frames:
-                self.driver.switch_to.frame(frames[0])
-                time.sleep(settings.frame_switch_wait_time)
-                for selector in selectors:
-                    try:
-                        checkbox = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        if checkbox.is_displayed():
-                            self.human_click(checkbox)
-                            logs.append(log_msg)
-                            time.sleep(settings.consent_click_wait_time)
-                            return True
-                    except Exception:
-                        continue
-                self.driver.switch_to.default_content()
+            self.driver.switch_to.frame(frame)
+            # Sabit bekleme yerine frame içeriği oluşana kadar (en fazla frame_switch_wait_time)
+            self._poll(lambda: self._frame_ready(selectors), settings.frame_switch_wait_time)
+            for selector in selectors:
+                try:
+                    checkbox = self.driver.find_element(By.CSS_SELECTOR, selector)
+                    if checkbox.is_displayed():
+                        self.human_click(checkbox)
+                        logs.append(log_msg)
+                        return selector
+                except Exception:
+                    continue
         except Exception as e:
             logs.append(f"⚠️ Frame işlemi başarısız: {str(e)}")
+        finally:
             self.driver.switch_to.default_content()
-        return False
+        return None
+    
+    def _solve_widgets(self, logs: list[str], xpaths: list[str], frames: dict,
+                       preferred: Optional[str] = None) -> Tuple[bool, Optional[Tuple[str, str]]]:
+        """
+        Probe'u çalıştırır ve bulunan widget'ları sırayla çözer
+        
+        Tıklamadan sonra sabit beklenmez: consent butonu kaybolana, gömülü
+        captcha'nın token alanı dolana veya (Cloudflare ara sayfası) iframe
+        kaybolana kadar üstel aralıklarla kontrol edilir,
+        consent_click_wait_time üst sınırdır. Her widget'ın
+        sonucu outcomes listesine yazılır.
+        
+        Args:
+            logs: Log listesi
+            xpaths: Aranacak consent XPath'leri
+            frames: Aranacak iframe'ler {anahtar: CSS seçicisi}
+            preferred: Frame içinde ilk denenecek seçici (önbellekten)
+        
+        Returns:
+            (widget bulundu mu, ilk başarılı (widget, seçici) veya None)
+        """
+        probe = self.driver.execute_script(CHALLENGE_PROBE_JS, xpaths, frames) or {}
+        found = False
+        solved = None
+        
+        consent = probe.get("google_consent")
+        if consent is not None:
+            found = True
+            started = time.time()
+            try:
+                self.human_click(consent["element"])
+                logs.append("✅ Google Çerezi Tıklandı")
+                solved = ("google_consent", consent["xpath"])
+            except Exception:
+                self._record_outcome("google_consent", "failed", started, logs)
+            else:
+                resolved = self._poll(lambda: self._is_gone(consent["element"]), settings.consent_click_wait_time)
+                self._record_outcome("google_consent", "resolved" if resolved else "timeout", started, logs)
+        
+        # Cloudflare, ReCaptcha, Turnstile, HCaptcha
+        for widget in frames:
+            frame = probe.get(widget)
+            if frame is None:
+                continue
+            found = True
+            if widget == "cloudflare":
+                logs.append("🛡️ Cloudflare tespit edildi...")
+            selectors = FRAME_CLICK_SELECTORS[widget]
+            if preferred in selectors:
+                selectors = [preferred] + [sel for sel in selectors if sel != preferred]
+            started = time.time()
+            selector = self._switch_and_click_in_frame(frame, selectors, logs, FRAME_CLICK_LOGS[widget])
+            if selector is None:
+                self._record_outcome(widget, "failed", started, logs)
+                continue
+            if solved is None:
+                solved = (widget, selector)
+            resolved = self._poll(lambda: self._is_solved(widget, frame), settings.consent_click_wait_time)
+            self._record_outcome(widget, "resolved" if resolved else "timeout", started, logs)
+        return found, solved
     
-    def solve_captcha_and_consent(self, logs: list[str], is_google: bool = False) -> None:
+    def solve_captcha_and_consent(self, logs: list[str], is_google: bool = False,
+                                  domain: Optional[str] = None, step: Optional[str] = None) -> None:
         """
         Captcha ve consent formlarını otomatik çözer.
         
+        Widget'lar tek execute_script probe'u ile tespit edilir; frame
+        geçişi ve tıklama sadece bulunan widget'lar için yapılır (temiz
+        sayfada tek WebDriver çağrısı). Domain verilirse challenge cache
+        okunur: kayıtlı consent XPath'i/frame seçicisi aynı probe içinde
+        önce denenir; "widget yok" kaydı varsa probe yerine tek bir
+        iframe varlık kontrolü yapılır (iframe çıkarsa tam probe çalışır).
+        
         Desteklenen Captcha Türleri:
         - Google Consent
         - Cloudflare
@@ -97,83 +289,40 @@ class PopupHandler:
         Args:
             logs: Log listesi
             is_google: Google sayfası mı
-        
-        Raises:
-            Exception: Captcha çözme hatası
+            domain: Sayfanın host'u (önbellek anahtarı için)
+            step: Scrape adımı ('raw', 'mobile', 'main', 'google') - olay kayıtları için
         """
+        started = time.time()
+        self._context = (domain, step)
+        cache_key = registrable_domain(domain) if domain and challenge_cache.enabled else None
+        entry = challenge_cache.get(cache_key) if cache_key else None
+        cached_widget = entry.get("widget") if entry else None
         try:
-            if is_google:
-                google_selectors = [
-                    "//div[text()='Tümünü kabul et']", "//div[text()='Accept all']",
-                    "//*[@id='L2AGLb']", "//*[@id='W0wltc']",
-                    "//button[contains(.,'Kabul')]", "//button[contains(.,'Accept')]"
-                ]
-                for xpath in google_selectors:
-                    try:
-                        el = self.driver.find_element(By.XPATH, xpath)
-                        if el.is_displayed():
-                            self.human_click(el)
-                            logs.append("✅ Google Çerezi Tıklandı")
-                            time.sleep(settings.consent_click_wait_time)
-                            break
-                    except Exception:
-                        pass
-
-            # Cloudflare
-            frames = self.driver.find_elements(By.CSS_SELECTOR, "iframe[src*='cloudflare']")
-            if frames:
-                logs.append("🛡️ Cloudflare tespit edildi...")
-                self.driver.switch_to.frame(frames[0])
-                time.sleep(settings.frame_switch_wait_time)
-                try:
-                    cb = self.driver.find_element(By.CSS_SELECTOR, "input[type='checkbox']")
-                    self.human_click(cb)
-                    logs.append("✅ Cloudflare Checkbox Tıklandı")
-                except Exception:
-                    try:
-                        body = self.driver.find_element(By.TAG_NAME, "body")
-                        self.human_click(body)
-                        logs.append("✅ Cloudflare Gövde Tıklandı")
-                    except Exception:
-                        pass
-                time.sleep(settings.consent_click_wait_time)
-                self.driver.switch_to.default_content()
-            
-            # ReCaptcha
-            frames_re = self.driver.find_elements(By.CSS_SELECTOR, "iframe[title='reCAPTCHA']")
-            if frames_re:
-                self.driver.switch_to.frame(frames_re[0])
-                try:
-                    box = self.driver.find_element(By.CLASS_NAME, "recaptcha-checkbox-border")
-                    self.human_click(box)
-                    logs.append("✅ ReCaptcha Tıklandı")
-                    time.sleep(settings.consent_click_wait_time)
-                except Exception:
-                    pass
-                self.driver.switch_to.default_content()
-            
-            # Turnstile (YENİ)
-            turnstile_selectors = [
-                "input[type='checkbox']",
-                ".cb-i",
-                "[aria-label='Verify you are human']",
-                "div[class*='checkbox']"
-            ]
-            if self._switch_and_click_in_frame("iframe[src*='turnstile']", turnstile_selectors, logs, "✅ Turnstile Checkbox Tıklandı"):
-                time.sleep(settings.consent_click_wait_time)
-            
-            # HCaptcha (YENİ)
-            hcaptcha_selectors = [
-                ".h-captcha-checkbox",
-                ".hcaptcha-checkbox",
-                "input[type='checkbox']",
-                "[aria-label='hCaptcha']"
-            ]
-            if self._switch_and_click_in_frame("iframe[src*='hcaptcha']", hcaptcha_selectors, logs, "✅ HCaptcha Checkbox Tıklandı"):
-                time.sleep(settings.consent_click_wait_time)
-                
+            # Temiz olduğu bilinen domain: consent aranmaz, tek seçiciyle kontrol
+            if entry and cached_widget is None and not is_google:
+                if not self._frame_ready([ANY_CHALLENGE_FRAME]):
+                    self._record_outcome(None, "not_present", started, logs)
+                    return
+            xpaths = list(GOOGLE_CONSENT_XPATHS) if is_google else []
+            preferred = None
+            if cached_widget == "google_consent":
+                xpaths = [entry["selector"]] + [xpath for xpath in xpaths if xpath != entry["selector"]]
+            elif cached_widget in CHALLENGE_FRAMES:
+                preferred = entry["selector"]
+            found, solved = self._solve_widgets(logs, xpaths, CHALLENGE_FRAMES, preferred)
         except Exception:
             self.driver.switch_to.default_content()
+            return
+        
+        if not found:
+            self._record_outcome(None, "not_present", started, logs)
+        
+        # Başarılı widget veya "widget yok" kaydedilir; bulunup çözülemeyen kaydedilmez
+        if cache_key and (solved is not None or not found):
+            try:
+                challenge_cache.record(cache_key, *(solved or (None, None)))
+            except OSError as e:
+                logger.warning(f"⚠️ Challenge cache yazılamadı: {e}")
     
     def smart_wait_and_kill(self, wait_time: int, logs: list[str], mobile_mode: bool = False) -> None:
         """
@@ -187,9 +336,11 @@ class PopupHandler:
         Raises:
             Exception: Wait işlemi hatası
         """
-        # Nöbetçiyi enjekte et
+        # Nöbetçi normalde doküman başında kuruludur; değilse (kurulum
+        # başarısız, hariç tutulan host) burada enjekte edilir
         try:
-            self.driver.execute_script(JS_SENTINEL)
+            if self.driver.execute_script(JS_SENTINEL_STATUS) is None:
+                self.driver.execute_script(JS_SENTINEL)
         except Exception:
             pass
         
@@ -197,25 +348,54 @@ class PopupHandler:
         if mobile_mode:
             steps = 3
 
+        scroll_ms = 0
+        lazy_triggered = 0
+        scroll_started = time.time()
         for i in range(steps):
             if mobile_mode:
+                # MOBILE_SCROLL_MAX_MS tüm adımların toplam bütçesi;
+                # her çağrıya kalan süre verilir, bitince dans durur
+                budget_ms = settings.mobile_scroll_max_ms - int((time.time() - scroll_started) * 1000)
+                if budget_ms <= 0:
+                    break
                 try:
-                    # Scroll Dansı (Popupları tetiklemek için)
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/3);")
-                    time.sleep(1)
-                    
-                    # Sayfanın ortasına hayalet tıklama
-                    self.driver.execute_script("document.elementFromPoint(window.innerWidth/2, window.innerHeight/2).click();")
-                    
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/1.5);")
-                    time.sleep(1)
-                    self.driver.execute_script("window.scrollTo(0, 0);")
+                    # Scroll Dansı (Popupları ve lazy içeriği tetiklemek için)
+                    # Sabit sleep yerine sayfa içinde kare/lazy-load senkronize
+                    result = self.driver.execute_async_script(
+                        MOBILE_SCROLL_JS, list(MOBILE_SCROLL_STOPS), budget_ms
+                    ) or {}
+                    scroll_ms += result.get("elapsed_ms", 0)
+                    lazy_triggered += result.get("triggered", 0)
                 except Exception:
                     pass
+                self.wait(0)
             else:
-                time.sleep(wait_time / steps)
+                self.wait(wait_time / steps)
             
             try:
                 self.driver.execute_script("document.body.style.overflow='visible';")
             except Exception:
                 pass
+        
+        if mobile_mode:
+            logs.append(f"📱 Scroll dansı: {scroll_ms} ms, {lazy_triggered} lazy element tetiklendi")
+        
+        self._log_sentinel_status(logs)
+    
+    def _log_sentinel_status(self, logs: list[str]) -> None:
+        """
+        Sentinel'in bu sayfada gizlediği elementleri loglar
+        
+        Args:
+            logs: Log listesi
+        """
+        try:
+            status = self.driver.execute_script(JS_SENTINEL_STATUS)
+        except Exception:
+            return
+        if status and status.get("removed"):
+            samples = ", ".join(status.get("samples", [])[:5])
+            logs.append(
+                f"🧹 Sentinel {status['removed']} element gizledi "
+                f"(kurulum: {status.get('installed_at')}ms): {samples}"
+            )
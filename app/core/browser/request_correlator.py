@@ -0,0 +1,144 @@
+"""
+Request Correlator Sınıfı
+CDP Network olaylarını requestId ile tek istek kaydında birleştirir
+
+requestWillBeSent, responseReceived, loadingFinished ve loadingFailed
+olayları eşleştirilir. Kayıt tamamlanınca (veya yönlendirme halkası
+kapanınca) callback'e verilir; bekleyen kayıt sayısı sınırlıdır.
+"""
+from typing import Callable, Dict, Iterable, Optional
+
+
+class RequestCorrelator:
+    """
+    Network olay eşleştirici
+    Her tamamlanan istek (ve yönlendirme halkası) için callback çağırır
+    """
+
+    def __init__(self, on_complete: Callable[[dict], None], max_pending: int):
+        """
+        Correlator başlat
+
+        Args:
+            on_complete: Tamamlanan kaydı alan fonksiyon
+            max_pending: Aynı anda bekleyebilecek maksimum istek sayısı
+        """
+        self.on_complete = on_complete
+        self.max_pending = max_pending
+        self._pending: Dict[str, dict] = {}
+        # Bekleme sınırı nedeniyle izlenmeyen istek sayısı
+        self.dropped = 0
+
+    def add_event(self, event: dict) -> None:
+        """
+        Tek bir CDP olayını işler
+
+        Args:
+            event: {"method": ..., "params": ...} sözlüğü
+        """
+        method = event.get("method")
+        params = event.get("params") or {}
+        if method == "Network.requestWillBeSent":
+            self._on_request(params)
+        elif method == "Network.responseReceived":
+            self._on_response(params)
+        elif method == "Network.loadingFinished":
+            self._on_finished(params)
+        elif method == "Network.loadingFailed":
+            self._on_failed(params)
+
+    def feed(self, events: Iterable[dict]) -> None:
+        """
+        Olay listesini sırayla işler
+
+        Args:
+            events: CDP olayları
+        """
+        for event in events:
+            self.add_event(event)
+
+    def _new_record(self, request: dict, params: dict) -> Optional[dict]:
+        """Yeni bekleyen kayıt oluşturur, sınır doluysa None döner"""
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return None
+        return {
+            "request_id": params.get("requestId"),
+            "request": request,
+            "type": params.get("type", ""),
+            "wall_time": params.get("wallTime"),
+            "start": params.get("timestamp"),
+            # Yönlendirme zincirinin ilk isteğinin zamanı (toplam süre için)
+            "chain_start": params.get("timestamp"),
+            "redirect_chain": [],
+            "redirect_hop": False,
+            "response": None,
+            "response_time": None,
+            "end": None,
+            "transfer_size": None,
+            "error": None,
+        }
+
+    def _on_request(self, params: dict) -> None:
+        request_id = params.get("requestId")
+        previous = self._pending.get(request_id)
+        # Yönlendirmede Chrome aynı requestId ile yeni istek gönderir;
+        # önceki halka redirectResponse ile kapatılır
+        if previous is not None and params.get("redirectResponse"):
+            previous["response"] = params["redirectResponse"]
+            previous["end"] = params.get("timestamp")
+            previous["redirect_hop"] = True
+            self._complete(request_id)
+
+        record = self._new_record(params.get("request") or {}, params)
+        if record is None:
+            return
+        if previous is not None:
+            record["chain_start"] = previous["chain_start"]
+            record["redirect_chain"] = previous["redirect_chain"] + [previous["request"].get("url", "")]
+            if record["wall_time"] is None:
+                record["wall_time"] = previous["wall_time"]
+        self._pending[request_id] = record
+
+    def _on_response(self, params: dict) -> None:
+        request_id = params.get("requestId")
+        response = params.get("response") or {}
+        record = self._pending.get(request_id)
+        if record is None:
+            # requestWillBeSent kaçırılmış (örn. ring buffer taştı) - yanıttan kayıt aç
+            record = self._new_record({"url": response.get("url", "")}, params)
+            if record is None:
+                return
+            record["start"] = record["chain_start"] = None
+            self._pending[request_id] = record
+        record["response"] = response
+        record["response_time"] = params.get("timestamp")
+
+    def _on_finished(self, params: dict) -> None:
+        request_id = params.get("requestId")
+        record = self._pending.get(request_id)
+        if record is not None:
+            record["end"] = params.get("timestamp")
+            record["transfer_size"] = params.get("encodedDataLength")
+            self._complete(request_id)
+
+    def _on_failed(self, params: dict) -> None:
+        request_id = params.get("requestId")
+        record = self._pending.get(request_id)
+        if record is not None:
+            record["end"] = params.get("timestamp")
+            record["error"] = params.get("blockedReason") or params.get("errorText") or "failed"
+            if params.get("canceled") and not params.get("blockedReason"):
+                record["error"] = "canceled"
+            self._complete(request_id)
+
+    def _complete(self, request_id: str) -> None:
+        """Bekleyen kaydı kapatıp callback'e verir"""
+        record = self._pending.pop(request_id, None)
+        if record is not None:
+            self.on_complete(record)
+
+    def flush(self) -> None:
+        """Henüz bitmemiş (yanıt/yükleme bekleyen) kayıtları da kapatır"""
+        for request_id in list(self._pending):
+            self._complete(request_id)
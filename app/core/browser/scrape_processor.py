@@ -3,17 +3,20 @@ Scrape Processor Sınıfı
 Ana scrape işleme mantığı
 """
 import time
-from typing import Any
+from typing import Any, Optional
 from urllib.parse import urlparse, quote
 from selenium.webdriver.common.by import By
 
 from app.config import settings
+from app.config.viewports import get_device_metrics
 from app.schemas import ScrapeRequest, ScrapeResponse
 from app.core.logger import loguru_logger as logger
 from app.core.blacklist import blacklist_manager
+from app.core.artifact_store import artifact_store
 from app.core.browser.popup_handler import PopupHandler
 from app.core.browser.screenshot_helper import ScreenshotHelper
 from app.core.browser.network_logger import NetworkLogger
+from app.core.browser.consent_cookies import ConsentCookies
 
 
 class ScrapeProcessor:
@@ -23,7 +26,8 @@ class ScrapeProcessor:
     """
     
     def __init__(self, driver: Any, popup_handler: PopupHandler, 
-                 screenshot_helper: ScreenshotHelper, network_logger: NetworkLogger):
+                 screenshot_helper: ScreenshotHelper, network_logger: NetworkLogger,
+                 consent_cookies: Optional[ConsentCookies] = None):
         """
         Scrape processor başlat
         
@@ -32,11 +36,73 @@ class ScrapeProcessor:
             popup_handler: Popup handler instance
             screenshot_helper: Screenshot helper instance
             network_logger: Network logger instance
+            consent_cookies: Sürücünün consent çerez yöneticisi (None: consent her adımda çözülür)
         """
         self.driver = driver
         self.popup_handler = popup_handler
         self.screenshot_helper = screenshot_helper
         self.network_logger = network_logger
+        self.consent_cookies = consent_cookies
+        # İstek başına türetilmiş görüntülere harcanan süre (saniye)
+        self._derive_spent = 0.0
+    
+    def _take_screenshot(self, req: ScrapeRequest, res: ScrapeResponse, field: str, logs: list[str]) -> str:
+        """
+        İstenen formatta ekran görüntüsü alır, gerekiyorsa thumbnail üretir
+
+        Thumbnail'ler Chrome tarafında küçültülüp kodlanır. Her çekim
+        IMAGE_DERIVE_TIMEOUT'tan kalan süreyle sınırlanır; süre dolduysa,
+        çekim zaman aşımına uğradıysa veya alınamadıysa thumbnail None olur
+        (orijinal görüntü thumbnail yerine konmaz).
+
+        Args:
+            req: ScrapeRequest nesnesi
+            res: ScrapeResponse nesnesi (thumbnails alanı güncellenir)
+            field: Yanıttaki ekran görüntüsü alan adı (örn. raw_desktop_ss)
+            logs: Log listesi
+
+        Returns:
+            Base64 encoded screenshot
+        """
+        image = self.screenshot_helper.get_b64_screenshot(req.screenshot_format, req.screenshot_quality)
+        
+        if req.get_thumbnails:
+            thumbnail = None
+            remaining = settings.image_derive_timeout - self._derive_spent
+            if remaining > 0:
+                derive_start = time.time()
+                thumbnail = self.screenshot_helper.get_b64_thumbnail(
+                    settings.screenshot_thumbnail_width,
+                    settings.screenshot_thumbnail_quality,
+                    timeout=remaining
+                )
+                self._derive_spent += time.time() - derive_start
+                if thumbnail is None:
+                    logs.append(f"⚠️ Thumbnail alınamadı veya süre aşıldı ({field})")
+            else:
+                logs.append(f"⚠️ Thumbnail süresi aşıldı, thumbnail üretilmedi ({field})")
+            res.thumbnails[field] = thumbnail
+        
+        return image
+    
+    def _apply_viewport(self, preset: Optional[str], device_scale_factor: Optional[float] = None) -> None:
+        """
+        Viewport preset'ini CDP ile uygular, preset yoksa override'ı temizler
+
+        Args:
+            preset: Preset adı (örn. 'phone@3x') veya None
+            device_scale_factor: Verilirse preset'in DPR değerini ezer
+
+        Raises:
+            Exception: CDP komut hatası
+        """
+        if preset:
+            self.driver.execute_cdp_cmd(
+                "Emulation.setDeviceMetricsOverride",
+                get_device_metrics(preset, device_scale_factor)
+            )
+        else:
+            self.driver.execute_cdp_cmd("Emulation.clearDeviceMetricsOverride", {})
     
     def process(self, req: ScrapeRequest) -> ScrapeResponse:
         """
@@ -54,11 +120,24 @@ class ScrapeProcessor:
         start_time = time.time()
         logs = []
         network_data = []  # Ağ trafiği verisi en başta tanımla
+        har_builder = None
         res = ScrapeResponse(status="processing", logs=[], duration=0)
+        self._derive_spent = 0.0
+        self.popup_handler.reset_outcomes()
+        desktop_viewport = req.desktop_viewport or settings.default_desktop_viewport or None
+        mobile_viewport = req.mobile_viewport or settings.default_mobile_viewport
         
         def log(m: str):
             logs.append(m)
             logger.info(f"[{req.url}] {m}")
+        
+        # Network trafiği adım bazlı pencerelerde yakalanır (raw/mobile/main);
+        # arama motoru adımları None penceresinde kalır, hiç kaydedilmez
+        capture_network = req.wants("network_logs")
+        
+        def network_step(step: Optional[str]):
+            if capture_network:
+                self.network_logger.begin_step(step)
 
         try:
             raw_url = req.url
@@ -70,105 +149,161 @@ class ScrapeProcessor:
                 domain = domain.split(':')[0]
             main_domain_url = f"https://{domain}"
 
+            # Masaüstü viewport preset'i (yoksa tarayıcının pencere boyutu kalır)
+            if desktop_viewport:
+                self._apply_viewport(desktop_viewport, req.device_scale_factor)
+
+            # Hangi adımların çalışacağı istenen çıktılardan belirlenir
+            # (outputs verilmişse sadece listelenen artefaktlar üretilir)
+            visit_raw_url = (
+                req.wants("raw_desktop_ss") or req.wants("raw_html") or req.wants("raw_mobile_ss")
+                or (req.outputs is not None and (req.wants("network_logs") or req.wants("har")))
+            )
+
+            if capture_network:
+                self.network_logger.start_capture(capture_bodies=req.capture_api_bodies)
+
+            # HAR kaydı ilk navigasyondan önce başlar
+            if req.wants("har"):
+                har_builder = self.network_logger.start_har(settings.har_max_entries, raw_url)
+
             # ADIM 1: HAM URL
-            if req.process_raw_url:
+            if visit_raw_url:
                 log(f"Adım 1: Ham URL -> {raw_url}")
+                network_step("raw")
                 try:
                     self.driver.get(raw_url)
                 except Exception as e:
                     log("Sayfa yüklenemedi")
                     raise
-                self.popup_handler.solve_captcha_and_consent(logs)
+                self.popup_handler.solve_captcha_and_consent(logs, domain=domain, step="raw")
                 self.popup_handler.smart_wait_and_kill(req.wait_time, logs)
                 
                 # Body check - JavaScript yüklenmesi için bekleme
-                time.sleep(settings.body_check_wait_time if hasattr(settings, 'body_check_wait_time') else 2)
+                self.popup_handler.wait(settings.body_check_wait_time if hasattr(settings, 'body_check_wait_time') else 2)
                 body_text = self.driver.find_element(By.TAG_NAME, "body").text
                 if len(body_text) < 100:
                     logger.warning("Sayfa içeriği çok az, sayfa yeniden yükleniyor...")
                     self.driver.refresh()
-                    time.sleep(settings.page_reload_wait_time if hasattr(settings, 'page_reload_wait_time') else 5)
+                    self.popup_handler.wait(settings.page_reload_wait_time if hasattr(settings, 'page_reload_wait_time') else 5)
 
-                res.raw_desktop_ss = self.screenshot_helper.get_b64_screenshot()
-                if req.get_html:
-                    res.raw_html = self.screenshot_helper.get_b64_html()
+                if req.wants("raw_desktop_ss"):
+                    res.raw_desktop_ss = self._take_screenshot(req, res, "raw_desktop_ss", logs)
+                if req.wants("raw_html"):
+                    res.raw_html = self.screenshot_helper.get_b64_html(
+                        html_format=req.html_format,
+                        include_iframes=req.html_include_iframes
+                    )
                 
                 # MOBİL - Opsiyonel
-                if req.get_mobile_ss:
+                if req.wants("raw_mobile_ss"):
                     log(f"Adım 2: 📱 Mobil -> {raw_url}")
+                    network_step("mobile")
                     try:
-                        self.driver.execute_cdp_cmd(
-                            "Emulation.setDeviceMetricsOverride",
-                            {"width": 375, "height": 812, "deviceScaleFactor": 3, "mobile": True}
-                        )
+                        self._apply_viewport(mobile_viewport, req.device_scale_factor)
                         self.driver.refresh()
                         
-                        time.sleep(settings.mobile_wait_time)
-                        self.popup_handler.solve_captcha_and_consent(logs)
+                        self.popup_handler.wait(settings.mobile_wait_time)
+                        self.popup_handler.solve_captcha_and_consent(logs, domain=domain, step="mobile")
                         self.popup_handler.smart_wait_and_kill(req.wait_time, logs, mobile_mode=True)
                         
-                        res.raw_mobile_ss = self.screenshot_helper.get_b64_screenshot()
-                        self.driver.execute_cdp_cmd("Emulation.clearDeviceMetricsOverride", {})
+                        res.raw_mobile_ss = self._take_screenshot(req, res, "raw_mobile_ss", logs)
+                        # Masaüstü preset'ine dön (preset yoksa override temizlenir)
+                        self._apply_viewport(desktop_viewport, req.device_scale_factor)
                     except Exception:
                         log("Mobil mod hatası")
                         try:
-                            self.driver.execute_cdp_cmd("Emulation.clearDeviceMetricsOverride", {})
+                            self._apply_viewport(desktop_viewport, req.device_scale_factor)
                         except Exception:
                             pass
                         raise
 
             # ADIM 2: ANA DOMAIN
-            if req.process_main_domain:
+            if req.wants("main_desktop_ss"):
                 if raw_url.rstrip('/') == main_domain_url.rstrip('/'):
                     if res.raw_desktop_ss:
                         res.main_desktop_ss = res.raw_desktop_ss
+                        if "raw_desktop_ss" in res.thumbnails:
+                            res.thumbnails["main_desktop_ss"] = res.thumbnails["raw_desktop_ss"]
                     else:
                         log(f"Adım 3: Ana Domain -> {main_domain_url}")
+                        network_step("main")
                         self.driver.get(main_domain_url)
-                        self.popup_handler.solve_captcha_and_consent(logs)
+                        self.popup_handler.solve_captcha_and_consent(logs, domain=domain, step="main")
                         self.popup_handler.smart_wait_and_kill(req.wait_time, logs)
-                        res.main_desktop_ss = self.screenshot_helper.get_b64_screenshot()
+                        res.main_desktop_ss = self._take_screenshot(req, res, "main_desktop_ss", logs)
                 else:
                     log(f"Adım 3: Ana Domain -> {main_domain_url}")
+                    network_step("main")
                     self.driver.get(main_domain_url)
-                    self.popup_handler.solve_captcha_and_consent(logs)
+                    self.popup_handler.solve_captcha_and_consent(logs, domain=domain, step="main")
                     self.popup_handler.smart_wait_and_kill(req.wait_time, logs)
-                    res.main_desktop_ss = self.screenshot_helper.get_b64_screenshot()
+                    res.main_desktop_ss = self._take_screenshot(req, res, "main_desktop_ss", logs)
 
-            # 🔥 KRİTİK HAMLE: Google'a gitmeden önce AĞ TRAFİĞİNİ YAKALA! 🔥
-            if req.capture_network_logs:
-                log("📡 Hedef site trafiği toplanıyor...")
-                network_data = self.network_logger.capture_network_logs()
-                log(f"✅ {len(network_data)} adet kritik ağ isteği yakalandı.")
+            # Hedef site pencereleri burada kapanır; sonraki adımların
+            # trafiği (arama motorları) network_logs'a girmez
+            network_step(None)
+            
+            if har_builder is not None:
+                self.network_logger.finish_har(har_builder)
+                if req.har_destination == "artifact":
+                    res.har_artifact = artifact_store.write_chunks("har", ".har", har_builder.iter_json())
+                else:
+                    res.har = har_builder.build()
+                log(f"✅ HAR kaydı hazır ({len(har_builder.entries())} entry)")
+                har_builder = None
             
             # -------------------------------------------------------
             # BURADAN SONRA TARAYICI BAŞKA SİTELERE GİDECEK
             # -------------------------------------------------------
 
             # ADIM 3: GOOGLE ARAMASI (Opsiyonel)
-            if req.get_google_search:
+            if req.wants("google_ss") or req.wants("google_html"):
                 log(f"Adım 4: 🔍 Google -> {domain}")
                 safe_domain = quote(domain, safe='')
                 self.driver.get(f"https://www.google.com/search?q=site%3A{safe_domain}")
                 time.sleep(settings.search_engine_wait_time)
-                self.popup_handler.solve_captcha_and_consent(logs, is_google=True)
-                res.google_ss = self.screenshot_helper.get_b64_screenshot()
-                if req.get_google_html:
+                # Consent çerezleri yüklüyse ve consent ekranı çıkmadıysa sadece
+                # consent XPath'leri atlanır; captcha/challenge frame'leri her
+                # durumda kontrol edilir
+                skip_consent = bool(self.consent_cookies and self.consent_cookies.is_seeded("google"))
+                if skip_consent and self.consent_cookies.on_consent_page("google"):
+                    skip_consent = False
+                    log("⚠️ Consent çerezleri kabul edilmedi, Google consent ekranı çözülecek")
+                elif skip_consent:
+                    log("🍪 Consent çerezleri yüklü, Google consent butonları atlandı")
+                self.popup_handler.solve_captcha_and_consent(
+                    logs, is_google=not skip_consent, domain="www.google.com", step="google"
+                )
+                # Çerezler sadece sonuç sayfasına ulaşıldıysa saklanır
+                if self.consent_cookies and not self.consent_cookies.on_consent_page("google"):
+                    self.consent_cookies.refresh("google")
+                if req.wants("google_ss"):
+                    res.google_ss = self._take_screenshot(req, res, "google_ss", logs)
+                if req.wants("google_html"):
                     res.google_html = self.screenshot_helper.get_b64_html()
 
             # ADIM 4: DUCKDUCKGO ARAMASI (Opsiyonel)
-            if req.get_ddg_search:
+            if req.wants("ddg_ss") or req.wants("ddg_html"):
                 log(f"Adım 5: 🦆 DDG -> {domain}")
                 safe_domain = quote(domain, safe='')
                 self.driver.get(f"https://duckduckgo.com/?q=site%3A{safe_domain}")
                 time.sleep(settings.search_engine_wait_time)
-                res.ddg_ss = self.screenshot_helper.get_b64_screenshot()
-                if req.get_ddg_html:
+                if req.wants("ddg_ss"):
+                    res.ddg_ss = self._take_screenshot(req, res, "ddg_ss", logs)
+                if req.wants("ddg_html"):
                     res.ddg_html = self.screenshot_helper.get_b64_html()
+                if self.consent_cookies:
+                    self.consent_cookies.refresh("duckduckgo")
             
             # Ağ trafiği verisini yanıta ekle
-            if req.capture_network_logs:
+            if capture_network:
+                network_data = self.network_logger.capture_network_logs()
+                log(f"✅ {len(network_data)} adet kritik ağ isteği yakalandı.")
                 res.network_logs = network_data
+                res.network_logs_truncated = self.network_logger.truncation()
+                if res.network_logs_truncated:
+                    log(f"⚠️ Network logları sınırlandı: {res.network_logs_truncated}")
 
             res.status = "success"
             log(f"✅ Bitti -> {domain}")
@@ -180,8 +315,21 @@ class ScrapeProcessor:
             
             # Hata yukarı fırlat - BrowserManager'da restart yapılacak
             raise
+        
+        finally:
+            # Hata durumunda HAR dinleyicisi stream'de kalmasın
+            if har_builder is not None:
+                self.network_logger.cancel_har()
+            
+            # Masaüstü override'ı bir sonraki isteğe taşınmasın
+            if desktop_viewport:
+                try:
+                    self._apply_viewport(None)
+                except Exception:
+                    pass
 
         res.logs = logs
+        res.challenge_events = list(self.popup_handler.outcomes)
         res.duration = time.time() - start_time
 
         return res
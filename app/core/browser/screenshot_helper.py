@@ -3,7 +3,11 @@ Screenshot Helper Sınıfı
 Ekran görüntüsü ve HTML alma işlemleri
 """
 import base64
-from typing import Any
+from typing import Any, Optional
+
+from app.config import settings
+from app.core.logger import loguru_logger as logger
+from app.payloads.html_capture_js import get_html_capture_js
 
 
 class ScreenshotHelper:
@@ -12,36 +16,132 @@ class ScreenshotHelper:
     Ekran görüntüsü ve HTML alma işlemlerini yönetir
     """
     
-    def __init__(self, driver: Any):
+    def __init__(self, driver: Any, event_stream: Optional[Any] = None):
         """
         Screenshot helper başlat
         
         Args:
             driver: SeleniumBase driver instance
+            event_stream: Kalıcı CDP bağlantısı (zaman aşımlı komutlar için, yoksa None)
         """
         self.driver = driver
+        self.event_stream = event_stream
     
-    def get_b64_screenshot(self) -> str:
+    def get_b64_screenshot(self, image_format: str = "png", quality: Optional[int] = None) -> str:
         """
         Ekran görüntüsünü base64 formatında döndürür
 
+        PNG dışındaki formatlar CDP Page.captureScreenshot ile doğrudan
+        tarayıcıda kodlanır (Python tarafında görüntü işleme yapılmaz).
+        Başarısız olursa orijinal PNG ekran görüntüsüne düşülür.
+
+        Args:
+            image_format: 'png', 'jpeg' veya 'webp'
+            quality: jpeg/webp kalitesi (1-100)
+
         Returns:
             Base64 encoded screenshot
         
         Raises:
             Exception: Screenshot alma hatası
         """
+        if image_format != "png":
+            params = {"format": image_format}
+            if quality is not None:
+                params["quality"] = quality
+            try:
+                return self.driver.execute_cdp_cmd("Page.captureScreenshot", params)["data"]
+            except Exception as e:
+                logger.debug(f"{image_format} ekran görüntüsü alınamadı, PNG kullanılıyor: {e}")
         return self.driver.get_screenshot_as_base64()
     
-    def get_b64_html(self) -> str:
+    def get_b64_thumbnail(self, width: int, quality: int, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Görünür alanın küçültülmüş WebP kopyasını base64 formatında döndürür
+
+        Küçültme ve kodlama Chrome tarafında (clip.scale) yapılır. Timeout
+        verilirse ve CDP event stream bağlıysa komut onun üzerinden süre
+        sınırıyla gönderilir; geç gelen yanıt akışta yok sayılır.
+
+        Args:
+            width: Hedef genişlik (piksel)
+            quality: WebP kalitesi (1-100)
+            timeout: Maksimum bekleme (saniye, None: driver varsayılanı)
+
+        Returns:
+            Base64 encoded thumbnail veya hata/zaman aşımında None
+        """
+        try:
+            vw, vh, sx, sy, dpr = self.driver.execute_script(
+                "return [window.innerWidth, window.innerHeight, window.scrollX, window.scrollY, window.devicePixelRatio || 1];"
+            )
+            # clip.scale CSS pikseline uygulanır, çıktı ayrıca DPR ile çarpılır
+            scale = min(1.0, width / (vw * dpr))
+            params = {
+                "format": "webp",
+                "quality": quality,
+                "clip": {"x": sx, "y": sy, "width": vw, "height": vh, "scale": scale}
+            }
+            if timeout is not None and self.event_stream is not None and self.event_stream.connected:
+                return self.event_stream.call("Page.captureScreenshot", params, timeout=timeout)["data"]
+            return self.driver.execute_cdp_cmd("Page.captureScreenshot", params)["data"]
+        except TimeoutError:
+            logger.debug(f"Thumbnail zaman aşımı ({timeout:.2f}s)")
+            return None
+        except Exception as e:
+            logger.debug(f"Thumbnail alınamadı: {e}")
+            return None
+    
+    def get_html_bytes(self, html_format: str = "html", include_iframes: bool = False) -> bytes:
+        """
+        Sayfa kaynağını UTF-8 byte olarak döndürür
+
+        HTML_CAPTURE_METHOD=cdp iken doküman CDP Runtime.evaluate ile tek
+        çağrıda serileştirilir. Başarısız olursa driver.page_source kullanılır.
+        html_format='mhtml' ise Page.captureSnapshot ile tüm kaynakları
+        (görseller, stiller, iframe'ler) içeren tek parça MHTML alınır.
+
+        Args:
+            html_format: 'html' veya 'mhtml'
+            include_iframes: Aynı origin'li iframe içerikleri HTML'e gömülsün mü
+
+        Returns:
+            HTML/MHTML içeriği (byte)
+
+        Raises:
+            Exception: HTML alma hatası
+        """
+        if html_format == "mhtml":
+            snapshot = self.driver.execute_cdp_cmd("Page.captureSnapshot", {"format": "mhtml"})
+            return snapshot["data"].encode('utf-8')
+
+        if settings.html_capture_method == "cdp":
+            try:
+                result = self.driver.execute_cdp_cmd("Runtime.evaluate", {
+                    "expression": get_html_capture_js(include_iframes),
+                    "returnByValue": True
+                })
+                value = result.get("result", {}).get("value")
+                if isinstance(value, str) and value:
+                    return value.encode('utf-8')
+            except Exception as e:
+                logger.debug(f"CDP HTML alma hatası, page_source kullanılıyor: {e}")
+
+        return self.driver.page_source.encode('utf-8')
+
+    def get_b64_html(self, html_format: str = "html", include_iframes: bool = False) -> str:
         """
         Sayfa kaynağını base64 formatında döndürür
 
+        Args:
+            html_format: 'html' veya 'mhtml'
+            include_iframes: Aynı origin'li iframe içerikleri HTML'e gömülsün mü
+
         Returns:
             Base64 encoded HTML
-        
+
         Raises:
             Exception: HTML alma hatası
         """
-        src = self.driver.page_source
-        return base64.b64encode(src.encode('utf-8')).decode('utf-8')
+        # Base64 sadece burada, bir kez yapılır
+        return base64.b64encode(self.get_html_bytes(html_format, include_iframes)).decode('ascii')
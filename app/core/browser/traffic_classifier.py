@@ -0,0 +1,70 @@
+"""
+Traffic Classifier
+URL'leri amaçlarına göre sınıflandırır (api, tracker, script, ignore)
+
+Kurallar modül yüklenirken tek seferde regex'e derlenir; her URL için
+liste taraması ve string üretimi yapılmaz, her kural C tarafında tek
+geçişte aranır.
+"""
+import re
+
+
+# 1. KESİN REDDEDİLECEKLER (Gürültü) - Görsel, Stil, Font, Medya dosyaları
+IGNORED_EXTENSIONS = (
+    'css', 'woff', 'woff2', 'ttf', 'eot', 'svg', 'png', 'jpg',
+    'jpeg', 'gif', 'ico', 'webp', 'mp4', 'mp3', 'm3u8', 'ts',
+    'pdf', 'zip'
+)
+
+# 2. API / VERİ TRAFİĞİ - Genellikle JSON veya XML dönerler
+API_KEYWORDS = ('api', 'json', 'ajax', 'graphql', 'v1/')
+API_INITIATORS = frozenset({'xmlhttprequest', 'fetch'})
+
+# 3. TRACKER / ANALYTICS - Genellikle Script veya Pixel
+TRACKER_KEYWORDS = ('google-analytics', 'facebook', 'pixel', 'gtm', 'stats', 'metrics', 'telemetry')
+
+
+def _keyword_pattern(keywords) -> re.Pattern:
+    """Alt string listesini tek bir alternation regex'ine derler"""
+    return re.compile('|'.join(re.escape(k) for k in keywords))
+
+
+# Uzantı URL sonunda ya da hemen ardından '?' ile gelir
+# (\Z kullanılır: $ sondaki '\n' öncesinde de eşleşir, endswith ile aynı değil)
+_IGNORE_RE = re.compile(
+    r'\.(?:' + '|'.join(re.escape(e) for e in IGNORED_EXTENSIONS) + r')(?:\?|\Z)'
+)
+_API_RE = _keyword_pattern(API_KEYWORDS)
+_TRACKER_RE = _keyword_pattern(TRACKER_KEYWORDS)
+_SCRIPT_RE = re.compile(r'\.js(?:\?|\Z)')
+
+
+def classify_traffic(url: str, initiator: str = "") -> str:
+    """
+    URL ve Çağıran (Initiator) bilgisine bakarak trafiğin amacını belirler.
+
+    Args:
+        url: URL string
+        initiator: Çağıran (initiator type)
+
+    Returns:
+        'api', 'tracker', 'script' veya 'ignore'
+    """
+    u = url.lower()
+
+    if _IGNORE_RE.search(u):
+        return "ignore"
+
+    if initiator in API_INITIATORS or _API_RE.search(u):
+        return "api"
+
+    if _TRACKER_RE.search(u):
+        return "tracker"
+
+    # 4. HARİCİ SCRIPTLER (CDN'den gelen JS kütüphaneleri veya reklamlar)
+    if initiator == 'script' or _SCRIPT_RE.search(u):
+        return "script"
+
+    # Geri kalanlar (Navigasyon vb.) önemsiz sayılabilir ama
+    # API kaçırmamak için şüpheli olarak işaretleyebiliriz.
+    return "ignore"
@@ -0,0 +1,298 @@
+"""
+Domain Index
+Tracker / reklam domain listelerini yükler ve host'ları sınıflandırır
+
+Listeler uygulama başlarken bir kez yüklenir. Arama host'un kendisinden
+başlayıp üst domain'lere doğru (a.b.example.com -> b.example.com ->
+example.com -> com) ilerler; maliyet liste boyutundan bağımsız, etiket
+sayısı kadar hash aramasıdır.
+
+Milyonlarca girişlik kategorisiz listeler (black-list) için ReversedDomainSet
+kullanılır: ters etiketli sıralı anahtarlar tek bir bytes blob'unda tutulur.
+"""
+import heapq
+import time
+from array import array
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.config import settings
+
+
+# hosts dosyası satırlarındaki yönlendirme adresleri
+_HOSTS_ADDRESSES = frozenset({"0.0.0.0", "127.0.0.1", "::1", "::"})
+
+# ReversedDomainSet kurulumunda bir seferde sıralanan anahtar sayısı
+# (kurulum belleği: sıkıştırılmış run'lar + bu kadar bytes nesnesi)
+_RUN_SIZE = 1 << 20
+
+
+def parse_host_line(line: str) -> Optional[str]:
+    """
+    Liste satırından host adını çıkarır
+
+    Desteklenen biçimler:
+      - example.com
+      - 0.0.0.0 example.com (hosts dosyası)
+      - ||example.com^ (EasyPrivacy/Adblock host kuralı, $ seçenekleri yok sayılır)
+
+    Args:
+        line: Ham satır
+
+    Returns:
+        Küçük harfli host veya satır geçersizse None
+    """
+    line = line.strip()
+    if not line or line[0] in '#!':
+        return None
+
+    if line.startswith('||'):
+        host = line[2:].split('$', 1)[0]
+        if not host.endswith('^'):
+            return None  # Yol içeren kural, host kuralı değil
+        host = host[:-1]
+    else:
+        parts = line.split()
+        if len(parts) >= 2 and parts[0] in _HOSTS_ADDRESSES:
+            host = parts[1]
+        else:
+            host = parts[0]
+
+    host = host.lower().strip('.')
+    if not host or '/' in host or '*' in host or host == 'localhost':
+        return None
+    return host
+
+
+class DomainIndex:
+    """
+    Domain -> kategori indeksi
+    Alt domain'ler listedeki en yakın üst domain'in kategorisini alır
+    """
+
+    def __init__(self) -> None:
+        """Boş indeks oluşturur"""
+        self._domains: Dict[str, str] = {}
+        # Yükleme özeti (başlangıçta loglanır): "kategori: N domain (dosya)"
+        self.load_report: List[str] = []
+        self.load_errors: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._domains)
+
+    def add(self, domain: str, category: str) -> None:
+        """
+        Domain ekler - aynı domain daha önce eklendiyse ilk kategori korunur
+
+        Args:
+            domain: Küçük harfli domain
+            category: Kategori (örn. 'tracker', 'ad')
+        """
+        self._domains.setdefault(domain, category)
+
+    def load_file(self, file_path: str, category: str) -> int:
+        """
+        Liste dosyasını indekse yükler
+
+        Args:
+            file_path: Liste dosya yolu
+            category: Dosyadaki domain'lerin kategorisi
+
+        Returns:
+            Eklenen satır sayısı
+
+        Raises:
+            FileNotFoundError: Dosya bulunamazsa
+            IOError: Dosya okunamazsa
+        """
+        count = 0
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                host = parse_host_line(line)
+                if host:
+                    self.add(host, category)
+                    count += 1
+        return count
+
+    def lookup(self, host: str) -> Optional[str]:
+        """
+        Host'un kategorisini döndürür (en spesifik eşleşme kazanır)
+
+        Args:
+            host: Host adı (port içermemeli)
+
+        Returns:
+            Kategori veya listede yoksa None
+        """
+        domains = self._domains
+        host = host.lower().rstrip('.')
+        category = domains.get(host)
+        if category is not None:
+            return category
+
+        dot = host.find('.')
+        while dot != -1:
+            category = domains.get(host[dot + 1:])
+            if category is not None:
+                return category
+            dot = host.find('.', dot + 1)
+        return None
+
+
+class ReversedDomainSet:
+    """
+    Sıkıştırılmış domain kümesi - alt domain'ler listedeki üst domain ile eşleşir
+
+    Anahtarlar etiketleri ters çevrilmiş ve '.' ile biten domain'lerdir
+    (www.example.com -> b"com.example.www."). Sıralı anahtarlar tek bir
+    bytes blob'una yan yana yazılır, başlangıç ofsetleri array'de tutulur;
+    bellek giriş başına anahtar uzunluğu + 4 byte'tır (Python nesnesi yok).
+
+    Üst domain'i listede olan alt domain'ler kurulumda atılır. Böylece
+    sorgu anahtarından küçük-eşit son anahtar tek ikili aramayla bulunur
+    ve sorgu bu anahtarla başlıyorsa tam veya üst domain eşleşmesi vardır.
+
+    Kurulum _RUN_SIZE'lık parçaları sıralayıp sıkıştırır ve sonra
+    birleştirir; tüm liste hiçbir zaman tek bir Python listesi olmaz.
+    """
+
+    def __init__(self, keys: Iterable[bytes] = ()) -> None:
+        """
+        Anahtarlardan indeks oluşturur
+
+        Args:
+            keys: make_key ile üretilmiş anahtarlar (sırasız, tekrarlı olabilir)
+        """
+        runs = []
+        keys = iter(keys)
+        while True:
+            chunk = sorted(islice(keys, _RUN_SIZE))
+            if not chunk:
+                break
+            runs.append(self._pack(chunk))
+            del chunk
+        if len(runs) == 1:
+            self._blob, self._offsets = runs[0]
+        else:
+            self._blob, self._offsets = self._pack(heapq.merge(*map(self._iter_run, runs)))
+
+    @staticmethod
+    def _pack(sorted_keys: Iterable[bytes]) -> Tuple[bytearray, array]:
+        """
+        Sıralı anahtarları blob + ofset dizisine yazar (kapsanan anahtarlar atlanır)
+
+        Args:
+            sorted_keys: Sıralı anahtarlar
+
+        Returns:
+            (blob, ofsetler) - ofsetler[i]:ofsetler[i + 1] i. anahtardır
+        """
+        blob = bytearray()
+        offsets = array('I', [0])
+        last = None
+        for key in sorted_keys:
+            # Aynı anahtar veya zaten kapsanan alt domain
+            if last is not None and key.startswith(last):
+                continue
+            blob += key
+            try:
+                offsets.append(len(blob))
+            except OverflowError:
+                # Blob 4 GB'ı aştı
+                offsets = array('Q', offsets)
+                offsets.append(len(blob))
+            last = key
+        return blob, offsets
+
+    @staticmethod
+    def _iter_run(run: Tuple[bytearray, array]) -> Iterator[bytearray]:
+        """Sıkıştırılmış run'ın anahtarlarını sırayla döndürür"""
+        blob, offsets = run
+        return map(blob.__getitem__, map(slice, offsets, islice(offsets, 1, None)))
+
+    @staticmethod
+    def make_key(domain: str) -> bytes:
+        """
+        Domain'in ters etiketli anahtarı (example.com -> b"com.example.")
+
+        Args:
+            domain: Küçük harfli domain
+
+        Returns:
+            UTF-8 anahtar
+        """
+        labels = domain.strip('.').split('.')
+        labels.reverse()
+        labels.append('')
+        return '.'.join(labels).encode('utf-8')
+
+    @classmethod
+    def from_domains(cls, domains: Iterable[str]) -> 'ReversedDomainSet':
+        """
+        Domain listesinden indeks oluşturur
+
+        Args:
+            domains: Küçük harfli domain'ler
+
+        Returns:
+            ReversedDomainSet instance
+        """
+        return cls(map(cls.make_key, domains))
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """Blob + ofset dizisinin kapladığı byte"""
+        return len(self._blob) + len(self._offsets) * self._offsets.itemsize
+
+    def __contains__(self, domain: str) -> bool:
+        """
+        Domain veya üst domain'lerinden biri kümede mi
+
+        Args:
+            domain: Küçük harfli domain
+
+        Returns:
+            Eşleşme varsa True
+        """
+        key = self.make_key(domain)
+        blob = self._blob
+        offsets = self._offsets
+        # bisect_right: key'den büyük ilk anahtarın sırası
+        lo, hi = 0, len(offsets) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key < blob[offsets[mid]:offsets[mid + 1]]:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo > 0 and key.startswith(blob[offsets[lo - 1]:offsets[lo]])
+
+
+def load_traffic_domain_index() -> DomainIndex:
+    """
+    TRACKER_LIST_FILE ve AD_LIST_FILE listelerinden indeks oluşturur
+
+    Listeler opsiyoneldir; dosya yoksa hata load_errors'a yazılır ve boş
+    devam edilir (import sırasında loglama yapılmaz, özet startup'ta loglanır).
+
+    Returns:
+        DomainIndex instance
+    """
+    index = DomainIndex()
+    for file_path, category in ((settings.tracker_list_file, "tracker"), (settings.ad_list_file, "ad")):
+        if not file_path:
+            continue
+        start = time.time()
+        try:
+            count = index.load_file(file_path, category)
+            index.load_report.append(f"{category}: {count} domain ({file_path}, {time.time() - start:.2f}s)")
+        except (FileNotFoundError, IOError) as e:
+            index.load_errors.append(f"{category} listesi yüklenemedi ({file_path}): {e}")
+    return index
+
+
+# Global tracker/reklam indeksi (singleton) - başlangıçta bir kez yüklenir
+traffic_domain_index = load_traffic_domain_index()
@@ -2,18 +2,60 @@
 PostgreSQL Logger Sınıfı
 Request logging ve domain stats için logger (Native Python logging)
 """
+import io
 import json
+import time
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+from psycopg2.extras import execute_values
 
 from app.core.logger.native_logger import logger
 from app.config import settings
 from app.db.connection import postgres_connection
 
 
+# network_requests tablosuna COPY ile yazılan kolonlar (sıra önemli)
+NETWORK_REQUEST_COLUMNS = (
+    "domain", "step", "source", "traffic_type", "category", "request_host", "url",
+    "method", "resource_type", "status_code", "mime_type", "size_bytes", "duration_ms", "error"
+)
+
+# Challenge tamponundaki maksimum (domain, adım, widget, sonuç) anahtarı;
+# PostgreSQL erişilemezken tampon sınırsız büyümez, en eski anahtarlar atılır
+CHALLENGE_BUFFER_MAX_KEYS = 10000
+
+
+def _copy_value(value: Any, max_len: Optional[int] = None) -> str:
+    """
+    Değeri COPY text formatına çevirir (NULL -> \\N, özel karakterler kaçışlı)
+
+    PostgreSQL metinde NUL byte kabul etmez ve VARCHAR sınırını aşan değer
+    tüm COPY'yi iptal eder: NUL'lar silinir, max_len verilirse kırpılır.
+    """
+    if value is None:
+        return '\\N'
+    text = str(value)
+    if '\x00' in text:
+        text = text.replace('\x00', '')
+    if max_len is not None:
+        text = text[:max_len]
+    if '\\' in text or '\t' in text or '\n' in text or '\r' in text:
+        text = text.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+    return text
+
+
 class PostgresLogger:
     """PostgreSQL tabanlı logger (request logging için) - SENKRON"""
     
+    def __init__(self):
+        """Challenge istatistik tamponunu hazırla"""
+        # (domain, step, challenge_type, outcome) -> [olay sayısı, toplam ms, en uzun ms]
+        self._challenge_buffer: Dict[tuple, list] = {}
+        self._challenge_flushed_at = time.time()
+        # Tampon dolduğu için atılan anahtar sayısı (sonraki flush'ta loglanır)
+        self._challenge_dropped = 0
+    
     def log_request(self, request_data: Dict[str, Any]) -> bool:
         """
         İstek bilgilerini PostgreSQL'e sakla (senkron)
@@ -224,6 +266,149 @@ class PostgresLogger:
             logger.debug(f"Domain stats yazma hatası: {e}")
             return False
     
+    def log_network_requests(self, domain: str, network_logs: List[dict]) -> bool:
+        """
+        Network loglarını network_requests tablosuna toplu yazar (senkron, tek COPY)
+
+        Args:
+            domain: Taranan domain
+            network_logs: ScrapeResponse.network_logs kayıtları
+
+        Returns:
+            True if yazma başarılı
+        """
+        if not network_logs:
+            return True
+        
+        conn = None
+        try:
+            buffer = io.StringIO()
+            esc = _copy_value
+            # Her satırda aynı olan taranan domain bir kez kaçışlanır
+            site = esc(domain, 255)
+            for entry in network_logs:
+                host = (entry.get("domain") or "").replace('\x00', '').rpartition('@')[2]
+                if not host.startswith('['):
+                    host = host.split(':', 1)[0]
+                status = entry.get("status")
+                size = entry.get("size")
+                duration_ms = entry.get("duration_ms")
+                buffer.write('\t'.join((
+                    site,
+                    esc(entry.get("step"), 20),
+                    esc(entry.get("source"), 20),
+                    esc(entry.get("type"), 20),
+                    esc(entry.get("category"), 20),
+                    esc(host[:255] or None),
+                    esc(entry.get("url")),
+                    esc(entry.get("method"), 10),
+                    esc(entry.get("resource_type"), 50),
+                    '\\N' if status is None else str(int(status)),
+                    esc(entry.get("mime_type") or None, 255),
+                    '\\N' if size is None else str(int(size)),
+                    '\\N' if duration_ms is None else str(float(duration_ms)),
+                    esc(entry.get("error")),
+                )))
+                buffer.write('\n')
+            buffer.seek(0)
+            
+            conn = postgres_connection.get_connection()
+            cursor = conn.cursor()
+            cursor.copy_expert(
+                f"COPY network_requests ({', '.join(NETWORK_REQUEST_COLUMNS)}) FROM STDIN",
+                buffer
+            )
+            conn.commit()
+            return True
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.warning(f"Network request log yazma hatası ({len(network_logs)} kayıt): {e}")
+            return False
+    
+    def record_challenge_events(self, domain: str, events: List[dict]) -> None:
+        """
+        Challenge olaylarını bellekte toplar, aralık dolunca tek sorguda yazar
+
+        Olaylar (domain, adım, widget, sonuç) anahtarıyla birleştirilir;
+        CHALLENGE_STATS_FLUSH_INTERVAL saniyede bir (0: her istekte)
+        challenge_stats tablosuna aktarılır. Tampon CHALLENGE_BUFFER_MAX_KEYS
+        anahtarı aşarsa en eski anahtarlar atılır.
+
+        Args:
+            domain: Taranan domain
+            events: ScrapeResponse.challenge_events kayıtları
+        """
+        for event in events:
+            key = (domain[:255], event.get("step") or "", event.get("type") or "none", event.get("outcome") or "")
+            elapsed_ms = int(event.get("elapsed_ms") or 0)
+            agg = self._challenge_buffer.get(key)
+            if agg is None:
+                if len(self._challenge_buffer) >= CHALLENGE_BUFFER_MAX_KEYS:
+                    # dict ekleme sırasını korur: ilk anahtar en eskisidir
+                    del self._challenge_buffer[next(iter(self._challenge_buffer))]
+                    self._challenge_dropped += 1
+                self._challenge_buffer[key] = [1, elapsed_ms, elapsed_ms]
+            else:
+                agg[0] += 1
+                agg[1] += elapsed_ms
+                if elapsed_ms > agg[2]:
+                    agg[2] = elapsed_ms
+        
+        if time.time() - self._challenge_flushed_at >= settings.challenge_stats_flush_interval:
+            self.flush_challenge_stats()
+    
+    def flush_challenge_stats(self) -> bool:
+        """
+        Tampondaki challenge istatistiklerini challenge_stats tablosuna yazar
+        (senkron, tek INSERT ... ON CONFLICT)
+
+        Yazma başarısız olursa tampon korunur ve sonraki aralıkta tekrar
+        denenir (tampon boyutu CHALLENGE_BUFFER_MAX_KEYS ile sınırlı).
+
+        Returns:
+            True if yazma başarılı (veya tampon boş)
+        """
+        self._challenge_flushed_at = time.time()
+        if self._challenge_dropped:
+            logger.warning(
+                f"Challenge stats tamponu dolu: {self._challenge_dropped} eski anahtar yazılmadan atıldı"
+            )
+            self._challenge_dropped = 0
+        if not self._challenge_buffer:
+            return True
+        
+        now = datetime.now(timezone.utc)
+        rows = [
+            (domain, step, challenge_type, outcome, count, total_ms, max_ms, now)
+            for (domain, step, challenge_type, outcome), (count, total_ms, max_ms)
+            in self._challenge_buffer.items()
+        ]
+        conn = None
+        try:
+            conn = postgres_connection.get_connection()
+            cursor = conn.cursor()
+            execute_values(cursor, """
+                INSERT INTO challenge_stats (
+                    domain, step, challenge_type, outcome, event_count, total_ms, max_ms, last_seen
+                ) VALUES %s
+                ON CONFLICT (domain, step, challenge_type, outcome) DO UPDATE SET
+                    event_count = challenge_stats.event_count + EXCLUDED.event_count,
+                    total_ms = challenge_stats.total_ms + EXCLUDED.total_ms,
+                    max_ms = GREATEST(challenge_stats.max_ms, EXCLUDED.max_ms),
+                    last_seen = EXCLUDED.last_seen
+            """, rows, page_size=len(rows))
+            conn.commit()
+            self._challenge_buffer = {}
+            return True
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.warning(
+                f"Challenge stats yazma hatası ({len(self._challenge_buffer)} anahtar tamponda bekliyor): {e}"
+            )
+            return False
+    
     def health_check(self) -> bool:
         """PostgreSQL bağlantısını kontrol et (senkron)"""
         conn = None
@@ -5,6 +5,7 @@ SB-Scraper API endpoint'i - Tek endpoint (/scrape)
 from typing import Dict, Any
 import time
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response
 
 from app.config import settings
 from app.schemas import ScrapeRequest, ScrapeResponse
@@ -12,6 +13,7 @@ from app.core.browser import BrowserManager
 from app.core.logger import logger
 from app.core.logger import PostgresLogger
 from app.errors import SBScraperError, ErrorCode
+from app.utils.response_encoder import build_json_response
 
 
 # ==================== FASTAPI UYGULAMASI ====================
@@ -57,6 +59,29 @@ def startup_event() -> None:
         Exception: PostgreSQL bağlantı hatası
     """
     postgres_logger.initialize()
+    
+    # Tracker/reklam listeleri import sırasında yüklendi - özeti logla
+    from app.core.domain_index import traffic_domain_index
+    for line in traffic_domain_index.load_report:
+        logger.info(f"✅ Domain listesi yüklendi - {line}")
+    for line in traffic_domain_index.load_errors:
+        logger.warning(f"⚠️ {line}")
+
+    from app.core.blacklist import blacklist_manager
+    logger.info(
+        f"✅ Black-list yüklendi - {blacklist_manager.get_blacklist_count()} domain "
+        f"({blacklist_manager.load_seconds:.2f}s)"
+    )
+
+    from app.core.browser.challenge_cache import challenge_cache
+    if challenge_cache.load_error:
+        logger.warning(f"⚠️ {challenge_cache.load_error}")
+    elif challenge_cache.enabled:
+        logger.info(f"✅ Challenge cache yüklendi - {len(challenge_cache)} domain")
+
+    from app.core.browser.consent_cookies import consent_cookie_store
+    if consent_cookie_store.load_error:
+        logger.warning(f"⚠️ {consent_cookie_store.load_error}")
 
 
 # ==================== SHUTDOWN EVENT ====================
@@ -77,6 +102,17 @@ def shutdown_event() -> None:
     except Exception as e:
         logger.error(f"Browser Manager temizleme hatası: {e}")
     
+    # Yazılmamış challenge cache kayıtlarını dosyaya yaz
+    from app.core.browser.challenge_cache import challenge_cache
+    try:
+        challenge_cache.flush()
+    except OSError as e:
+        logger.error(f"Challenge cache yazma hatası: {e}")
+    
+    # Tamponda kalan challenge istatistiklerini yaz
+    if settings.challenge_stats_enabled:
+        postgres_logger.flush_challenge_stats()
+    
     # PostgreSQL bağlantısını kapat
     try:
         postgres_logger.close()
@@ -107,6 +143,7 @@ def shutdown_event() -> None:
     - **get_mobile_ss:** Mobil ekran görüntüsü al
     - **get_google_search:** Google arama sonuçlarını al
     - **get_ddg_search:** DuckDuckGo arama sonuçlarını al
+    - **outputs:** Sadece listelenen artefaktları üret ve döndür (bayrakları geçersiz kılar)
     
     ## Hata Kodları:
     
@@ -171,7 +208,7 @@ def shutdown_event() -> None:
 def scrape(
     request: ScrapeRequest,
     http_request: Request = None
-) -> Dict[str, Any]:
+) -> Response:
     """
     URL scraping işlemi yap ve sonuçları döndür
     
@@ -180,7 +217,7 @@ def scrape(
         http_request: FastAPI Request nesnesi
     
     Returns:
-        Dict[str, Any]: Scraping sonuçları
+        Response: Scraping sonuçları (JSON, istemci destekliyorsa br/gzip sıkıştırılmış)
     
     Raises:
         HTTPException: Hata durumunda
@@ -302,6 +339,10 @@ def scrape(
                 ddg_html=bool(response.ddg_html),
                 network_logs=bool(response.network_logs)
             )
+            
+            # Network istekleri ayrı tabloya tek COPY ile yazılır (opt-in)
+            if settings.network_log_db_enabled and response.network_logs:
+                postgres_logger.log_network_requests(domain, response.network_logs)
         else:
             postgres_logger.log_domain_stats(
                 domain=domain,
@@ -310,13 +351,20 @@ def scrape(
                 duration=response.duration
             )
         
+        # Challenge olayları bellekte toplanır, aralıklarla toplu yazılır
+        if settings.challenge_stats_enabled and response.challenge_events:
+            postgres_logger.record_challenge_events(domain, response.challenge_events)
+        
         # Request logging - başarılı
         request_data['response_status_code'] = status_code
         request_data['response_time_ms'] = int((time.time() - start_time) * 1000)
         postgres_logger.log_request(request_data)
         
-        # Pydantic v2 için model_dump() kullanılır
-        return response.model_dump()
+        # Hızlı serileştirme + Accept-Encoding'e göre sıkıştırma
+        # (jsonable_encoder + stdlib json yolu çok MB'lık base64 alanlarda yavaş)
+        accept_encoding = http_request.headers.get('accept-encoding', '') if http_request else ''
+        # outputs verilmişse istenmeyen artefakt alanları yanıttan çıkarılır
+        return build_json_response(response, accept_encoding, exclude=request.excluded_outputs())
     
     except SBScraperError as e:
         # SBScraperError için özel yanıt
@@ -367,6 +415,34 @@ def scrape(
         )
 
 
+# ==================== BLACK-LIST RELOAD ENDPOINT ====================
+@app.post(
+    "/blacklist/reload",
+    tags=["Admin"],
+    summary="Black-list Yeniden Yükle",
+    description="""Black-list dosyası değiştiyse yeni listeyi yükler ve eskisinin yerine koyar.
+    
+    Kurulum senkron çalışır ve büyük listelerde CPU yoğundur; sakin bir zamanda çağrılmalıdır.
+    Kurulum sürerken /scrape istekleri eski listeyi kullanır.
+    """
+)
+def reload_blacklist() -> Dict[str, Any]:
+    """
+    Black-list yeniden yükleme endpoint'i
+    
+    Returns:
+        Dict[str, Any]: Yükleme sonucu (status, count, load_seconds)
+    """
+    from app.core.blacklist import blacklist_manager
+    
+    status = blacklist_manager.reload()
+    return {
+        "status": status,
+        "count": blacklist_manager.get_blacklist_count(),
+        "load_seconds": round(blacklist_manager.load_seconds, 2)
+    }
+
+
 # ==================== HEALTH CHECK ENDPOINT ====================
 @app.get(
     "/health",
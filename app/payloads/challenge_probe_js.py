@@ -0,0 +1,80 @@
+"""
+Challenge Probe JavaScript Payload
+Consent ve captcha widget'larını tek execute_script çağrısında tespit eder
+"""
+
+# Google consent butonları (öncelik sırasıyla)
+GOOGLE_CONSENT_XPATHS = (
+    "//div[text()='Tümünü kabul et']", "//div[text()='Accept all']",
+    "//*[@id='L2AGLb']", "//*[@id='W0wltc']",
+    "//button[contains(.,'Kabul')]", "//button[contains(.,'Accept')]",
+)
+
+# Sayfa Google consent ekranı mı (consent.google.* yönlendirmesi veya consent formu)
+GOOGLE_CONSENT_PAGE_JS = """
+return location.hostname.startsWith('consent.') ||
+    document.querySelector("form[action*='consent.google']") !== null;
+"""
+
+# Challenge iframe'leri: anahtar -> CSS seçicisi
+CHALLENGE_FRAMES = {
+    "cloudflare": "iframe[src*='cloudflare']",
+    "recaptcha": "iframe[title='reCAPTCHA']",
+    "turnstile": "iframe[src*='turnstile']",
+    "hcaptcha": "iframe[src*='hcaptcha']",
+}
+
+# Gömülü widget'ların çözüldüğünde doldurduğu token alanı (iframe görünür kalır).
+# Listede olmayanlar (Cloudflare ara sayfası) iframe kaybolunca çözülmüş sayılır.
+CHALLENGE_RESPONSE_FIELDS = {
+    "recaptcha": "[name='g-recaptcha-response']",
+    "turnstile": "[name='cf-turnstile-response']",
+    "hcaptcha": "[name='h-captcha-response']",
+}
+
+
+# arguments[0]: Denenecek consent XPath'leri (boş: consent aranmaz)
+# arguments[1]: Aranacak iframe'ler {anahtar: CSS seçicisi}
+# Dönüş: {"google_consent": {"element", "xpath"}|null, "<frame anahtarı>": iframe|null, ...}
+# Elementler WebElement olarak döner; Python tarafı tekrar aramaz.
+CHALLENGE_PROBE_JS = """
+const xpaths = arguments[0] || [];
+const frames = arguments[1] || {};
+const result = {google_consent: null};
+for (const xpath of xpaths) {
+    const el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (el && el.getClientRects().length && getComputedStyle(el).visibility !== 'hidden') {
+        result.google_consent = {element: el, xpath: xpath};
+        break;
+    }
+}
+for (const key in frames) {
+    result[key] = document.querySelector(frames[key]);
+}
+return result;
+"""
+
+
+# arguments[0]: element - hâlâ DOM'da ve görünür mü
+ELEMENT_VISIBLE_JS = """
+const el = arguments[0];
+return !!el && el.isConnected && el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+"""
+
+# arguments[0]: challenge iframe'i, arguments[1]: token alanı seçicisi veya null
+# iframe kaybolduysa veya token alanlarından biri doluysa true
+WIDGET_SOLVED_JS = """
+const frame = arguments[0];
+const field = arguments[1];
+if (!frame || !frame.isConnected || !frame.getClientRects().length || getComputedStyle(frame).visibility === 'hidden') {
+    return true;
+}
+if (!field) return false;
+for (const el of document.querySelectorAll(field)) {
+    if (el.value) return true;
+}
+return false;
+"""
+
+# arguments[0]: CSS seçici listesi - frame içinde herhangi biri var mı
+SELECTOR_PRESENT_JS = "return document.querySelector(arguments[0]) !== null;"
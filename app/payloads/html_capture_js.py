@@ -0,0 +1,59 @@
+"""
+HTML Capture JavaScript Payload
+Sayfa HTML'ini CDP Runtime.evaluate ile tek çağrıda serileştirir
+"""
+
+
+def get_html_capture_js(include_iframes: bool = False) -> str:
+    """
+    Doctype dahil tüm dokümanı string olarak döndüren JavaScript ifadesi üretir.
+
+    include_iframes=True ise aynı origin'li iframe içerikleri klonlanmış
+    dokümanda ilgili <iframe> elementine `srcdoc` olarak gömülür
+    (driver.page_source bu içerikleri döndürmez).
+
+    Args:
+        include_iframes: Aynı origin'li iframe'ler HTML'e gömülsün mü
+
+    Returns:
+        JavaScript ifadesi string olarak
+    """
+    include = "true" if include_iframes else "false"
+
+    return f"""
+    (() => {{
+        const doctypeOf = (doc) => {{
+            const dt = doc.doctype;
+            if (!dt) return '';
+            return '<!DOCTYPE ' + dt.name +
+                (dt.publicId ? ' PUBLIC "' + dt.publicId + '"' : '') +
+                (!dt.publicId && dt.systemId ? ' SYSTEM' : '') +
+                (dt.systemId ? ' "' + dt.systemId + '"' : '') + '>';
+        }};
+
+        const serialize = (doc, depth) => {{
+            const root = doc.documentElement;
+            if (!root) return '';
+            if (!{include} || depth > 3) return doctypeOf(doc) + root.outerHTML;
+
+            const frames = root.querySelectorAll('iframe, frame');
+            if (!frames.length) return doctypeOf(doc) + root.outerHTML;
+
+            // Orijinal DOM'a dokunmamak için klon üzerinde çalış
+            const clone = root.cloneNode(true);
+            const cloneFrames = clone.querySelectorAll('iframe, frame');
+            frames.forEach((frame, i) => {{
+                try {{
+                    // Farklı origin'de contentDocument erişimi hata fırlatır / null döner
+                    const inner = frame.contentDocument;
+                    if (inner && inner.documentElement && cloneFrames[i]) {{
+                        cloneFrames[i].setAttribute('srcdoc', serialize(inner, depth + 1));
+                    }}
+                }} catch (e) {{}}
+            }});
+            return doctypeOf(doc) + clone.outerHTML;
+        }};
+
+        return serialize(document, 0);
+    }})()
+    """
@@ -0,0 +1,78 @@
+"""
+Resource Collector JavaScript Payload
+Doküman başında kurulan PerformanceObserver ile resource kayıtlarını toplar
+"""
+
+
+def get_resource_collector_js(max_entries: int) -> str:
+    """
+    Doküman başında çalışacak resource collector kodunu döndürür.
+
+    Kayıtlar PerformanceObserver ile geldikçe sütun dizilerine (url,
+    initiator, boyut, başlangıç, süre, protokol) eklenir; her kayıt için
+    nesne tutulmaz. Observer'a gelen kayıtlar performance buffer'ından
+    bağımsız olduğu için buffer dolduğunda temizlenir, büyük sayfalar
+    buffer sınırına takılmaz (MemoryCleaner'ın clearResourceTimings
+    çağrısı da toplananları silmez).
+
+    Args:
+        max_entries: Doküman başına tutulacak maksimum kayıt (fazlası sayılır)
+
+    Returns:
+        JavaScript kodu string olarak
+    """
+    return """
+(() => {
+    if (window.__sbResources || typeof PerformanceObserver === 'undefined') return;
+    const max = %d;
+    const c = {n: [], i: [], s: [], t: [], d: [], p: [], dropped: 0};
+    const add = (list) => {
+        for (let k = 0; k < list.length; k++) {
+            if (c.n.length >= max) { c.dropped += list.length - k; return; }
+            const e = list[k];
+            c.n.push(e.name);
+            c.i.push(e.initiatorType);
+            c.s.push(e.transferSize || 0);
+            c.t.push(e.startTime);
+            c.d.push(e.duration);
+            c.p.push(e.nextHopProtocol || '');
+        }
+    };
+    let observer;
+    try {
+        observer = new PerformanceObserver((l) => add(l.getEntries()));
+        observer.observe({type: 'resource', buffered: true});
+    } catch (e) {
+        return;
+    }
+    // Henüz callback'e verilmemiş kayıtlar okuma anında alınır
+    c.take = () => add(observer.takeRecords());
+    performance.addEventListener('resourcetimingbufferfull', () => performance.clearResourceTimings());
+    Object.defineProperty(window, '__sbResources', {value: c, enumerable: false});
+})();
+""" % max_entries
+
+
+# Toplanan kayıtları tek çağrıda döndürür ve collector'ı boşaltır
+# (aynı dokümandaki sonraki adım pencereleri kayıtları tekrar almaz).
+# Collector yoksa (enjeksiyondan önce açılmış doküman) performance
+# buffer'ı aynı sütun biçiminde okunur.
+RESOURCE_DRAIN_JS = """
+const c = window.__sbResources;
+if (c) {
+    c.take();
+    const out = {n: c.n, i: c.i, s: c.s, t: c.t, d: c.d, p: c.p, dropped: c.dropped};
+    c.n = []; c.i = []; c.s = []; c.t = []; c.d = []; c.p = []; c.dropped = 0;
+    return out;
+}
+const list = performance.getEntriesByType('resource');
+return {
+    n: list.map(r => r.name),
+    i: list.map(r => r.initiatorType),
+    s: list.map(r => r.transferSize || 0),
+    t: list.map(r => r.startTime),
+    d: list.map(r => r.duration),
+    p: list.map(r => r.nextHopProtocol || ''),
+    dropped: 0
+};
+"""
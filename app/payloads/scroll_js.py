@@ -0,0 +1,85 @@
+"""
+Mobile Scroll JavaScript Payload
+Mobil "scroll dansı"nı sayfa içinde, kare senkronize olarak çalıştırır
+"""
+
+# Scroll durakları (sayfa yüksekliğine oranla) - ilk duraktan sonra hayalet tıklama yapılır
+MOBILE_SCROLL_STOPS = (1 / 3, 1 / 1.5, 0)
+
+
+# execute_async_script ile çalışır
+# arguments[0]: Scroll durakları (oran listesi)
+# arguments[1]: Toplam süre sınırı (ms)
+# Her duraktan sonra iki kare (requestAnimationFrame) beklenir; görünür alana
+# giren lazy görseller (IntersectionObserver) yüklenene kadar, durak payı
+# dolmadan devam edilmez. Gizli/kısılmış sekmede rAF hiç tetiklenmeyebilir:
+# her kare FRAME_FALLBACK_MS ile yarışır ve üst seviye bir zamanlayıcı
+# capMs dolunca sonucu döndürür (süre sınırı kesin).
+# Dönüş: {elapsed_ms, triggered, pending}
+MOBILE_SCROLL_JS = """
+const done = arguments[arguments.length - 1];
+const stops = arguments[0];
+const capMs = arguments[1];
+const started = performance.now();
+const deadline = started + capMs;
+const stopBudget = capMs / Math.max(stops.length, 1);
+const FRAME_FALLBACK_MS = 50;
+const nextFrame = () => new Promise(resolve => {
+    requestAnimationFrame(() => resolve());
+    setTimeout(resolve, FRAME_FALLBACK_MS);
+});
+
+let triggered = 0;
+let pending = 0;
+let observer = null;
+try {
+    observer = new IntersectionObserver((entries) => {
+        for (const entry of entries) {
+            if (!entry.isIntersecting) continue;
+            triggered++;
+            const el = entry.target;
+            observer.unobserve(el);
+            if (el.tagName === 'IMG' && !el.complete) {
+                pending++;
+                const finish = () => { pending--; };
+                el.addEventListener('load', finish, {once: true});
+                el.addEventListener('error', finish, {once: true});
+            }
+        }
+    }, {rootMargin: '200px'});
+    document.querySelectorAll("img, iframe, [data-src], [loading='lazy']").forEach(el => observer.observe(el));
+} catch (e) {}
+
+let finished = false;
+const finish = () => {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    done({elapsed_ms: Math.round(performance.now() - started), triggered: triggered, pending: pending});
+};
+// Kesin süre sınırı: döngü takılsa bile capMs sonunda döner
+setTimeout(finish, capMs);
+
+const settle = async () => {
+    // Scroll olayları ve observer callback'leri için iki kare
+    await nextFrame();
+    await nextFrame();
+    const stopDeadline = Math.min(performance.now() + stopBudget, deadline);
+    while (pending > 0 && !finished && performance.now() < stopDeadline) await nextFrame();
+};
+
+(async () => {
+    try {
+        for (let i = 0; i < stops.length && !finished && performance.now() < deadline; i++) {
+            window.scrollTo(0, document.body.scrollHeight * stops[i]);
+            await settle();
+            if (i === 0) {
+                // Sayfanın ortasına hayalet tıklama (popup tetikleyicileri için)
+                const target = document.elementFromPoint(window.innerWidth / 2, window.innerHeight / 2);
+                if (target) target.click();
+            }
+        }
+    } catch (e) {}
+    finish();
+})();
+"""
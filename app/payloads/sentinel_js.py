@@ -2,213 +2,317 @@
 JS Sentinel Payload
 Nöbetçi script - Popup'ları ve engelleyici elementleri temizler
 """
+import json
+
+# Sentinel'in doküman başında çalışmayacağı host'lar (arama motoru adımları)
+SENTINEL_EXCLUDED_HOSTS = r"^(?:www\.)?(?:google\.[a-z.]+|duckduckgo\.com)$"
 
 # --- THE SENTINEL (AKILLI SÜRÜMÜ) ---
 # Z-index kontrolü ile agresifliği azaltılmış sürüm
+# Tüm DOM taranmaz: adaylar elementsFromPoint ızgarası, kısa "kapat" metinleri
+# ve MutationObserver'ın bildirdiği kökler (eklenen düğümler, class/style'ı
+# değişen elementler) ile sınırlıdır. Bir geçişte MAX_ADDED'den fazla kök
+# gelirse sonraki geçiş tüm body'yi inceler (eski tam tarama). Her geçişte
+# önce tüm stil/boyut okumaları, sonra gizleme yazmaları yapılır; sayfa
+# durulunca periyodik tarama durur (yeni mutasyonlar onu yeniden başlatır).
 JS_SENTINEL = """
 (() => {
+    // Çift kurulum koruması (doküman başı + execute_script fallback)
+    if (window.__sbSentinel) return;
+    const state = {installed_at: Math.round(performance.now()), removed: 0, samples: [], passes: 0, stable: false};
+    Object.defineProperty(window, '__sbSentinel', {
+        value: {status: () => Object.assign({}, state, {samples: state.samples.slice()})},
+        enumerable: false
+    });
+
+    // Captcha/challenge widget'ları gizlenmez (PopupHandler tıklayacak)
+    const CHALLENGE = "iframe[src*='cloudflare'], iframe[src*='turnstile'], iframe[src*='hcaptcha'], iframe[title='reCAPTCHA']";
+
     // 1. CSS ÖNLEME - Gelişmiş selector'lar
+    // (doküman başında head henüz yok, style documentElement'e eklenir)
     const style = document.createElement('style');
-    style.innerHTML = `
-        [class*='popup'], [id*='popup'], [class*='modal'], [id*='modal'],
+    style.textContent = `
+        :is([class*='popup'], [id*='popup'], [class*='modal'], [id*='modal'],
         [class*='overlay'], [id*='overlay'], [class*='banner'], [id*='banner'],
         [class*='cookie'], [id*='cookie'], [class*='sticky'], [id*='sticky'],
         [class*='reklam'], [class*='tanitim'], [class*='newsletter'],
         [data-role='modal'], [data-role='dialog'], [role='dialog'],
         [aria-modal='true'], [role='alertdialog'],
         .fancybox-overlay, .swal2-container, .sweet-alert, .bootbox,
-        .modal-backdrop, .modal-overlay, .cookie-banner {
+        .modal-backdrop, .modal-overlay, .cookie-banner):not(:has(${CHALLENGE})) {
             display: none !important;
             opacity: 0 !important;
             pointer-events: none !important;
         }
         body, html { overflow: visible !important; position: static !important; }
     `;
-    document.head.appendChild(style);
+    (document.head || document.documentElement).appendChild(style);
 
     // ========================================
-    // YARDIMCI FONKSİYONLAR
+    // AYARLAR
     // ========================================
+    const CLOSE_TEXTS = new Set(['x', '×', '✕']);
+    const KEYWORDS = ['güncel adres', 'bahis', 'yatırım', 'bonus', 'hoşgeldin', 'kapat', 'giriş', 'twitter', 'telegram', 'her daim'];
+    const IMPORTANT = 'main, article, section, .content, #content, [role="main"], .main-content';
+    const GRID = 7;             // elementsFromPoint örnekleme ızgarası (GRID x GRID nokta)
+    const STACK_DEPTH = 12;     // Nokta başına incelenen üst üste element sayısı
+    const MAX_CLOSE_TEXT = 12;  // Kapat butonu metni için maksimum uzunluk
+    const MAX_ADDED = 300;      // Bir geçişte incelenen mutasyon kökü sayısı (aşılırsa tam tarama)
+    const TICK_MS = 1000;
+    const STABLE_PASSES = 3;    // Bu kadar sessiz geçişten sonra periyodik tarama durur
 
-    // Önemli içerik kontrolü - ana içeriği koru
-    const hasImportantContent = (el) => {
-        const importantSelectors = ['main', 'article', 'section', '.content', '#content', '[role="main"]', '.main-content'];
-        for (const sel of importantSelectors) {
-            try {
-                if (el.querySelector(sel)) return true;
-            } catch (e) {}
-        }
-        return false;
-    };
-
-    // Z-index bazlı overlay kontrolü
-    const isOverlay = (el) => {
-        try {
-            const style = window.getComputedStyle(el);
-            const zIndex = parseInt(style.zIndex) || 0;
-            const rect = el.getBoundingClientRect();
-            
-            // Sadece yüksek z-index ve büyük alan kaplayan elementler
-            return zIndex > 100 &&
-                   rect.width > window.innerWidth * 0.3 &&
-                   rect.height > window.innerHeight * 0.3;
-        } catch (e) {
-            return false;
-        }
-    };
+    const hiddenByUs = new WeakSet();
+    const pendingRoots = new Set();
+    let fullTextScan = true;
+    let fullScan = false;       // Kök kuyruğu taştı: sonraki geçiş tüm body'yi inceler
+    let mutated = false;
 
     // ========================================
-    // KILL FAMILY - Akıllı ve Kontrollü
+    // YARDIMCI FONKSİYONLAR (sadece okuma)
     // ========================================
-    const killFamily = (el) => {
+    const isPositioned = (s) => s.position === 'fixed' || s.position === 'absolute';
+    const zIndexOf = (s) => parseInt(s.zIndex) || 0;
+    // Kurallar görünen metne bakar (innerText): gizli alt elementlerin ve
+    // script/style içeriğinin metni sayılmaz. Sadece aday kümesinde ve okuma
+    // fazında çağrılır; layout getBoundingClientRect ile zaten güncel
+    const textOf = (el) => (el.innerText || '').toLowerCase();
+    const isCloseText = (txt) => txt.length <= MAX_CLOSE_TEXT &&
+        (CLOSE_TEXTS.has(txt) || txt.includes('kapat') || txt.includes('close'));
+
+    // Kapat butonunun ait olduğu popup'ı bulur: 5 seviye yukarı çıkar,
+    // ana içerik barındırmayan ilk konumlandırılmış ataya karar verir
+    const familyTarget = (el) => {
         let current = el;
-        let killed = false;
-        
-        // 5 seviye yukarı çık ama BODY ve HTML'yi geçme
         for (let i = 0; i < 5; i++) {
-            if (!current || current.tagName === 'BODY' || current.tagName === 'HTML') break;
-            
+            if (!current || current === document.body || current === document.documentElement) break;
             const style = window.getComputedStyle(current);
-            const rect = current.getBoundingClientRect();
-            
-            // Z-index ve içerik kontrolü
-            if ((style.position === 'fixed' || style.position === 'absolute') &&
-                !hasImportantContent(current)) {
-                
-                // Z-index kontrolü - çok yüksekse overlay olabilir
-                const zIndex = parseInt(style.zIndex) || 0;
-                
+            if (isPositioned(style) && !current.querySelector(IMPORTANT)) {
+                const rect = current.getBoundingClientRect();
                 // Boyut kontrolü - çok büyükse silme (ana içerik olabilir)
                 const isTooBig = rect.width > window.innerWidth * 0.8 &&
                                  rect.height > window.innerHeight * 0.8;
-                
-                // Küçük veya orta boy elementleri sil
-                if (!isTooBig || zIndex > 100) {
-                    console.log('Popup Silindi:', current.className || current.id);
-                    current.style.display = 'none'; // remove yerine display:none
-                    killed = true;
-                    break;
-                }
+                if (!isTooBig || zIndexOf(style) > 100) return current;
             }
             current = current.parentElement;
         }
-        
-        // Eğer hiçbir ata silinmediyse, en azından kendisini gizle
-        if (!killed) {
-            el.style.display = 'none';
+        // Hiçbir ata uygun değilse en azından kendisi gizlenir
+        return el;
+    };
+
+    // ========================================
+    // ADAY TOPLAMA - tüm DOM taranmaz
+    // ========================================
+    // Ekranı kaplayan/kenara yapışan katmanlar: ızgara noktalarındaki element yığını
+    const collectFromGrid = (w, h, out) => {
+        for (let i = 0; i < GRID; i++) {
+            const x = w * (0.02 + 0.96 * i / (GRID - 1));
+            for (let j = 0; j < GRID; j++) {
+                const y = h * (0.02 + 0.96 * j / (GRID - 1));
+                const stack = document.elementsFromPoint(x, y);
+                for (let k = 0; k < stack.length && k < STACK_DEPTH; k++) out.add(stack[k]);
+            }
+        }
+    };
+
+    // "X" / "Kapat" butonları: sadece kısa metin düğümlerinin ebeveynleri
+    const collectCloseButtons = (root, out) => {
+        const walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT);
+        let node;
+        while ((node = walker.nextNode())) {
+            const value = node.nodeValue;
+            if (value.length > 40) continue;
+            const txt = value.trim().toLowerCase();
+            if (txt && isCloseText(txt) && node.parentElement) out.add(node.parentElement);
         }
     };
 
     // ========================================
-    // 2. TEMİZLİK FONKSİYONU - Gelişmiş
+    // KURALLAR - adayı inceler, gizlenecek elementi targets'a ekler
+    // ========================================
+    const inspect = (el, w, h, targets) => {
+        if (hiddenByUs.has(el) || el === document.body || el === document.documentElement) return;
+        const style = window.getComputedStyle(el);
+        if (style.display === 'none' || style.visibility === 'hidden' || style.opacity === '0') return;
+        const rect = el.getBoundingClientRect();
+        if (rect.width === 0 || rect.height === 0) return;
+
+        // A) "X" VEYA "KAPAT" BUTONU - küçük kutu -> AİLESİNİ YOK ET
+        if (rect.width < 60 && rect.height < 60 && isCloseText(textOf(el))) {
+            targets.add(familyTarget(el));
+            return;
+        }
+
+        if (!isPositioned(style)) return;
+        const zIndex = zIndexOf(style);
+        if (zIndex <= 50) return;
+
+        // B) YASAKLI KELİME AVCI - sabit, yüksek z-index, bahis kelimeleri
+        if (rect.width > 50 && rect.height > 50) {
+            const txt = textOf(el);
+            if (KEYWORDS.some(kw => txt.includes(kw))) {
+                targets.add(el);
+                return;
+            }
+        }
+
+        // C) BOŞ KUTU ÇÖPÇÜSÜ - sabit, büyük, içi boş (header hariç)
+        if (style.position === 'fixed' && rect.height > 100 && rect.width > 50 &&
+            !(rect.top === 0 && rect.height < 80) && textOf(el).trim().length < 5) {
+            targets.add(el);
+            return;
+        }
+
+        // D) GEOMETRİK AV - dikey yan bant veya tam ekran overlay
+        if ((rect.height > h * 0.6 && rect.width < w * 0.4) ||
+            (rect.width > w * 0.9 && rect.height > h * 0.9)) {
+            targets.add(el);
+        }
+    };
+
     // ========================================
+    // 2. TEMİZLİK GEÇİŞİ - önce tüm okumalar, sonra tüm yazmalar
+    // ========================================
+    // (okuma/yazma karışınca her getComputedStyle yeniden layout zorlar)
     const cleanUp = () => {
-        const h = window.innerHeight;
+        if (!document.body) return 0;
         const w = window.innerWidth;
-        const keywords = ['güncel adres', 'bahis', 'yatırım', 'bonus', 'hoşgeldin', 'kapat', 'giriş', 'twitter', 'telegram', 'her daim'];
-
-        document.querySelectorAll('*').forEach(el => {
-            try {
-                // OPTİMİZASYON: Görünmez elementleri işlemden geçirip CPU yorma
-                if (el.offsetParent === null) return;
-                const style = window.getComputedStyle(el);
-                if (style.display === 'none' || style.visibility === 'hidden' || style.opacity === '0') return;
-
-                const rect = el.getBoundingClientRect();
-                if (rect.width === 0 || rect.height === 0) return;
-
-                const txt = el.innerText.toLowerCase();
-
-                // A) "X" VEYA "KAPAT" BUTONU BULUCU
-                // Küçük kutu + içinde X veya Close varsa -> AİLESİNİ YOK ET
-                if (rect.width < 60 && rect.height < 60) {
-                    if (txt === 'x' || txt === '×' || txt === '✕' || txt.includes('kapat') || txt.includes('close')) {
-                        killFamily(el);
-                        return;
-                    }
-                }
-
-                // B) YASAKLI KELİME AVCI - Z-index kontrolü ile
-                // Eğer element sabitse, yüksek z-index'e sahipse ve içinde bahis kelimeleri geçiyorsa
-                const zIndex = parseInt(style.zIndex) || 0;
-                if ((style.position === 'fixed' || style.position === 'absolute') &&
-                    rect.width > 50 && rect.height > 50 &&
-                    zIndex > 50) {
-                     if (keywords.some(kw => txt.includes(kw))) {
-                         console.log('Yasaklı Kelime:', txt.substring(0, 20));
-                         el.style.display = 'none';
-                         return;
-                     }
-                }
+        const h = window.innerHeight;
+        const candidates = new Set();
 
-                // C) BOŞ KUTU ÇÖPÇÜSÜ - Z-index kontrolü ile
-                // Sabit, büyük, ama içinde az metin var veya içi boşaltılmış
-                if (style.position === 'fixed' &&
-                    rect.height > 100 && rect.width > 50 &&
-                    zIndex > 50) {
-                    // Header değilse (Header genelde incedir ve en tepededir)
-                    if (!(rect.top === 0 && rect.height < 80)) {
-                         // Eğer içi boşsa veya sadece renk varsa
-                         if (el.innerText.trim().length < 5) {
-                             console.log('Boş Kutu Silindi:', el);
-                             el.style.display = 'none';
-                         }
-                    }
-                }
+        collectFromGrid(w, h, candidates);
+        if (fullScan) {
+            // Kuyruğa sığmayan kökler kaybolmasın: tüm elementler aday
+            for (const el of document.body.getElementsByTagName('*')) candidates.add(el);
+            fullScan = false;
+            fullTextScan = true;
+        }
+        // Tüm body metni taranıyorsa köklerin metinleri ayrıca taranmaz
+        const scanRoots = !fullTextScan;
+        if (fullTextScan) {
+            collectCloseButtons(document.body, candidates);
+            fullTextScan = false;
+        }
+        for (const root of pendingRoots) {
+            if (!root.isConnected) continue;
+            candidates.add(root);
+            if (scanRoots) collectCloseButtons(root, candidates);
+        }
+        pendingRoots.clear();
 
-                // D) GEOMETRİK AV (Yan Bantlar) - Z-index kontrolü ile
-                if (style.position === 'fixed' || style.position === 'absolute') {
-                    const zIndexVal = parseInt(style.zIndex) || 0;
-                    
-                    // Sadece yüksek z-index'li elementleri kontrol et
-                    if (zIndexVal > 50) {
-                        // Dikey Yan Bant
-                        if (rect.height > h * 0.6 && rect.width < w * 0.4) {
-                            el.style.display = 'none';
-                        }
-                        // Tam Ekran Overlay
-                        if (rect.width > w * 0.9 && rect.height > h * 0.9) {
-                            el.style.display = 'none';
-                        }
-                    }
-                }
+        // OKUMA fazı
+        const targets = new Set();
+        for (const el of candidates) {
+            try { inspect(el, w, h, targets); } catch (e) {}
+        }
 
-            } catch(e) {}
-        });
-        document.body.style.overflow = 'visible';
+        // YAZMA fazı
+        let hidden = 0;
+        for (const el of targets) {
+            if (hiddenByUs.has(el) || el.querySelector(CHALLENGE)) continue;
+            el.style.display = 'none'; // remove yerine display:none
+            hiddenByUs.add(el);
+            hidden++;
+            state.removed++;
+            if (state.samples.length < 20) {
+                state.samples.push((el.tagName + (el.id ? '#' + el.id : '') +
+                    (typeof el.className === 'string' && el.className ? '.' + el.className.trim().split(/\\s+/).join('.') : '')).slice(0, 80));
+            }
+        }
+        // Sadece gerekirse yazılır (her yazma bir style mutasyonu üretir)
+        if (document.body.style.overflow !== 'visible') document.body.style.overflow = 'visible';
+        state.passes++;
+        return hidden;
     };
 
     // ========================================
-    // 3. SÜREKLİ TAKİP - Performans Optimizasyonu
+    // 3. TAKİP - sayfa durulunca periyodik tarama durur
     // ========================================
-    
-    // Interval'i 400ms -> 1000ms azalttık (CPU kullanımını düşürmek için)
-    let lastCleanup = 0;
-    const cleanupInterval = 1000;
-    
-    const smartCleanUp = () => {
-        const now = Date.now();
-        if (now - lastCleanup < cleanupInterval) return;
-        lastCleanup = now;
-        
-        requestAnimationFrame(cleanUp);
+    let timer = null;
+    let quietPasses = 0;
+    let debounce = null;
+
+    const tick = () => {
+        const hits = cleanUp();
+        quietPasses = (hits || mutated) ? 0 : quietPasses + 1;
+        mutated = false;
+        if (quietPasses >= STABLE_PASSES && timer) {
+            clearInterval(timer);
+            timer = null;
+            state.stable = true;
+        }
+    };
+
+    const wake = () => {
+        quietPasses = 0;
+        state.stable = false;
+        if (!timer) timer = setInterval(tick, TICK_MS);
     };
-    
-    // Debounce'li MutationObserver
-    let observerTimeout;
-    const debouncedObserver = () => {
-        clearTimeout(observerTimeout);
-        observerTimeout = setTimeout(cleanUp, 500);
+
+    const queueRoot = (el) => {
+        if (pendingRoots.size < MAX_ADDED) pendingRoots.add(el);
+        else fullScan = true;
     };
-    
-    // Ana cleanup interval
-    setInterval(smartCleanUp, cleanupInterval);
-    
-    // MutationObserver ile DOM değişikliklerini izle
-    const observer = new MutationObserver(debouncedObserver);
-    observer.observe(document.body, { childList: true, subtree: true });
+
+    // Eklenen element kökleri ve class/style'ı değişen elementler kuyruğa
+    // alınır (DOM'da hazır bekleyen popup class/style ile açılabilir)
+    const observer = new MutationObserver((records) => {
+        let queued = false;
+        for (const record of records) {
+            if (record.type === 'attributes') {
+                const el = record.target;
+                // Kendi gizlediklerimiz ve body/html stil yazmaları yok sayılır
+                if (hiddenByUs.has(el)) continue;
+                if (el === document.body || el === document.documentElement) {
+                    // Kök class değişimi (örn. 'modal-open') tüm metin taramasını tetikler
+                    if (record.attributeName !== 'class') continue;
+                    fullTextScan = true;
+                } else {
+                    queueRoot(el);
+                }
+                queued = true;
+                continue;
+            }
+            for (const node of record.addedNodes) {
+                if (node.nodeType === 1) {
+                    queueRoot(node);
+                    queued = true;
+                }
+            }
+        }
+        if (!queued) return;
+        mutated = true;
+        // Sürekli mutasyon üreten sayfalarda geçişin hiç çalışmaması önlenir:
+        // zamanlayıcı yeniden kurulmaz, ilk mutasyondan 300ms sonra çalışır
+        if (debounce) return;
+        debounce = setTimeout(() => { debounce = null; tick(); wake(); }, 300);
+    });
+    // Doküman başında body henüz yok; parse edilen düğümler de izlenir
+    observer.observe(document.documentElement, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ['class', 'style']
+    });
+
+    // Parse bitince "kapat" metinleri tüm body'de bir kez daha aranır
+    // (parse sırasında eklenen düğümler MAX_ADDED sınırını aşabilir)
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', () => {
+            fullTextScan = true;
+            tick();
+            wake();
+        });
+    }
 
     // İlk çalıştırma
-    setTimeout(cleanUp, 100);
+    setTimeout(tick, 100);
+    wake();
 })();
 """
+
+# Doküman başı kurulumu (Page.addScriptToEvaluateOnNewDocument):
+# sadece üst frame'de ve arama motoru dışındaki host'larda çalışır
+JS_SENTINEL_DOCUMENT_START = (
+    "if (window.top === window && !new RegExp(%s).test(location.hostname)) {%s}"
+    % (json.dumps(SENTINEL_EXCLUDED_HOSTS), JS_SENTINEL)
+)
+
+# Kurulu sentinel'in durumu: {installed_at, removed, samples, passes, stable} veya null
+JS_SENTINEL_STATUS = "return window.__sbSentinel ? window.__sbSentinel.status() : null;"
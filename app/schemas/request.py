@@ -3,9 +3,19 @@ Pydantic Request Şeması
 Web Scraping İstek Şeması
 """
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List, Literal
+from typing import Optional, List, Literal, Set, get_args
 from urllib.parse import urlparse
 
+from app.config.viewports import ViewportPreset
+
+
+# Yanıtta seçilebilecek artefakt alanları (ScrapeResponse alan adları)
+OutputField = Literal[
+    "raw_desktop_ss", "raw_mobile_ss", "raw_html", "main_desktop_ss",
+    "google_ss", "google_html", "ddg_ss", "ddg_html", "network_logs", "har"
+]
+OUTPUT_FIELDS: tuple[str, ...] = get_args(OutputField)
+
 
 class ScrapeRequest(BaseModel):
     """
@@ -62,10 +72,85 @@ class ScrapeRequest(BaseModel):
         examples=[True, False]
     )
     
+    html_format: Literal["html", "mhtml"] = Field(
+        "html",
+        title="HTML Formatı",
+        description="""
+        Ham URL HTML çıktısının formatı:
+        
+        - `html`: Doküman HTML'i (CDP ile tek çağrıda alınır)
+        - `mhtml`: Görseller, stiller ve iframe'ler dahil tek parça MHTML arşivi
+        """,
+        examples=["html", "mhtml"]
+    )
+    
+    html_include_iframes: bool = Field(
+        False,
+        title="Iframe İçeriklerini Dahil Et",
+        description="Aynı origin'li iframe içeriklerini HTML'e `srcdoc` olarak gömer (sadece html formatında)",
+        examples=[True, False]
+    )
+    
     get_mobile_ss: bool = Field(
         True, 
         title="Mobil Ekran Görüntüsü Al",
-        description="Mobil görünümde (375x812) ekran görüntüsü alır",
+        description="Mobil görünümde (varsayılan 375x812 @3x) ekran görüntüsü alır",
+        examples=[True, False]
+    )
+    
+    # ==================== VIEWPORT ====================
+    desktop_viewport: Optional[ViewportPreset] = Field(
+        None,
+        title="Masaüstü Viewport",
+        description="""
+        Masaüstü adımlarında kullanılacak viewport preset'i.
+        
+        Verilmezse DEFAULT_DESKTOP_VIEWPORT ayarı, o da boşsa tarayıcının kendi pencere boyutu kullanılır.
+        """,
+        examples=["desktop-1080", "laptop"]
+    )
+    
+    mobile_viewport: Optional[ViewportPreset] = Field(
+        None,
+        title="Mobil Viewport",
+        description="""
+        Mobil ekran görüntüsü için viewport preset'i (verilmezse DEFAULT_MOBILE_VIEWPORT, varsayılan phone@3x).
+        
+        - `tablet`: 768x1024 @2x
+        - `phone@1x` / `phone@2x` / `phone@3x`: 375x812 @1x/@2x/@3x
+        """,
+        examples=["phone@1x", "phone@3x", "tablet"]
+    )
+    
+    device_scale_factor: Optional[float] = Field(
+        None,
+        title="Cihaz Piksel Oranı (DPR)",
+        description="Verilirse seçilen preset'lerin DPR değerini ezer. DPR 3 -> 1 mobil PNG boyutunu ~9 kat küçültür.",
+        ge=0.5,
+        le=4,
+        examples=[1, 2]
+    )
+    
+    screenshot_format: Literal["png", "jpeg", "webp"] = Field(
+        "png",
+        title="Ekran Görüntüsü Formatı",
+        description="Ekran görüntülerinin formatı. jpeg/webp tarayıcı tarafında kodlanır ve çok daha küçüktür.",
+        examples=["png", "webp"]
+    )
+    
+    screenshot_quality: int = Field(
+        80,
+        title="Ekran Görüntüsü Kalitesi",
+        description="jpeg/webp formatı için kalite (png için dikkate alınmaz)",
+        ge=1,
+        le=100,
+        examples=[60, 80, 95]
+    )
+    
+    get_thumbnails: bool = Field(
+        False,
+        title="Thumbnail Al",
+        description="Her ekran görüntüsü için küçültülmüş WebP kopya üretir (`thumbnails` alanında döner)",
         examples=[True, False]
     )
     
@@ -106,6 +191,51 @@ class ScrapeRequest(BaseModel):
         examples=[True, False]
     )
     
+    capture_api_bodies: bool = Field(
+        False,
+        title="API Yanıt Gövdelerini Yakala",
+        description="""
+        network_logs içindeki `api` isteklerinin yanıt gövdelerini artefakt olarak kaydeder.
+        Sadece API_BODY_MIME_TYPES tipleri alınır; gövde başına API_BODY_MAX_BYTES,
+        istek başına API_BODY_MAX_TOTAL_BYTES sınırı uygulanır. Kayıtta `body_artifact`
+        yolu döner. network_logs istenmiyorsa etkisizdir. Varsayılan olarak kapalıdır.
+        """,
+        examples=[True, False]
+    )
+    
+    capture_har: bool = Field(
+        False,
+        title="HAR Kaydı Al",
+        description="Hedef site trafiğini HAR 1.2 formatında döndürür. Varsayılan olarak kapalıdır.",
+        examples=[True, False]
+    )
+    
+    har_destination: Literal["response", "artifact"] = Field(
+        "response",
+        title="HAR Hedefi",
+        description="""
+        HAR çıktısının nereye yazılacağı:
+        
+        - `response`: Yanıtın `har` alanında döndürülür
+        - `artifact`: Artefakt deposuna dosya olarak yazılır, yanıtta `har_artifact` yolu döner
+        """,
+        examples=["response", "artifact"]
+    )
+    
+    # ==================== ALAN SEÇİMİ ====================
+    outputs: Optional[List[OutputField]] = Field(
+        None,
+        title="İstenen Çıktılar",
+        description="""
+        Sadece listelenen artefaktlar üretilir ve yanıtta döndürülür.
+        
+        Verilirse yukarıdaki process_*/get_*/capture_network_logs bayrakları yok sayılır;
+        istenmeyen ekran görüntüleri hiç alınmaz ve alanlar yanıttan çıkarılır.
+        Verilmezse (null) bayraklar eskisi gibi çalışır.
+        """,
+        examples=[["raw_html"], ["raw_html", "network_logs"], ["raw_desktop_ss", "google_ss"]]
+    )
+    
     # ==================== SİSTEM ====================
     force_refresh: bool = Field(
         False, 
@@ -117,6 +247,56 @@ class ScrapeRequest(BaseModel):
         examples=[True, False]
     )
     
+    # ==================== ÇIKTI ÇÖZÜMLEME ====================
+    def wants(self, output: str) -> bool:
+        """
+        Verilen artefaktın üretilip üretilmeyeceğini döndürür
+
+        outputs verilmişse doğrudan listeye, verilmemişse eski bayraklara bakılır.
+
+        Args:
+            output: ScrapeResponse alan adı (örn. raw_html)
+
+        Returns:
+            True if artefakt istenmiş
+        """
+        if self.outputs is not None:
+            return output in self.outputs
+        
+        legacy = {
+            "raw_desktop_ss": self.process_raw_url,
+            "raw_html": self.process_raw_url and self.get_html,
+            "raw_mobile_ss": self.process_raw_url and self.get_mobile_ss,
+            "main_desktop_ss": self.process_main_domain,
+            "google_ss": self.get_google_search,
+            "google_html": self.get_google_search and self.get_google_html,
+            "ddg_ss": self.get_ddg_search,
+            "ddg_html": self.get_ddg_search and self.get_ddg_html,
+            "network_logs": self.capture_network_logs,
+            "har": self.capture_har,
+        }
+        return legacy.get(output, False)
+    
+    def excluded_outputs(self) -> Set[str]:
+        """
+        Yanıttan çıkarılacak alanları döndürür
+
+        Sadece outputs verildiğinde alan çıkarılır (eski istemciler tüm alanları görür).
+
+        Returns:
+            ScrapeResponse alan adları kümesi
+        """
+        if self.outputs is None:
+            return set()
+        excluded = {field for field in OUTPUT_FIELDS if field not in self.outputs}
+        if not self.get_thumbnails:
+            excluded.add("thumbnails")
+        if "network_logs" in excluded:
+            excluded.add("network_logs_truncated")
+        if "har" in excluded:
+            excluded.add("har_artifact")
+        return excluded
+    
     # ==================== VALIDASYON ====================
     @field_validator('url')
     @classmethod
@@ -192,6 +372,11 @@ class ScrapeRequest(BaseModel):
                     "get_ddg_search": True,
                     "capture_network_logs": True,
                     "force_refresh": True
+                },
+                {
+                    "url": "https://example.com/products",
+                    "wait_time": 5,
+                    "outputs": ["raw_html", "network_logs"]
                 }
             ]
         }
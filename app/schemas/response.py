@@ -3,7 +3,7 @@ Pydantic Response Şeması
 Web Scraping Yanıt Şeması
 """
 from pydantic import BaseModel, Field
-from typing import Optional, List, Literal
+from typing import Optional, List, Literal, Dict
 
 
 class ScrapeResponse(BaseModel):
@@ -32,43 +32,51 @@ class ScrapeResponse(BaseModel):
     raw_desktop_ss: Optional[str] = Field(
         None,
         title="Masaüstü Ekran Görüntüsü",
-        description="Ham URL için masaüstü görünümü ekran görüntüsü (Base64 PNG)",
+        description="Ham URL için masaüstü görünümü ekran görüntüsü (Base64, varsayılan PNG)",
         examples=["data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAA..."]
     )
     
     raw_mobile_ss: Optional[str] = Field(
         None,
         title="Mobil Ekran Görüntüsü",
-        description="Ham URL için mobil görünüm ekran görüntüsü (Base64 PNG, 375x812)",
+        description="Ham URL için mobil görünüm ekran görüntüsü (Base64, varsayılan PNG, mobile_viewport preset'i - varsayılan 375x812 @3x)",
         examples=["data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAA..."]
     )
     
     main_desktop_ss: Optional[str] = Field(
         None,
         title="Ana Domain Masaüstü Ekran Görüntüsü",
-        description="Ana domain için masaüstü görünümü ekran görüntüsü (Base64 PNG)",
+        description="Ana domain için masaüstü görünümü ekran görüntüsü (Base64, varsayılan PNG)",
         examples=["data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAA..."]
     )
     
     google_ss: Optional[str] = Field(
         None,
         title="Google Arama Sonucu Ekran Görüntüsü",
-        description="Google arama sonucunun ekran görüntüsü (Base64 PNG)",
+        description="Google arama sonucunun ekran görüntüsü (Base64, varsayılan PNG)",
         examples=["data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAA..."]
     )
     
     ddg_ss: Optional[str] = Field(
         None,
         title="DuckDuckGo Arama Sonucu Ekran Görüntüsü",
-        description="DuckDuckGo arama sonucunun ekran görüntüsü (Base64 PNG)",
+        description="DuckDuckGo arama sonucunun ekran görüntüsü (Base64, varsayılan PNG)",
         examples=["data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAA..."]
     )
     
+    thumbnails: Dict[str, Optional[str]] = Field(
+        default_factory=dict,
+        title="Thumbnail'ler",
+        description="get_thumbnails=true ise ekran görüntüsü alanı adına göre küçültülmüş WebP kopyalar (Base64); "
+                    "IMAGE_DERIVE_TIMEOUT aşıldıysa veya thumbnail alınamadıysa değer null",
+        examples=[{"raw_desktop_ss": "UklGRiQAAABXRUJQVlA4IBgAAAAwAQCdASoBAAEAAwA0JaQAA3AA/vuUAAA="}]
+    )
+    
     # ==================== HTML KAYNAK KODLARI (Base64) ====================
     raw_html: Optional[str] = Field(
         None,
         title="Ham URL HTML Kaynak Kodu",
-        description="Ham URL'in HTML kaynak kodu (Base64)",
+        description="Ham URL'in HTML kaynak kodu (Base64, html_format='mhtml' ise MHTML arşivi)",
         examples=["PGh0bWw+PGhlYWQ+Li4uPC9oZWFkPjwvaHRtbD4="]
     )
     
@@ -102,6 +110,23 @@ class ScrapeResponse(BaseModel):
         examples=[5.23, 12.45, 30.1]
     )
     
+    challenge_events: List[dict] = Field(
+        default_factory=list,
+        title="Challenge Olayları",
+        description="""
+        Her consent/captcha kontrolünün yapılandırılmış sonucu:
+        
+        - `type`: Widget ('google_consent', 'cloudflare', 'recaptcha', 'turnstile', 'hcaptcha'),
+          widget bulunmadıysa null
+        - `domain`: Kontrol edilen sayfanın host'u
+        - `step`: Scrape adımı ('raw', 'mobile', 'main', 'google')
+        - `elapsed_ms`: Harcanan süre
+        - `outcome`: `resolved`, `timeout`, `failed` veya `not_present`
+        """,
+        examples=[[{"type": "cloudflare", "domain": "example.com", "step": "raw",
+                    "elapsed_ms": 2140, "outcome": "resolved"}]]
+    )
+    
     # ==================== BLACK-LIST ====================
     blacklisted_domain: Optional[str] = Field(
         None,
@@ -114,18 +139,63 @@ class ScrapeResponse(BaseModel):
     network_logs: List[dict] = Field(
         default_factory=list,
         title="Network Trafik Logları",
-        description="Yakalanan XHR, Fetch ve Media (video/audio) ağ trafiği",
+        description="""
+        Yakalanan XHR, Fetch ve Media (video/audio) ağ trafiği
+        
+        CDP kaynağında her istek tek kayıttır: `size` aktarılan toplam byte,
+        `duration_ms` yönlendirmeler dahil toplam süre, `redirect_chain` önceki URL'ler,
+        `error` başarısız/engellenen isteklerin nedenidir.
+        `category` host'un tracker/reklam listelerindeki karşılığıdır ('tracker', 'ad' veya null).
+        `step` trafiğin yakalandığı adımdır ('raw', 'mobile', 'main'); arama motoru
+        trafiği hiçbir zaman dahil edilmez.
+        `capture_api_bodies=true` ise `api` kayıtlarında `body_artifact` (ARTIFACT_DIR'e
+        göreli yol), `body_size` ve `body_truncated` alanları bulunur.
+        """,
         examples=[
             [{
+                "source": "cdp",
+                "type": "api",
+                "category": None,
+                "step": "raw",
                 "url": "https://example.com/api/data",
+                "method": "GET",
                 "status": 200,
-                "mimeType": "application/json",
+                "mime_type": "application/json",
                 "size": 12345,
-                "timestamp": 1706265600.123
+                "duration_ms": 182.4,
+                "redirect_chain": [],
+                "error": None
             }]
         ]
     )
     
+    network_logs_truncated: Optional[dict] = Field(
+        None,
+        title="Network Log Kırpma Özeti",
+        description="""
+        NETWORK_LOG_* sınırları nedeniyle veri kırpıldıysa özet, kırpma yoksa null:
+        
+        - `dropped_entries`: Kayıt/toplam byte sınırı nedeniyle atlanan istek sayısı
+        - `trimmed_headers`: Header byte sınırı nedeniyle çıkarılan header sayısı
+        - `bytes`: Döndürülen kayıtların yaklaşık JSON boyutu
+        """,
+        examples=[{"dropped_entries": 412, "trimmed_headers": 3, "bytes": 2096011}]
+    )
+    
+    har: Optional[dict] = Field(
+        None,
+        title="HAR Kaydı",
+        description="capture_har=true ve har_destination='response' ise hedef site trafiği (HAR 1.2)",
+        examples=[{"log": {"version": "1.2", "creator": {"name": "sb-scrapper", "version": "3.0.0"}, "entries": []}}]
+    )
+    
+    har_artifact: Optional[str] = Field(
+        None,
+        title="HAR Artefakt Yolu",
+        description="har_destination='artifact' ise HAR dosyasının ARTIFACT_DIR'e göreli yolu",
+        examples=["har/20260126/3f2b9c0e4d5a4b7c8e9f0a1b2c3d4e5f.har"]
+    )
+    
     # ==================== SWAGGER ÖRNEKLERİ ====================
     model_config = {
         "json_schema_extra": {
@@ -4,5 +4,6 @@ Yardımcı fonksiyonlar ve sınıflar
 """
 
 from app.utils.user_agents import get_random_user_agent
+from app.utils.response_encoder import build_json_response
 
-__all__ = ['get_random_user_agent']
+__all__ = ['get_random_user_agent', 'build_json_response']
@@ -0,0 +1,126 @@
+"""
+Response Encoder
+/scrape yanıtları için hızlı JSON serileştirme ve sıkıştırma
+
+FastAPI'nin varsayılan yolu (jsonable_encoder + stdlib json) çok MB'lık
+base64 string'lerinde belirgin CPU harcar. Bu modül yanıtı tek geçişte
+byte'a çevirir ve Accept-Encoding başlığına göre br (gzip opt-in) ile
+sıkıştırır.
+"""
+import gzip
+from typing import Optional, Set
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from app.config import settings
+
+try:
+    import orjson
+except ImportError:  # Opsiyonel - yoksa Pydantic'in Rust serializer'ı kullanılır
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # Opsiyonel - yoksa yanıt sıkıştırılmaz (RESPONSE_GZIP_ENABLED=true ise gzip)
+    brotli = None
+
+
+def serialize_model(model: BaseModel, exclude: Optional[Set[str]] = None) -> bytes:
+    """
+    Pydantic modelini JSON byte dizisine çevirir
+
+    Args:
+        model: Serileştirilecek Pydantic modeli
+        exclude: Yanıttan çıkarılacak alan adları
+
+    Returns:
+        JSON (UTF-8 byte)
+    """
+    if orjson is not None:
+        return orjson.dumps(model.model_dump(exclude=exclude))
+    return model.model_dump_json(exclude=exclude).encode('utf-8')
+
+
+def select_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Accept-Encoding başlığından desteklenen en iyi sıkıştırmayı seçer
+
+    q=0 ile reddedilen kodlamalar hiçbir zaman seçilmez; '*' sadece
+    başlıkta adı geçmeyen kodlamaları kapsar (RFC 9110 §12.5.3).
+
+    Args:
+        accept_encoding: İstemcinin Accept-Encoding başlığı
+
+    Returns:
+        'br', 'gzip' (RESPONSE_GZIP_ENABLED=true ise) veya None
+    """
+    accepted = set()
+    rejected = set()
+    for token in accept_encoding.lower().split(','):
+        name, _, params = token.strip().partition(';')
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        name = name.strip()
+        if not name:
+            continue
+        # q=0 açıkça reddedilen kodlamadır
+        if q > 0:
+            accepted.add(name)
+        else:
+            rejected.add(name)
+
+    wildcard = '*' in accepted
+
+    def allowed(coding: str) -> bool:
+        if coding in rejected:
+            return False
+        return coding in accepted or wildcard
+
+    if brotli is not None and allowed('br'):
+        return 'br'
+    # Gzip base64 ağırlıklı gövdelerde kazandırdığından fazla CPU harcar (opt-in)
+    if settings.response_gzip_enabled and allowed('gzip'):
+        return 'gzip'
+    return None
+
+
+def build_json_response(model: BaseModel, accept_encoding: str = "",
+                        status_code: int = 200,
+                        exclude: Optional[Set[str]] = None) -> Response:
+    """
+    Modeli hızlı yoldan serileştirip (gerekirse sıkıştırıp) Response döndürür
+
+    Args:
+        model: Yanıt modeli
+        accept_encoding: İstemcinin Accept-Encoding başlığı
+        status_code: HTTP durum kodu
+        exclude: Yanıttan çıkarılacak alan adları
+
+    Returns:
+        Hazır byte içerikli Response
+    """
+    body = serialize_model(model, exclude)
+    headers = {"Vary": "Accept-Encoding"}
+
+    if settings.response_compression_enabled and len(body) >= settings.response_compression_min_size:
+        encoding = select_encoding(accept_encoding or "")
+        if encoding == 'br':
+            body = brotli.compress(body, quality=settings.response_brotli_quality)
+            headers["Content-Encoding"] = encoding
+        elif encoding == 'gzip':
+            body = gzip.compress(body, compresslevel=settings.response_gzip_level)
+            headers["Content-Encoding"] = encoding
+
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers
+    )
@@ -88,6 +88,45 @@ CREATE TABLE IF NOT EXISTS gunicorn_logs (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Network Requests Tablosu (NETWORK_LOG_DB_ENABLED=true ise)
+-- Yakalanan her network isteği bir satır - "hangi siteler api.X'i çağırıyor" sorguları için
+-- Toplu COPY ile yazılır; header ve gövde saklanmaz
+CREATE TABLE IF NOT EXISTS network_requests (
+    id BIGSERIAL PRIMARY KEY,
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    domain VARCHAR(255) NOT NULL,
+    step VARCHAR(20),
+    source VARCHAR(20),
+    traffic_type VARCHAR(20),
+    category VARCHAR(20),
+    request_host VARCHAR(255),
+    url TEXT,
+    method VARCHAR(10),
+    resource_type VARCHAR(50),
+    status_code INTEGER,
+    mime_type VARCHAR(255),
+    size_bytes BIGINT,
+    duration_ms DOUBLE PRECISION,
+    error TEXT
+);
+
+-- Challenge Stats Tablosu (CHALLENGE_STATS_ENABLED=true ise)
+-- Domain + adım + widget + sonuç başına toplanmış consent/captcha olayları
+-- challenge_type 'none': adımda widget bulunmadı (outcome 'not_present')
+-- Uygulama olayları bellekte birleştirir, toplu INSERT ... ON CONFLICT ile artırır
+CREATE TABLE IF NOT EXISTS challenge_stats (
+    domain VARCHAR(255) NOT NULL,
+    step VARCHAR(20) NOT NULL,
+    challenge_type VARCHAR(30) NOT NULL,
+    outcome VARCHAR(20) NOT NULL,
+    event_count BIGINT NOT NULL DEFAULT 0,
+    total_ms BIGINT NOT NULL DEFAULT 0,
+    max_ms INTEGER NOT NULL DEFAULT 0,
+    first_seen TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    last_seen TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (domain, step, challenge_type, outcome)
+);
+
 -- ============================================
 -- INDEKSLER
 -- ============================================
@@ -123,6 +162,16 @@ CREATE INDEX IF NOT EXISTS idx_domain_stats_domain ON domain_stats(domain);
 -- Composite index: domain + timestamp (sık kullanılan filtreler için)
 CREATE INDEX IF NOT EXISTS idx_domain_stats_domain_timestamp ON domain_stats(domain, timestamp DESC);
 
+-- Network Requests Indeksleri
+-- Composite index: domain + timestamp (bir sitenin çağırdığı host'lar)
+CREATE INDEX IF NOT EXISTS idx_network_requests_domain_timestamp ON network_requests(domain, timestamp DESC);
+-- Composite index: request_host + domain (bir host'u çağıran siteler)
+CREATE INDEX IF NOT EXISTS idx_network_requests_host_domain ON network_requests(request_host, domain);
+
+-- Challenge Stats Indeksleri
+-- Widget bazında en yavaş domain'ler (PK domain ile başladığı için ayrı)
+CREATE INDEX IF NOT EXISTS idx_challenge_stats_type_total ON challenge_stats(challenge_type, total_ms DESC);
+
 -- Gunicorn Logs Indeksleri
 CREATE INDEX IF NOT EXISTS idx_gunicorn_logs_timestamp ON gunicorn_logs(timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_gunicorn_logs_level ON gunicorn_logs(level);
@@ -0,0 +1,131 @@
+// Sentinel çağrı sayısı ölçümü - sahte (mock) DOM üzerinde tek temizlik geçişi
+// Kullanım: node scripts/bench_sentinel.js <sentinel.js> [eleman sayısı]
+// Çıktı (JSON): getComputedStyle/getBoundingClientRect/innerText çağrıları,
+// geçiş süreleri ve gizlenen yerleştirilmiş popup'lar. Gerçek layout
+// maliyeti değil, layout tetikleyen çağrı sayısı ölçülür.
+'use strict';
+const fs = require('fs');
+
+const file = process.argv[2];
+const N = Number(process.argv[3]) || 50000;
+const W = 1280, H = 960;
+const counts = {style: 0, rect: 0, innerText: 0};
+
+class Text {
+    constructor(value, parent) { this.nodeType = 3; this.nodeValue = value; this.parentElement = parent; }
+}
+
+class El {
+    constructor(tag, parent, id) {
+        this.nodeType = 1; this.tagName = tag; this.id = id || ''; this.className = '';
+        this.parentElement = parent; this.children = []; this.texts = [];
+        this.style = {}; this.isConnected = true; this.offsetParent = {};
+        this.cs = {position: 'static', zIndex: 'auto', display: 'block', visibility: 'visible', opacity: '1'};
+        this.r = {left: 0, top: 0, width: 100, height: 20};
+        if (parent) parent.children.push(this);
+    }
+    getBoundingClientRect() { counts.rect++; return this.r; }
+    getClientRects() { return [this.r]; }
+    get textContent() {
+        let s = this.texts.map(t => t.nodeValue).join('');
+        for (const c of this.children) s += c.textContent;
+        return s;
+    }
+    get innerText() { counts.innerText++; return this.textContent; }
+    set innerHTML(v) {}
+    querySelector() { return null; }
+    appendChild() {}
+    getElementsByTagName() { return all.slice(2); }
+}
+
+// İçerik ağacı (her düğümün 5 çocuğu, her birinde kısa metin)
+const html = new El('HTML', null), body = new El('BODY', html);
+const all = [html, body];
+let frontier = [body];
+while (all.length < N) {
+    const next = [];
+    for (const p of frontier) {
+        for (let k = 0; k < 5 && all.length < N; k++) {
+            const e = new El('DIV', p);
+            e.texts.push(new Text('lorem ipsum ' + all.length, e));
+            all.push(e);
+            next.push(e);
+        }
+    }
+    frontier = next;
+}
+const leaves = all.filter(e => !e.children.length);
+
+// Yerleştirilen popup'lar (her iki sürüm de bunları gizlemeli)
+const layers = [];
+const planted = (id, rect, zIndex, text) => {
+    const e = new El('DIV', body, id);
+    e.cs = {position: 'fixed', zIndex: String(zIndex), display: 'block', visibility: 'visible', opacity: '1'};
+    e.r = rect;
+    if (text) e.texts.push(new Text(text, e));
+    all.push(e);
+    layers.push(e);
+    return e;
+};
+planted('overlay', {left: 0, top: 0, width: W, height: H}, 9999, '');
+planted('sideband', {left: 0, top: 0, width: 160, height: H}, 500, 'reklam alanı');
+planted('bonus', {left: 700, top: 500, width: 300, height: 220}, 100, 'hoşgeldin bonusu burada');
+const popup = planted('closable', {left: 400, top: 300, width: 400, height: 300}, 1000, '');
+const close = new El('SPAN', popup, 'close-btn');
+close.r = {left: 770, top: 305, width: 20, height: 20};
+close.texts.push(new Text('×', close));
+all.push(close);
+layers.sort((a, b) => Number(b.cs.zIndex) - Number(a.cs.zIndex));
+
+const inside = (r, x, y) => x >= r.left && x <= r.left + r.width && y >= r.top && y <= r.top + r.height;
+
+global.window = globalThis;
+global.top = globalThis;
+global.location = {hostname: 'example.com'};
+global.innerWidth = W;
+global.innerHeight = H;
+global.getComputedStyle = (e) => { counts.style++; return e.cs; };
+global.document = {
+    body, head: body, documentElement: html, readyState: 'complete',
+    createElement: () => ({style: {}}),
+    querySelectorAll: () => all,
+    elementsFromPoint: (x, y) => {
+        const stack = layers.filter(l => inside(l.r, x, y));
+        let e = leaves[Math.floor(x * 7 + y) % leaves.length];
+        while (e) { stack.push(e); e = e.parentElement; }
+        return stack;
+    },
+    elementFromPoint: () => null,
+    createTreeWalker: (root) => {
+        const st = [root];
+        const buf = [];
+        return {nextNode() {
+            while (!buf.length && st.length) { const e = st.pop(); buf.push(...e.texts); st.push(...e.children); }
+            return buf.shift() || null;
+        }};
+    },
+    addEventListener() {},
+};
+global.NodeFilter = {SHOW_TEXT: 4};
+global.MutationObserver = class { observe() {} };
+global.console = {log() {}};
+global.requestAnimationFrame = f => f();
+const timers = [];
+global.setTimeout = (f, ms) => { timers.push([f, ms]); return timers.length; };
+global.clearTimeout = () => {};
+global.setInterval = () => 0;
+global.clearInterval = () => {};
+
+eval(fs.readFileSync(file, 'utf8'));
+
+const run = () => {
+    counts.style = counts.rect = counts.innerText = 0;
+    const t0 = process.hrtime.bigint();
+    timers.find(t => t[1] === 100)[0]();
+    const ms = Number(process.hrtime.bigint() - t0) / 1e6;
+    return Object.assign({ms: Math.round(ms * 10) / 10}, counts);
+};
+const pass1 = run();
+const hidden = layers.filter(l => l.style.display === 'none').map(l => l.id).sort();
+const pass2 = run();
+process.stdout.write(JSON.stringify({elements: all.length, pass1, pass2, hidden, planted: layers.map(l => l.id).sort()}) + '\n');
@@ -0,0 +1,75 @@
+"""
+Sentinel Çağrı Sayısı Ölçümü
+JS_SENTINEL'in bir temizlik geçişinde yaptığı layout tetikleyen çağrıları
+sahte DOM üzerinde sayar (node gerekir)
+
+--baseline-rev verilirse o git revizyonundaki sentinel_js.py da ölçülür
+(örn. aday kümeli sürümden önceki tam tarama: 995e2ca~1). Her iki sürümün
+yerleştirilmiş popup'ların hepsini gizlemesi beklenir.
+
+Kullanım (repo kökünden):
+    python -m scripts.bench_sentinel [--elements 50000] [--baseline-rev 995e2ca~1]
+"""
+import argparse
+import json
+import os
+import subprocess
+import tempfile
+
+from app.payloads.sentinel_js import JS_SENTINEL
+
+MOCK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_sentinel.js")
+
+
+def baseline_source(rev: str) -> str:
+    """Verilen revizyondaki JS_SENTINEL kaynağı"""
+    source = subprocess.run(
+        ["git", "show", f"{rev}:app/payloads/sentinel_js.py"],
+        check=True, capture_output=True, text=True
+    ).stdout
+    namespace: dict = {}
+    exec(compile(source, f"{rev}:sentinel_js.py", "exec"), namespace)
+    return namespace["JS_SENTINEL"]
+
+
+def measure(script: str, elements: int) -> dict:
+    """Sentinel kaynağını sahte DOM'da çalıştırıp sonucu döndürür"""
+    with tempfile.NamedTemporaryFile("w", suffix=".js", delete=False, encoding="utf-8") as f:
+        f.write(script)
+        path = f.name
+    try:
+        output = subprocess.run(["node", MOCK, path, str(elements)], check=True, capture_output=True, text=True)
+    finally:
+        os.unlink(path)
+    return json.loads(output.stdout)
+
+
+def report(label: str, result: dict) -> bool:
+    """Sonucu yazdırır; yerleştirilen tüm popup'lar gizlendiyse True"""
+    for name in ("pass1", "pass2"):
+        p = result[name]
+        print(f"{label:10} {name}: getComputedStyle={p['style']:>6} getBoundingClientRect={p['rect']:>6} "
+              f"innerText={p['innerText']:>6} {p['ms']:>7.1f} ms")
+    missed = sorted(set(result["planted"]) - set(result["hidden"]))
+    print(f"{label:10} gizlenen: {', '.join(result['hidden']) or '-'}"
+          + (f" | KAÇIRILAN: {', '.join(missed)}" if missed else ""))
+    return not missed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--elements", type=int, default=50000, help="Sahte DOM eleman sayısı")
+    parser.add_argument("--baseline-rev", help="Karşılaştırılacak git revizyonu")
+    args = parser.parse_args()
+
+    ok = True
+    if args.baseline_rev:
+        ok &= report("baseline", measure(baseline_source(args.baseline_rev), args.elements))
+    ok &= report("current", measure(JS_SENTINEL, args.elements))
+    print(f"({args.elements} eleman; sayılar layout tetikleyen çağrılardır, gerçek render süresi değil)")
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
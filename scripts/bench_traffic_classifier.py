@@ -0,0 +1,126 @@
+"""
+Traffic Classifier Eşdeğerlik ve Hız Testi
+Derlenmiş regex kurallarını (traffic_classifier) eski liste taramalı
+_analyze_traffic_type sürümüyle karşılaştırır
+
+Kullanım (repo kökünden):
+    python -m scripts.bench_traffic_classifier [--fuzz 300000] [--urls 10000]
+"""
+import argparse
+import random
+import time
+
+from app.core.browser.traffic_classifier import classify_traffic
+
+
+def reference_classify(url: str, initiator: str = "") -> str:
+    """Eski NetworkLogger._analyze_traffic_type (değiştirilmeden kopyalandı)"""
+    u = url.lower()
+
+    extensions_to_ignore = [
+        '.css', '.woff', '.woff2', '.ttf', '.eot', '.svg', '.png', '.jpg',
+        '.jpeg', '.gif', '.ico', '.webp', '.mp4', '.mp3', '.m3u8', '.ts',
+        '.pdf', '.zip'
+    ]
+    if any(u.endswith(ext) or f"{ext}?" in u for ext in extensions_to_ignore):
+        return "ignore"
+
+    is_api_keyword = "api" in u or "json" in u or "ajax" in u or "graphql" in u or "v1/" in u
+    if initiator in ['xmlhttprequest', 'fetch'] or is_api_keyword:
+        return "api"
+
+    trackers = ['google-analytics', 'facebook', 'pixel', 'gtm', 'stats', 'metrics', 'telemetry']
+    if any(t in u for t in trackers):
+        return "tracker"
+
+    if u.endswith('.js') or '.js?' in u or initiator == 'script':
+        return "script"
+
+    return "ignore"
+
+
+# Sınır durumları: benzer uzantılar (.woff/.woff2, .ts/.tsx), '?', '\n',
+# büyük harf, ASCII dışı karakterler, anahtar kelime parçaları
+FUZZ_TOKENS = (
+    "https://", "http://", "cdn.", "www.", "example.com", "/", "?", "&", "=", "#", "\n", ".",
+    ".css", ".CSS", ".woff", ".woff2", ".ts", ".tsx", ".js", ".JS", ".json", ".jsx", ".m3u8",
+    ".png", ".PNG", ".pdf", ".zip", "api", "API", "ajax", "graphql", "v1/", "V1/", "json",
+    "google-analytics", "facebook", "pixel", "gtm", "stats", "metrics", "telemetry",
+    "İ", "ı", "ş", "ü", "a", "b", "x",
+)
+INITIATORS = ("", "xmlhttprequest", "fetch", "script", "parser", "other", "Fetch")
+
+# Gerçekçi örnek URL kalıpları (hız ölçümü için)
+SAMPLE_URLS = (
+    "https://www.example.com/",
+    "https://cdn.example.com/assets/app.{n}.js",
+    "https://cdn.example.com/assets/app.{n}.css?v={n}",
+    "https://img.example.com/photos/{n}.jpg",
+    "https://fonts.example.com/font-{n}.woff2",
+    "https://www.example.com/api/v2/items?page={n}",
+    "https://www.example.com/graphql?op=Query{n}",
+    "https://www.google-analytics.com/collect?v=1&tid={n}",
+    "https://connect.facebook.net/en_US/sdk.js?hash={n}",
+    "https://www.example.com/products/{n}/details",
+    "https://static.example.com/video/seg-{n}.ts",
+    "https://www.example.com/data/feed-{n}.json",
+)
+
+
+def fuzz(count: int, seed: int = 1) -> int:
+    """
+    Rastgele URL/initiator çiftlerinde iki sürümü karşılaştırır
+
+    Returns:
+        Farklı sonuç veren örnek sayısı
+    """
+    rng = random.Random(seed)
+    mismatches = 0
+    for _ in range(count):
+        url = "".join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(1, 12)))
+        initiator = rng.choice(INITIATORS)
+        expected = reference_classify(url, initiator)
+        actual = classify_traffic(url, initiator)
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"  FARK: {url!r} {initiator!r} eski={expected} yeni={actual}")
+    return mismatches
+
+
+def best_of(func, urls, repeat: int) -> float:
+    """func'ın tüm URL'lerdeki en iyi süresi (ms)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for url, initiator in urls:
+            func(url, initiator)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fuzz", type=int, default=300000, help="Eşdeğerlik örnek sayısı")
+    parser.add_argument("--urls", type=int, default=10000, help="Hız ölçümü URL sayısı")
+    parser.add_argument("--repeat", type=int, default=20, help="Hız ölçümü tekrar sayısı")
+    args = parser.parse_args()
+
+    mismatches = fuzz(args.fuzz)
+    print(f"Eşdeğerlik: {args.fuzz} örnek, {mismatches} fark")
+
+    rng = random.Random(2)
+    urls = [
+        (rng.choice(SAMPLE_URLS).format(n=i), rng.choice(INITIATORS))
+        for i in range(args.urls)
+    ]
+    old_ms = best_of(reference_classify, urls, args.repeat)
+    new_ms = best_of(classify_traffic, urls, args.repeat)
+    print(f"Hız ({args.urls} URL, en iyi {args.repeat}): eski {old_ms:.1f} ms, yeni {new_ms:.1f} ms "
+          f"({old_ms / new_ms:.1f}x)")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()